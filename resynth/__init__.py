@@ -3,5 +3,13 @@
 # Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
 
 from .arena import Arena
-from .condition import Safety, Reachability, Recurrence, Persistence, Parity
+from .bitset import BitsetArena
+from .compact import CompactArena
+from .condition import (
+    Safety, Reachability, Recurrence, Persistence, Parity, GeneralizedRecurrence,
+    GeneralizedPersistence, GeneralizedReachability
+)
 from .game import Game
+from .implicit import ImplicitArena
+from .strategy import Strategy, Solution
+from .symbolic import SymbolicArena
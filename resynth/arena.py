@@ -4,6 +4,13 @@
 
 import typing
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import instrumentation
+
 Vertex = typing.TypeVar('Vertex')
 Edge = typing.Tuple[Vertex, Vertex]
 
@@ -13,6 +20,9 @@ Edges = typing.AbstractSet[Edge]
 FrozenVertices = typing.FrozenSet[Vertex]
 FrozenEdges = typing.FrozenSet[Edge]
 
+# choices of a positional strategy, see `resynth.strategy.Strategy`
+Choices = typing.MutableMapping[Vertex, Vertex]
+
 Generic = typing.Generic[Vertex]
 
 
@@ -20,6 +30,10 @@ class InvalidArena(Exception):
     """ Thrown when an invalid arena is constructed. """
 
 
+class UnsupportedOperation(Exception):
+    """ Thrown when an operation is not supported for the given arena or condition. """
+
+
 class Arena(Generic):
     """
     An *arena* A = (V, V₀, V₁, E) consists of a finite set V of vertices, disjoint sets
@@ -36,12 +50,38 @@ class Arena(Generic):
         self._player0: FrozenVertices = frozenset(player0)
         self._player1: FrozenVertices = frozenset(player1)
         self._edges: FrozenEdges = frozenset(edges)
-        # some caches for efficiency
+        # adjacency index built in a single pass over the edges
         self._successors: typing.Dict[Vertex, FrozenVertices] = {}
         self._predecessors: typing.Dict[Vertex, FrozenVertices] = {}
+        self._index()
+        # dense integer ids of the vertices, built on first use
+        self._names: typing.Optional[typing.List[Vertex]] = None
+        self._ids: typing.Dict[Vertex, int] = {}
+        # dense NumPy index for the vectorized engine, built on first use
+        self._vectorized: typing.Optional['VectorizedIndex'] = None
         # verify that the arena is valid
         self._verify()
 
+    def _index(self):
+        """ Builds the successor and predecessor maps in O(|V| + |E|). """
+        successors: typing.Dict[Vertex, typing.Set[Vertex]] = {
+            vertex: set() for vertex in self.vertices
+        }
+        predecessors: typing.Dict[Vertex, typing.Set[Vertex]] = {
+            vertex: set() for vertex in self.vertices
+        }
+        for source, target in self.edges:
+            if source not in successors or target not in predecessors:
+                raise InvalidArena(f'Edge {(source, target)!r} leaves the vertices!')
+            successors[source].add(target)
+            predecessors[target].add(source)
+        self._successors = {
+            vertex: frozenset(targets) for vertex, targets in successors.items()
+        }
+        self._predecessors = {
+            vertex: frozenset(sources) for vertex, sources in predecessors.items()
+        }
+
     def _verify(self):
         """ Verifies that the arena is valid. """
         if self.player0 & self.player1:
@@ -72,35 +112,55 @@ class Arena(Generic):
         """ The edges of the arena. """
         return self._edges
 
+    def _number(self):
+        """ Assigns dense integer ids to the vertices. """
+        if self._names is None:
+            self._names = list(self.vertices)
+            self._ids = {vertex: index for index, vertex in enumerate(self._names)}
+
+    def index(self, vertex: Vertex) -> int:
+        """ Returns the dense integer id of the given vertex. """
+        self._number()
+        return self._ids[vertex]
+
+    def vertex(self, index: int) -> Vertex:
+        """ Returns the vertex with the given dense integer id. """
+        self._number()
+        return self._names[index]
+
     def successors(self, vertex: Vertex) -> FrozenVertices:
         """ Returns the successors of the given vertex. """
-        if vertex not in self._successors:
-            self._successors[vertex] = frozenset(
-                successor for successor in self.vertices
-                if (vertex, successor) in self.edges
-            )
         return self._successors[vertex]
 
     def predecessors(self, vertex: Vertex) -> FrozenVertices:
         """ Returns the predecessors of the given vertex. """
-        if vertex not in self._predecessors:
-            self._predecessors[vertex] = frozenset(
-                predecessor for predecessor in self.vertices
-                if (predecessor, vertex) in self.edges
-            )
         return self._predecessors[vertex]
 
     def dual(self) -> 'Arena':
-        """ Returns the dual of the arena. """
-        return Arena(self.vertices, self.player1, self.player0, self.edges)
+        """
+        Returns the dual of the arena sharing the adjacency index, as the edges are
+        the same it is not verified again.
+        """
+        dual = object.__new__(Arena)
+        dual.__dict__.update(self.__dict__)
+        dual._player0, dual._player1 = self._player1, self._player0
+        return dual
+
+    def restrict(self, vertices: Vertices) -> 'Subarena':
+        """ Returns a view of the arena restricted to the given vertices. """
+        return Subarena(self, vertices)
 
-    def attractor0(self, vertices: Vertices) -> Vertices:
+    def attractor0(self,
+                   vertices: Vertices,
+                   strategy: typing.Optional[Choices] = None) -> Vertices:
         """ Returns the Player 0 attractor of the given vertices. """
-        return attractor(self, vertices, self.player0, self.player1)
+        return attractor(self, vertices, self.player0, self.player1, strategy)
 
-    def attractor1(self, vertices: Vertices) -> Vertices:
+    def attractor1(self,
+                   vertices: Vertices,
+                   strategy: typing.Optional[Choices] = None) -> Vertices:
         """ Returns the Player 1 attractor of the given vertices. """
-        return attractor(self, vertices, self.player1, self.player0)
+        return attractor(self, vertices, self.player1, self.player0, strategy)
 
     def controlled_predecessors0(self, vertices: Vertices) -> Vertices:
         """ Returns the Player 0 controlled predecessors of the given vertices. """
@@ -111,11 +171,101 @@ class Arena(Generic):
         return controlled_predecessors(self, vertices, self.player1, self.player0)
 
 
-def controlled_predecessors(arena: Arena,
-                            targets: Vertices,
-                            own: Vertices,
-                            other: Vertices) -> Vertices:
+class Subarena(Generic):
+    """
+    A view of an arena restricted to a subset U ⊆ V of its vertices.
+
+    The view shares the adjacency index of the parent arena and only filters it by
+    the vertex mask U, hence, constructing it is cheap. Every vertex in U must have a
+    successor in U, e.g., because U is a trap, which is not verified.
+    """
+
+    def __init__(self, arena: Arena, vertices: Vertices):
+        self.arena = arena
+        self._vertices: FrozenVertices = frozenset(vertices)
+        self._player0: typing.Optional[FrozenVertices] = None
+        self._player1: typing.Optional[FrozenVertices] = None
+
+    @property
+    def vertices(self) -> FrozenVertices:
+        """ The vertices U of the subarena. """
+        return self._vertices
+
+    @property
+    def player0(self) -> FrozenVertices:
+        """ The vertices V₀ ∩ U of Player 0. """
+        if self._player0 is None:
+            self._player0 = self._vertices & self.arena.player0
+        return self._player0
+
+    @property
+    def player1(self) -> FrozenVertices:
+        """ The vertices V₁ ∩ U of Player 1. """
+        if self._player1 is None:
+            self._player1 = self._vertices & self.arena.player1
+        return self._player1
+
+    @property
+    def edges(self) -> FrozenEdges:
+        """ The edges of the subarena. """
+        return frozenset((vertex, successor)
+                         for vertex in self._vertices
+                         for successor in self.successors(vertex))
+
+    def index(self, vertex: Vertex) -> int:
+        """ Returns the dense integer id of the given vertex in the parent arena. """
+        return self.arena.index(vertex)
+
+    def vertex(self, index: int) -> Vertex:
+        """ Returns the vertex with the given dense integer id in the parent arena. """
+        return self.arena.vertex(index)
+
+    def successors(self, vertex: Vertex) -> FrozenVertices:
+        """ Returns the successors of the given vertex within the subarena. """
+        return self.arena.successors(vertex) & self._vertices
+
+    def predecessors(self, vertex: Vertex) -> FrozenVertices:
+        """ Returns the predecessors of the given vertex within the subarena. """
+        return self.arena.predecessors(vertex) & self._vertices
+
+    def dual(self) -> 'Subarena':
+        """ Returns the dual of the subarena. """
+        return Subarena(self.arena.dual(), self._vertices)
+
+    def restrict(self, vertices: Vertices) -> 'Subarena':
+        """ Returns a view of the parent arena restricted to the given vertices. """
+        return Subarena(self.arena, vertices)
+
+    def attractor0(self,
+                   vertices: Vertices,
+                   strategy: typing.Optional[Choices] = None) -> Vertices:
+        """ Returns the Player 0 attractor of the given vertices. """
+        return attractor(self, vertices, self.player0, self.player1, strategy)
+
+    def attractor1(self,
+                   vertices: Vertices,
+                   strategy: typing.Optional[Choices] = None) -> Vertices:
+        """ Returns the Player 1 attractor of the given vertices. """
+        return attractor(self, vertices, self.player1, self.player0, strategy)
+
+    def controlled_predecessors0(self, vertices: Vertices) -> Vertices:
+        """ Returns the Player 0 controlled predecessors of the given vertices. """
+        return controlled_predecessors(self, vertices, self.player0, self.player1)
+
+    def controlled_predecessors1(self, vertices: Vertices) -> Vertices:
+        """ Returns the Player 1 controlled predecessors of the given vertices. """
+        return controlled_predecessors(self, vertices, self.player1, self.player0)
+
+
+def controlled_predecessors_explicit(arena: Arena,
+                                     targets: Vertices,
+                                     own: Vertices,
+                                     other: Vertices) -> Vertices:
     """ Computes the set of controlled predecessors for the respective player. """
+    statistics = instrumentation.local.current
+    if statistics is not None:
+        statistics.controlled_predecessors += 1
+        statistics.successor_lookups += len(own) + len(other)
     return ({vertex for vertex in own if arena.successors(vertex) & targets} |
             {vertex for vertex in other if arena.successors(vertex) <= targets})
 
@@ -123,21 +273,45 @@ def controlled_predecessors(arena: Arena,
 def attractor_fixpoint(arena: Arena,
                        vertices: Vertices,
                        own: Vertices,
-                       other: Vertices) -> Vertices:
-    """ Computes the attractor of the given vertices for the respective player. """
+                       other: Vertices,
+                       strategy: typing.Optional[Choices] = None) -> Vertices:
+    """
+    Computes the attractor of the given vertices for the respective player.
+
+    If a strategy is given, the choices of the player attracting the game are
+    recorded in it.
+    """
+    statistics = instrumentation.local.current
+    if statistics is not None:
+        statistics.attractors += 1
     current = frozenset(vertices)
     previous = frozenset()
     while current != previous:
+        if statistics is not None:
+            statistics.iteration('attractor', current)
         previous = current
         current = current | controlled_predecessors(arena, current, own, other)
+        if strategy is not None:
+            for vertex in current - previous:
+                if vertex in own:
+                    if statistics is not None:
+                        statistics.successor_lookups += 1
+                    strategy[vertex] = next(iter(arena.successors(vertex) & previous))
     return current
 
 
 def attractor_efficient(arena: Arena,
                         vertices: Vertices,
                         own: Vertices,
-                        other: Vertices) -> Vertices:
-    """ Computes the attractor of the given vertices for the respective player. """
+                        other: Vertices,
+                        strategy: typing.Optional[Choices] = None) -> Vertices:
+    """
+    Computes the attractor of the given vertices for the respective player.
+
+    If a strategy is given, the edge attracting a vertex of the player is recorded
+    in it while computing the attractor.
+    """
+    statistics = instrumentation.local.current
     coloring = {}
     for vertex in arena.vertices:
         if vertex in vertices:
@@ -146,16 +320,186 @@ def attractor_efficient(arena: Arena,
             coloring[vertex] = 1
         elif vertex in other:
             coloring[vertex] = len(arena.successors(vertex))
+            if statistics is not None:
+                statistics.successor_lookups += 1
+    if statistics is not None:
+        statistics.attractors += 1
     pending = set(vertices)
     while pending:
         vertex = pending.pop()
-        for predecessor in arena.predecessors(vertex):
+        predecessors = arena.predecessors(vertex)
+        if statistics is not None:
+            statistics.predecessor_lookups += 1
+            statistics.edges += len(predecessors)
+        for predecessor in predecessors:
             if coloring[predecessor] > 0:
                 coloring[predecessor] -= 1
                 if coloring[predecessor] == 0:
-                    pending.add(vertex)
+                    pending.add(predecessor)
+                    if strategy is not None and predecessor in own:
+                        strategy[predecessor] = vertex
     return frozenset(vertex for vertex, color in coloring.items() if color == 0)
 
 
-# select the attractor algorithm to be used
+def buchi_fixpoint(arena: Arena, accepting: Vertices, player: int) -> Vertices:
+    """
+    Computes the winning region of the opponent of the given player who wants to
+    visit the accepting vertices infinitely often.
+
+    The classical fixpoint iteration only uses attractors, restrictions, and set
+    algebra and never enumerates vertices, hence, it is used by symbolic arenas and
+    bitset arenas.
+    """
+    region = arena.vertices - arena.vertices
+    statistics = instrumentation.local.current
+    while True:
+        if statistics is not None:
+            statistics.iteration('buchi', region)
+        if player:
+            attracted = arena.attractor1(accepting & arena.vertices)
+        else:
+            attracted = arena.attractor0(accepting & arena.vertices)
+        escape = arena.vertices - attracted
+        if not escape:
+            return region
+        # the opponent wins on the trap and on its attractor of it
+        if player:
+            removed = arena.attractor0(escape)
+        else:
+            removed = arena.attractor1(escape)
+        region = region | removed
+        arena = arena.restrict(arena.vertices - removed)
+
+
+class VectorizedIndex:
+    """ Dense integer index of an arena with CSR predecessor arrays for NumPy. """
+
+    def __init__(self, arena: Arena):
+        self.names: typing.List[Vertex] = list(arena.vertices)
+        self.ids: typing.Dict[Vertex, int] = {
+            vertex: index for index, vertex in enumerate(self.names)
+        }
+        self.degrees = numpy.fromiter(
+            (len(arena.successors(vertex)) for vertex in self.names),
+            dtype=numpy.int64, count=len(self.names)
+        )
+        in_degrees = numpy.fromiter(
+            (len(arena.predecessors(vertex)) for vertex in self.names),
+            dtype=numpy.int64, count=len(self.names)
+        )
+        self.offsets = numpy.zeros(len(self.names) + 1, dtype=numpy.int64)
+        numpy.cumsum(in_degrees, out=self.offsets[1:])
+        self.sources = numpy.fromiter(
+            (self.ids[predecessor]
+             for vertex in self.names for predecessor in arena.predecessors(vertex)),
+            dtype=numpy.int64, count=int(self.offsets[-1])
+        )
+        self.player0 = self.mask(arena.player0)
+        self._arena_player0 = arena.player0
+        self._arena_player1 = arena.player1
+
+    def mask(self, vertices: Vertices) -> 'numpy.ndarray':
+        """ Converts the given vertices into a boolean mask over the ids. """
+        mask = numpy.zeros(len(self.names), dtype=bool)
+        mask[[self.ids[vertex] for vertex in vertices]] = True
+        return mask
+
+    def owner(self, own: Vertices) -> 'numpy.ndarray':
+        """ Returns the mask of the given player's vertices reusing the cached one. """
+        if own is self._arena_player0:
+            return self.player0
+        elif own is self._arena_player1:
+            return ~self.player0
+        return self.mask(own)
+
+    def unmask(self, mask: 'numpy.ndarray') -> FrozenVertices:
+        """ Converts the given boolean mask back into a set of vertices. """
+        names = self.names
+        return frozenset(names[index] for index in numpy.flatnonzero(mask))
+
+    def predecessors(self, frontier: 'numpy.ndarray'
+                     ) -> typing.Tuple['numpy.ndarray', 'numpy.ndarray']:
+        """ Returns the sources and targets of all edges into the given ids. """
+        starts = self.offsets[frontier]
+        lengths = self.offsets[frontier + 1] - starts
+        total = int(lengths.sum())
+        # expand the CSR ranges of the frontier into a flat array of edge positions
+        shifts = numpy.repeat(starts - (numpy.cumsum(lengths) - lengths), lengths)
+        sources = self.sources[numpy.arange(total, dtype=numpy.int64) + shifts]
+        return sources, numpy.repeat(frontier, lengths)
+
+
+def _vectorized_index(arena: Arena) -> VectorizedIndex:
+    """ Returns the vectorized index of the arena and builds it on first use. """
+    if numpy is None:
+        raise ImportError('The vectorized engine requires NumPy to be installed.')
+    index = getattr(arena, '_vectorized', None)
+    if index is None:
+        index = arena._vectorized = VectorizedIndex(arena)
+    return index
+
+
+def controlled_predecessors_vectorized(arena: Arena,
+                                       targets: Vertices,
+                                       own: Vertices,
+                                       other: Vertices) -> Vertices:
+    """ Computes the set of controlled predecessors using NumPy scatter operations. """
+    statistics = instrumentation.local.current
+    if statistics is not None:
+        statistics.controlled_predecessors += 1
+    index = _vectorized_index(arena)
+    owner = index.owner(own)
+    predecessors, _ = index.predecessors(numpy.flatnonzero(index.mask(targets)))
+    result = numpy.zeros(len(index.names), dtype=bool)
+    result[predecessors[owner[predecessors]]] = True
+    # vertices of the other player need all of their successors to be targets
+    counts = numpy.bincount(predecessors[~owner[predecessors]],
+                            minlength=len(index.names))
+    result |= (counts == index.degrees) & ~owner
+    return index.unmask(result)
+
+
+def attractor_vectorized(arena: Arena,
+                         vertices: Vertices,
+                         own: Vertices,
+                         other: Vertices,
+                         strategy: typing.Optional[Choices] = None) -> Vertices:
+    """
+    Computes the attractor frontier by frontier using NumPy scatter operations.
+
+    If a strategy is given, the edge attracting a vertex of the player is recorded
+    in it while computing the attractor.
+    """
+    index = _vectorized_index(arena)
+    owner = index.owner(own)
+    attracted = index.mask(vertices)
+    counters = index.degrees.copy()
+    frontier = numpy.flatnonzero(attracted)
+    statistics = instrumentation.local.current
+    if statistics is not None:
+        statistics.attractors += 1
+    while frontier.size:
+        predecessors, successors = index.predecessors(frontier)
+        if statistics is not None:
+            statistics.edges += predecessors.size
+        outside = ~attracted[predecessors]
+        predecessors, successors = predecessors[outside], successors[outside]
+        owned = owner[predecessors]
+        if strategy is not None:
+            # pick the first edge into the frontier for every vertex of the player
+            sources, first = numpy.unique(predecessors[owned], return_index=True)
+            for source, target in zip(sources, successors[owned][first]):
+                strategy[index.names[source]] = index.names[target]
+        # every edge into the frontier decrements the counter of its source
+        opponents = predecessors[~owned]
+        numpy.subtract.at(counters, opponents, 1)
+        frontier = numpy.unique(numpy.concatenate(
+            (predecessors[owned], opponents[counters[opponents] == 0])
+        ))
+        attracted[frontier] = True
+    return index.unmask(attracted)
+
+
+# select the algorithms to be used
 attractor = attractor_efficient
+controlled_predecessors = controlled_predecessors_explicit
@@ -0,0 +1,46 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import typing
+
+from .arena import Arena
+from .compact import CompactArena
+from .condition import Condition, Reachability, Safety
+from .parity import Regions
+
+
+def solve(arena: Arena, conditions: typing.Sequence[Condition]) -> typing.List[Regions]:
+    """
+    Computes the winning regions of both players for many conditions on one arena.
+
+    The arena is converted into a compact arena once and its adjacency and degree
+    arrays are shared by all conditions. The attractors of all reachability and of
+    all safety conditions are computed in one sweep each. The conditions are checked
+    against the arena first just like games do.
+    """
+    for condition in conditions:
+        condition.check(arena)
+    if not isinstance(arena, CompactArena):
+        arena = CompactArena.from_arena(arena)
+    vertices = arena.vertices
+    results: typing.List[typing.Optional[Regions]] = [None] * len(conditions)
+    reachability = [index for index, condition in enumerate(conditions)
+                    if isinstance(condition, Reachability)]
+    attractors = arena.attractors0(
+        [conditions[index].goal_vertices for index in reachability]
+    )
+    for index, attractor in zip(reachability, attractors):
+        results[index] = attractor, vertices - attractor
+    safety = [index for index, condition in enumerate(conditions)
+              if isinstance(condition, Safety)]
+    attractors = arena.attractors1(
+        [vertices - conditions[index].safe_vertices for index in safety]
+    )
+    for index, attractor in zip(safety, attractors):
+        results[index] = vertices - attractor, attractor
+    for index, condition in enumerate(conditions):
+        if results[index] is None:
+            region0 = frozenset(condition.winning_region0(arena))
+            results[index] = region0, vertices - region0
+    return results
@@ -0,0 +1,656 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import array
+import sys
+import time
+import typing
+
+from . import boolean
+
+
+Node = int
+
+# node ids of the terminals
+FALSE: Node = 0
+TRUE: Node = 1
+
+# variable of the terminals and of collected nodes
+TERMINAL = -1
+DEAD = -2
+
+# level of the terminals which are below all variables
+BOTTOM = sys.maxsize
+
+# operation codes used as part of the keys of the computed cache
+ITE = 0
+EXISTS = 1
+AND_EXISTS = 2
+COMPOSE = 3
+
+
+class ComputedCache:
+    """
+    A size-bounded cache of operation results.
+
+    The cache is a direct-mapped hash table: every key has exactly one slot and a new
+    entry evicts the entry previously stored in its slot.
+    """
+
+    def __init__(self, size: int = 1 << 18):
+        self.size = 1 << max(size - 1, 1).bit_length()
+        self.mask = self.size - 1
+        self.keys: typing.List[typing.Optional[typing.Tuple[int, ...]]] = (
+            [None] * self.size
+        )
+        self.values = array.array('q', bytes(8 * self.size))
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: typing.Tuple[int, ...]) -> typing.Optional[Node]:
+        slot = hash(key) & self.mask
+        if self.keys[slot] == key:
+            self.hits += 1
+            return self.values[slot]
+        self.misses += 1
+        return None
+
+    def insert(self, key: typing.Tuple[int, ...], value: Node):
+        slot = hash(key) & self.mask
+        self.keys[slot] = key
+        self.values[slot] = value
+
+    def clear(self):
+        self.keys = [None] * self.size
+
+
+class ReorderingStatistics(typing.NamedTuple):
+    """ The outcome of a single reordering of the variables. """
+
+    method: str
+    before: int
+    after: int
+    time: float
+
+
+Reorder = typing.Callable[['Reordering'], None]
+
+
+class BDD:
+    """
+    Reduced ordered binary decision diagrams over the variables of a manager.
+
+    The variable order is the `ordering` of the manager which must only be changed
+    by reordering the BDD while it is in use, hence, a manager should not be shared
+    by multiple BDDs. Nodes are integer ids into parallel arrays storing the
+    variable index and both children of each node and are hash-consed in a unique
+    table. Operations go through a size-bounded computed cache. Nodes not reachable
+    from referenced nodes are reclaimed by a mark-and-sweep garbage collector.
+
+    If a reordering method is given, the variables are reordered dynamically
+    whenever the number of live nodes exceeds the reordering threshold.
+    """
+
+    def __init__(self,
+                 manager: boolean.Manager,
+                 cache_size: int = 1 << 18,
+                 threshold: int = 1 << 16,
+                 reordering: typing.Optional[Reorder] = None,
+                 reordering_threshold: int = 1 << 12):
+        self.manager = manager
+        self.variables = array.array('q', [TERMINAL, TERMINAL])
+        self.low = array.array('q', [FALSE, TRUE])
+        self.high = array.array('q', [FALSE, TRUE])
+        # number of external references of every node
+        self.references = array.array('q', [1, 1])
+        self.unique: typing.Dict[typing.Tuple[int, Node, Node], Node] = {}
+        # levels of the variables by their index, a cache of the manager's ordering
+        self.levels: typing.Dict[int, int] = {TERMINAL: BOTTOM}
+        self.free: typing.List[Node] = []
+        self.cache = ComputedCache(cache_size)
+        # the garbage collector runs when the number of nodes exceeds the threshold
+        self.threshold = threshold
+        self.collections = 0
+        # the variables are reordered when the number of live nodes exceeds the threshold
+        self.reordering = reordering
+        self.reordering_threshold = reordering_threshold
+        self.reorderings: typing.List[ReorderingStatistics] = []
+        self.true = Function(self, TRUE)
+        self.false = Function(self, FALSE)
+
+    def __len__(self):
+        """ Returns the number of nodes excluding the terminals. """
+        return len(self.unique)
+
+    def level(self, node: Node) -> int:
+        """ Returns the level of the node's variable, terminals are below all levels. """
+        variable = self.variables[node]
+        try:
+            return self.levels[variable]
+        except KeyError:
+            level = self.manager.ordering[self.manager[variable]]
+            self.levels[variable] = level
+            return level
+
+    def _top(self, *nodes: Node) -> typing.Tuple[int, int]:
+        """ Returns the topmost level and its variable index of the given nodes. """
+        node = min(nodes, key=self.level)
+        return self.level(node), self.variables[node]
+
+    def node(self, variable: int, low: Node, high: Node) -> Node:
+        """ Returns the node with the given variable index and children. """
+        if low == high:
+            return low
+        key = (variable, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            if self.free:
+                node = self.free.pop()
+                self.variables[node] = variable
+                self.low[node] = low
+                self.high[node] = high
+            else:
+                node = len(self.variables)
+                self.variables.append(variable)
+                self.low.append(low)
+                self.high.append(high)
+                self.references.append(0)
+            self.unique[key] = node
+        return node
+
+    def _cofactors(self, node: Node, level: int) -> typing.Tuple[Node, Node]:
+        if self.level(node) == level:
+            return self.low[node], self.high[node]
+        return node, node
+
+    def ite(self, condition: Node, consequence: Node, alternative: Node) -> Node:
+        """ Computes if-then-else, all binary operators are instances of it. """
+        if condition == TRUE or consequence == alternative:
+            return consequence
+        if condition == FALSE:
+            return alternative
+        if consequence == TRUE and alternative == FALSE:
+            return condition
+        key = (ITE, condition, consequence, alternative)
+        result = self.cache.lookup(key)
+        if result is not None:
+            return result
+        level, variable = self._top(condition, consequence, alternative)
+        condition0, condition1 = self._cofactors(condition, level)
+        consequence0, consequence1 = self._cofactors(consequence, level)
+        alternative0, alternative1 = self._cofactors(alternative, level)
+        result = self.node(variable,
+                           self.ite(condition0, consequence0, alternative0),
+                           self.ite(condition1, consequence1, alternative1))
+        self.cache.insert(key, result)
+        return result
+
+    def negation(self, node: Node) -> Node:
+        return self.ite(node, FALSE, TRUE)
+
+    def conjunction(self, left: Node, right: Node) -> Node:
+        return self.ite(left, right, FALSE)
+
+    def disjunction(self, left: Node, right: Node) -> Node:
+        return self.ite(left, TRUE, right)
+
+    def exclusive(self, left: Node, right: Node) -> Node:
+        return self.ite(left, self.negation(right), right)
+
+    def implication(self, left: Node, right: Node) -> Node:
+        return self.ite(left, right, TRUE)
+
+    def equivalence(self, left: Node, right: Node) -> Node:
+        return self.ite(left, right, self.negation(right))
+
+    def cube(self, variables: typing.Iterable[boolean.Variable]) -> Node:
+        """ Returns the conjunction of the given variables. """
+        result = TRUE
+        for variable in sorted(variables, key=self.manager.ordering.__getitem__,
+                               reverse=True):
+            result = self.node(variable.index, FALSE, result)
+        return result
+
+    def exists(self, node: Node, cube: Node) -> Node:
+        """ Existentially quantifies the variables of the cube. """
+        level = self.level(node)
+        while self.level(cube) < level:
+            cube = self.high[cube]
+        if node <= TRUE or cube == TRUE:
+            return node
+        key = (EXISTS, node, cube)
+        result = self.cache.lookup(key)
+        if result is not None:
+            return result
+        low = self.exists(self.low[node], cube)
+        if self.level(cube) == level:
+            if low == TRUE:
+                result = TRUE
+            else:
+                result = self.disjunction(low, self.exists(self.high[node], cube))
+        else:
+            result = self.node(self.variables[node], low,
+                               self.exists(self.high[node], cube))
+        self.cache.insert(key, result)
+        return result
+
+    def forall(self, node: Node, cube: Node) -> Node:
+        """ Universally quantifies the variables of the cube. """
+        return self.negation(self.exists(self.negation(node), cube))
+
+    def and_exists(self, left: Node, right: Node, cube: Node) -> Node:
+        """ Computes the relational product ∃cube. left ∧ right in one pass. """
+        if left == FALSE or right == FALSE:
+            return FALSE
+        if left == TRUE:
+            return self.exists(right, cube)
+        if right == TRUE or left == right:
+            return self.exists(left, cube)
+        level, variable = self._top(left, right)
+        while self.level(cube) < level:
+            cube = self.high[cube]
+        if cube == TRUE:
+            return self.conjunction(left, right)
+        if left > right:
+            left, right = right, left
+        key = (AND_EXISTS, left, right, cube)
+        result = self.cache.lookup(key)
+        if result is not None:
+            return result
+        left0, left1 = self._cofactors(left, level)
+        right0, right1 = self._cofactors(right, level)
+        if self.level(cube) == level:
+            cube = self.high[cube]
+            result = self.and_exists(left0, right0, cube)
+            if result != TRUE:
+                result = self.disjunction(result, self.and_exists(left1, right1, cube))
+        else:
+            result = self.node(variable,
+                               self.and_exists(left0, right0, cube),
+                               self.and_exists(left1, right1, cube))
+        self.cache.insert(key, result)
+        return result
+
+    def compose(self, node: Node, variable: boolean.Variable, other: Node) -> Node:
+        """ Substitutes the function `other` for the variable. """
+        target = self.manager.ordering[variable]
+        level = self.level(node)
+        if level > target:
+            return node
+        key = (COMPOSE, node, variable.index, other)
+        result = self.cache.lookup(key)
+        if result is not None:
+            return result
+        if level == target:
+            result = self.ite(other, self.high[node], self.low[node])
+        else:
+            this = self.node(self.variables[node], FALSE, TRUE)
+            result = self.ite(this,
+                              self.compose(self.high[node], variable, other),
+                              self.compose(self.low[node], variable, other))
+        self.cache.insert(key, result)
+        return result
+
+    def evaluate(self, node: Node, assignment: typing.Mapping[boolean.Variable, bool]):
+        """ Evaluates the function for the given total assignment. """
+        while node > TRUE:
+            variable = self.manager[self.variables[node]]
+            node = self.high[node] if assignment[variable] else self.low[node]
+        return node == TRUE
+
+    def formula(self, formula: boolean.Formula) -> Node:
+        """ Builds the BDD of the given formula. """
+        results: typing.Dict[boolean.Formula, Node] = {}
+        for subformula in formula.subformulas():
+            if subformula is self.manager.verum:
+                results[subformula] = TRUE
+            elif subformula is self.manager.falsum:
+                results[subformula] = FALSE
+            elif isinstance(subformula, boolean.Variable):
+                results[subformula] = self.node(subformula.index, FALSE, TRUE)
+            else:
+                operands = [results[operand] for operand in subformula.operands]
+                results[subformula] = _OPERATIONS[type(subformula)](self, *operands)
+        return results[formula]
+
+    def reference(self, node: Node):
+        self.references[node] += 1
+
+    def dereference(self, node: Node):
+        self.references[node] -= 1
+
+    def collect(self):
+        """ Reclaims all nodes which are not reachable from referenced nodes. """
+        marked = bytearray(len(self.variables))
+        pending = [node for node, count in enumerate(self.references) if count > 0]
+        while pending:
+            node = pending.pop()
+            if marked[node]:
+                continue
+            marked[node] = 1
+            if node > TRUE:
+                pending.append(self.low[node])
+                pending.append(self.high[node])
+        for node in range(TRUE + 1, len(self.variables)):
+            if not marked[node] and self.variables[node] != DEAD:
+                del self.unique[(self.variables[node], self.low[node], self.high[node])]
+                self.variables[node] = DEAD
+                self.free.append(node)
+        # cached results may refer to reclaimed nodes
+        self.cache.clear()
+        self.collections += 1
+
+    def function(self, node: Node) -> 'Function':
+        """ Returns a referenced handle of the node and collects garbage if needed. """
+        function = Function(self, node)
+        if len(self.unique) > self.threshold:
+            self.collect()
+            # grow the threshold if most of the nodes are alive
+            self.threshold = max(self.threshold, 2 * len(self.unique))
+        if self.reordering is not None and len(self.unique) > self.reordering_threshold:
+            self.collect()
+            if len(self.unique) > self.reordering_threshold:
+                self.reorder()
+                # grow the threshold only if reordering left most of the nodes
+                self.reordering_threshold = max(self.reordering_threshold,
+                                                2 * len(self.unique))
+        return function
+
+    def reorder(self, method: typing.Optional[Reorder] = None) -> ReorderingStatistics:
+        """
+        Reorders the variables with the given method or the configured one.
+
+        Nodes keep their ids and represent the same functions afterwards, hence,
+        handles remain valid. Intermediate results not held by handles are lost.
+        """
+        method = method or self.reordering or sifting
+        start = time.perf_counter()
+        self.collect()
+        before = len(self.unique)
+        method(Reordering(self))
+        self.cache.clear()
+        # partially applied methods are named after their function
+        name = getattr(getattr(method, 'func', method), '__name__', repr(method))
+        statistics = ReorderingStatistics(
+            name, before, len(self.unique), time.perf_counter() - start
+        )
+        self.reorderings.append(statistics)
+        return statistics
+
+    @property
+    def reordering_time(self) -> float:
+        """ The total time spent reordering in seconds. """
+        return sum(statistics.time for statistics in self.reorderings)
+
+    def variable(self, variable: boolean.Variable) -> 'Function':
+        """ Returns the function of the given variable. """
+        return self.function(self.node(variable.index, FALSE, TRUE))
+
+    def build(self, formula: boolean.Formula) -> 'Function':
+        """ Returns the function of the given formula. """
+        return self.function(self.formula(formula))
+
+
+_OPERATIONS: typing.Dict[type, typing.Callable[..., Node]] = {
+    boolean.Not: BDD.negation,
+    boolean.And: BDD.conjunction,
+    boolean.Or: BDD.disjunction,
+    boolean.Xor: BDD.exclusive,
+    boolean.Implication: BDD.implication,
+    boolean.Equivalence: BDD.equivalence,
+    boolean.ITE: BDD.ite
+}
+
+
+class Reordering:
+    """
+    The state of an ongoing reordering providing swaps of adjacent levels.
+
+    Swaps are done in place: every node keeps its id and function. During the
+    reordering the number of parents and handles of every node is tracked such that
+    nodes becoming unreachable are reclaimed immediately, hence, the size of the
+    unique table is the number of live nodes at all times.
+    """
+
+    def __init__(self, bdd: BDD):
+        self.bdd = bdd
+        manager = bdd.manager
+        # the variables ordered by their levels
+        self.order: typing.List[boolean.Variable] = manager.sort(
+            list(manager.variables.values())
+        )
+        self.nodes: typing.Dict[int, typing.Set[Node]] = {
+            variable.index: set() for variable in self.order
+        }
+        self.counts = array.array('q', bdd.references)
+        for node in bdd.unique.values():
+            self.nodes[bdd.variables[node]].add(node)
+            self.counts[bdd.low[node]] += 1
+            self.counts[bdd.high[node]] += 1
+        self.swaps = 0
+
+    def __len__(self):
+        """ Returns the number of live nodes. """
+        return len(self.bdd.unique)
+
+    def width(self, variable: boolean.Variable) -> int:
+        """ Returns the number of nodes labeled with the given variable. """
+        return len(self.nodes[variable.index])
+
+    def _node(self, variable: int, low: Node, high: Node) -> Node:
+        """ Returns a node with the given children and takes a reference on it. """
+        bdd = self.bdd
+        if low == high:
+            self.counts[low] += 1
+            return low
+        node = bdd.unique.get((variable, low, high))
+        if node is None:
+            node = bdd.node(variable, low, high)
+            if node >= len(self.counts):
+                self.counts.append(0)
+            self.nodes[variable].add(node)
+            self.counts[low] += 1
+            self.counts[high] += 1
+        self.counts[node] += 1
+        return node
+
+    def _release(self, node: Node):
+        """ Drops a reference and reclaims nodes becoming unreachable. """
+        bdd = self.bdd
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            self.counts[node] -= 1
+            if self.counts[node] or node <= TRUE:
+                continue
+            variable, low, high = bdd.variables[node], bdd.low[node], bdd.high[node]
+            del bdd.unique[(variable, low, high)]
+            self.nodes[variable].discard(node)
+            bdd.variables[node] = DEAD
+            bdd.free.append(node)
+            pending.append(low)
+            pending.append(high)
+
+    def swap(self, position: int):
+        """ Swaps the variables at the given level and the level below. """
+        bdd = self.bdd
+        upper, lower = self.order[position], self.order[position + 1]
+        variables, lows, highs = bdd.variables, bdd.low, bdd.high
+        for node in list(self.nodes[upper.index]):
+            low, high = lows[node], highs[node]
+            if variables[low] != lower.index and variables[high] != lower.index:
+                # the node does not depend on the lower variable and moves down
+                continue
+            low0, low1 = ((lows[low], highs[low]) if variables[low] == lower.index
+                          else (low, low))
+            high0, high1 = ((lows[high], highs[high]) if variables[high] == lower.index
+                            else (high, high))
+            new_low = self._node(upper.index, low0, high0)
+            new_high = self._node(upper.index, low1, high1)
+            del bdd.unique[(upper.index, low, high)]
+            self.nodes[upper.index].discard(node)
+            variables[node], lows[node], highs[node] = lower.index, new_low, new_high
+            bdd.unique[(lower.index, new_low, new_high)] = node
+            self.nodes[lower.index].add(node)
+            self._release(low)
+            self._release(high)
+        bdd.manager.swap(upper, lower)
+        bdd.levels[upper.index] = bdd.manager.ordering[upper]
+        bdd.levels[lower.index] = bdd.manager.ordering[lower]
+        self.order[position], self.order[position + 1] = lower, upper
+        self.swaps += 1
+
+    def move(self, position: int, target: int) -> int:
+        """ Moves the variable at the given level to the target level. """
+        while position < target:
+            self.swap(position)
+            position += 1
+        while position > target:
+            self.swap(position - 1)
+            position -= 1
+        return position
+
+
+def sifting(reordering: Reordering, growth: float = 1.2):
+    """
+    Reorders the variables by Rudell's sifting algorithm.
+
+    Starting with the variables labeling the most nodes, every variable is moved
+    through all levels while the others keep their relative order and is placed at
+    the level where the number of nodes is minimal. A variable is not moved further
+    in a direction once the number of nodes exceeds the best one by the growth factor.
+    """
+    order = reordering.order
+    for variable in sorted(order, key=reordering.width, reverse=True):
+        start = position = order.index(variable)
+        best, target = len(reordering), position
+        # sift the variable down towards the bottom
+        while position < len(order) - 1 and len(reordering) <= growth * best:
+            position = reordering.move(position, position + 1)
+            if len(reordering) < best:
+                best, target = len(reordering), position
+        # sift the variable up towards the top passing its starting level
+        while position > 0 and (position > start or len(reordering) <= growth * best):
+            position = reordering.move(position, position - 1)
+            if len(reordering) < best:
+                best, target = len(reordering), position
+        reordering.move(position, target)
+
+
+def window(reordering: Reordering, size: int = 3):
+    """
+    Reorders the variables by window permutation.
+
+    All permutations of every window of adjacent levels are tried and the best one is
+    kept, this is repeated until no window improves the number of nodes anymore.
+    """
+    if size == 2:
+        swaps = [0, 0]
+    elif size == 3:
+        # alternating swaps run through all permutations and return to the start
+        swaps = [0, 1, 0, 1, 0, 1]
+    else:
+        raise ValueError(f'Window size {size} is not supported!')
+    improved = True
+    while improved:
+        improved = False
+        for position in range(len(reordering.order) - size + 1):
+            best, count = len(reordering), 0
+            for index, offset in enumerate(swaps):
+                reordering.swap(position + offset)
+                if len(reordering) < best:
+                    best, count = len(reordering), index + 1
+            for offset in swaps[:count]:
+                reordering.swap(position + offset)
+            improved |= count > 0
+
+
+class Function:
+    """ A reference counted handle of a BDD node representing a boolean function. """
+
+    def __init__(self, bdd: BDD, node: Node):
+        self.bdd = bdd
+        self.node = node
+        bdd.reference(node)
+
+    def __del__(self):
+        self.bdd.dereference(self.node)
+
+    def __eq__(self, other):
+        return (isinstance(other, Function) and
+                self.bdd is other.bdd and self.node == other.node)
+
+    def __hash__(self):
+        return hash(self.node)
+
+    def __repr__(self):
+        return f'<Function node={self.node}>'
+
+    def __bool__(self):
+        # functions are used as sets of satisfying assignments
+        return self.node != FALSE
+
+    def __le__(self, other: 'Function') -> bool:
+        return self.bdd.implication(self.node, other.node) == TRUE
+
+    def __ge__(self, other: 'Function') -> bool:
+        return other <= self
+
+    def __invert__(self) -> 'Function':
+        return self.bdd.function(self.bdd.negation(self.node))
+
+    def __and__(self, other: 'Function') -> 'Function':
+        return self.bdd.function(self.bdd.conjunction(self.node, other.node))
+
+    def __or__(self, other: 'Function') -> 'Function':
+        return self.bdd.function(self.bdd.disjunction(self.node, other.node))
+
+    def __sub__(self, other: 'Function') -> 'Function':
+        return self.bdd.function(
+            self.bdd.conjunction(self.node, self.bdd.negation(other.node))
+        )
+
+    def __xor__(self, other: 'Function') -> 'Function':
+        return self.bdd.function(self.bdd.exclusive(self.node, other.node))
+
+    def __rshift__(self, other: 'Function') -> 'Function':
+        return self.bdd.function(self.bdd.implication(self.node, other.node))
+
+    def __lshift__(self, other: 'Function') -> 'Function':
+        return self.bdd.function(self.bdd.implication(other.node, self.node))
+
+    def equivalent(self, other: 'Function') -> 'Function':
+        return self.bdd.function(self.bdd.equivalence(self.node, other.node))
+
+    def ite(self, consequence: 'Function', alternative: 'Function') -> 'Function':
+        return self.bdd.function(
+            self.bdd.ite(self.node, consequence.node, alternative.node)
+        )
+
+    @property
+    def is_true(self) -> bool:
+        return self.node == TRUE
+
+    @property
+    def is_false(self) -> bool:
+        return self.node == FALSE
+
+    def exists(self, variables: typing.Iterable[boolean.Variable]) -> 'Function':
+        return self.bdd.function(self.bdd.exists(self.node, self.bdd.cube(variables)))
+
+    def forall(self, variables: typing.Iterable[boolean.Variable]) -> 'Function':
+        return self.bdd.function(self.bdd.forall(self.node, self.bdd.cube(variables)))
+
+    def and_exists(self,
+                   other: 'Function',
+                   variables: typing.Iterable[boolean.Variable]) -> 'Function':
+        """ Computes the relational product ∃variables. self ∧ other. """
+        cube = self.bdd.cube(variables)
+        return self.bdd.function(self.bdd.and_exists(self.node, other.node, cube))
+
+    def compose(self, variable: boolean.Variable, other: 'Function') -> 'Function':
+        return self.bdd.function(self.bdd.compose(self.node, variable, other.node))
+
+    def evaluate(self, assignment: typing.Mapping[boolean.Variable, bool]) -> bool:
+        return self.bdd.evaluate(self.node, assignment)
@@ -0,0 +1,287 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import argparse
+import contextlib
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import typing
+
+from . import arena as arena_module
+from . import parity
+from .arena import Arena
+from .compact import CompactArena
+from .condition import (
+    Condition, Reachability, Safety, Recurrence, Persistence, Parity
+)
+from .parity import Coloring
+
+
+Family = typing.Callable[[int, int], typing.Tuple[Arena, Coloring]]
+
+
+def random_coloring(arena: Arena, colors: int, seed: int) -> Coloring:
+    """ Assigns uniformly random colors 0, …, colors - 1 to the vertices. """
+    generator = random.Random(seed)
+    return {vertex: generator.randrange(colors) for vertex in sorted(arena.vertices)}
+
+
+def random_arena(size: int, degree: int, seed: int) -> Arena:
+    """ Generates an arena with random owners and 1 to `degree` random successors. """
+    generator = random.Random(seed)
+    player0 = {vertex for vertex in range(size) if generator.random() < 0.5}
+    edges = {(vertex, generator.randrange(size))
+             for vertex in range(size) for _ in range(generator.randint(1, degree))}
+    return Arena(range(size), player0, set(range(size)) - player0, edges)
+
+
+def ladder(size: int) -> Arena:
+    """
+    Generates a ladder of `size` vertices where every vertex moves one or two
+    rungs up and the players alternate, the top wraps around to the bottom.
+    """
+    edges = {(vertex, (vertex + step) % size)
+             for vertex in range(size) for step in (1, 2)}
+    player0 = set(range(0, size, 2))
+    return Arena(range(size), player0, set(range(size)) - player0, edges)
+
+
+def clique(size: int) -> Arena:
+    """ Generates a complete arena with self loops where the players alternate. """
+    edges = {(source, target) for source in range(size) for target in range(size)}
+    player0 = set(range(0, size, 2))
+    return Arena(range(size), player0, set(range(size)) - player0, edges)
+
+
+def jurdzinski(levels: int, width: int) -> typing.Tuple[Arena, Coloring]:
+    """
+    Generates a layered parity game in the style of Jurdziński's lower bound
+    family for small progress measures.
+
+    Every level is a cycle alternating between even vertices of Player 1 and odd
+    vertices of Player 0 where Player 0 may also descend to the level below. The
+    colors increase with the levels, hence, progress measures are lifted through
+    all levels over and over again.
+    """
+    edges = set()
+    coloring = {}
+    for level in range(levels):
+        for position in range(width + 1):
+            even = ('even', level, position)
+            coloring[even] = 2 * level + 2
+            if position < width:
+                odd = ('odd', level, position)
+                coloring[odd] = 2 * level + 1
+                edges.add((even, odd))
+                edges.add((odd, ('even', level, position + 1)))
+                if level + 1 < levels:
+                    edges.add((odd, ('even', level + 1, position)))
+            else:
+                edges.add((even, ('even', level, 0)))
+    vertices = set(coloring)
+    player0 = {vertex for vertex in vertices if vertex[0] == 'odd'}
+    return Arena(vertices, player0, vertices - player0, edges), coloring
+
+
+def _colored(arena: Arena, seed: int) -> typing.Tuple[Arena, Coloring]:
+    colors = max(2, int(math.log2(len(arena.vertices))))
+    return arena, random_coloring(arena, colors, seed)
+
+
+def _jurdzinski(size: int, seed: int) -> typing.Tuple[Arena, Coloring]:
+    levels = max(1, int(math.sqrt(size / 2)))
+    return jurdzinski(levels, max(1, size // (2 * levels)))
+
+
+# the generated families of arenas by name taking the size and the seed
+FAMILIES: typing.Dict[str, Family] = {
+    'random': lambda size, seed: _colored(random_arena(size, 3, seed), seed),
+    'ladder': lambda size, seed: _colored(ladder(size), seed),
+    'clique': lambda size, seed: _colored(clique(size), seed),
+    'jurdzinski': _jurdzinski
+}
+
+# the attractor variants, `compact` uses the efficient attractor of compact arenas
+ATTRACTORS = {
+    'fixpoint': arena_module.attractor_fixpoint,
+    'efficient': arena_module.attractor_efficient,
+    'vectorized': arena_module.attractor_vectorized,
+    'compact': None
+}
+
+# the conditions by name constructed from the coloring, the even colored vertices
+# are the goal, safe, or accepting vertices respectively
+CONDITIONS: typing.Dict[str, typing.Callable[[Coloring], Condition]] = {
+    'reachability': lambda coloring: Reachability(_even(coloring)),
+    'safety': lambda coloring: Safety(_even(coloring)),
+    'recurrence': lambda coloring: Recurrence(_even(coloring)),
+    'persistence': lambda coloring: Persistence(_even(coloring)),
+    'zielonka': lambda coloring: Parity(coloring, parity.zielonka),
+    'priority-promotion': lambda coloring: Parity(coloring, parity.priority_promotion),
+    'quasi-polynomial': lambda coloring: Parity(coloring, parity.quasi_polynomial)
+}
+
+
+def _even(coloring: Coloring) -> typing.FrozenSet:
+    return frozenset(vertex for vertex, color in coloring.items() if not color % 2)
+
+
+class Result(typing.NamedTuple):
+    family: str
+    size: int
+    vertices: int
+    edges: int
+    condition: str
+    attractor: str
+    # the minimal wall time over all repetitions in seconds
+    time: float
+    # the peak of memory allocated while solving in bytes
+    memory: int
+    winning0: int
+
+
+@contextlib.contextmanager
+def _attractor(variant: str):
+    """ Temporarily selects the attractor algorithm of the arenas. """
+    previous = arena_module.attractor
+    if ATTRACTORS[variant] is not None:
+        arena_module.attractor = ATTRACTORS[variant]
+    try:
+        yield
+    finally:
+        arena_module.attractor = previous
+
+
+def measure(function: typing.Callable[[], typing.Any],
+            repeat: int = 3) -> typing.Tuple[typing.Any, float, int]:
+    """
+    Returns the result, the minimal wall time, and the peak memory of the function.
+
+    The time is measured without tracing allocations, the peak memory is measured
+    by `tracemalloc` in an additional run.
+    """
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def run(families: typing.Iterable[str],
+        sizes: typing.Iterable[int],
+        conditions: typing.Iterable[str],
+        attractors: typing.Iterable[str],
+        seed: int = 0,
+        repeat: int = 3,
+        progress: typing.Optional[typing.TextIO] = None) -> typing.List[Result]:
+    """ Benchmarks every combination of family, size, condition, and attractor. """
+    results = []
+    for family in families:
+        for size in sizes:
+            arena, coloring = FAMILIES[family](size, seed)
+            compact = None
+            for name in conditions:
+                condition = CONDITIONS[name](coloring)
+                for variant in attractors:
+                    if variant == 'vectorized' and arena_module.numpy is None:
+                        continue
+                    if variant == 'compact':
+                        if compact is None:
+                            compact = CompactArena.from_arena(arena)
+                        target = compact
+                    else:
+                        target = arena
+                    with _attractor(variant):
+                        region, elapsed, memory = measure(
+                            lambda: condition.winning_region0(target), repeat
+                        )
+                    result = Result(family, size, len(arena.vertices),
+                                    len(arena.edges), name, variant, elapsed, memory,
+                                    len(region))
+                    results.append(result)
+                    if progress is not None:
+                        print(f'{family:>10} {size:>7} {name:>18} {variant:>10} '
+                              f'{elapsed:10.4f}s {memory / 1024:10.1f}KiB',
+                              file=progress)
+    return results
+
+
+def compare(baseline: typing.Iterable[typing.Mapping[str, typing.Any]],
+            results: typing.Iterable[Result],
+            tolerance: float = 1.25) -> typing.List[typing.Tuple[Result, float]]:
+    """
+    Returns the results which are slower than the baseline by more than the given
+    factor together with the baseline time.
+    """
+    times = {(entry['family'], entry['size'], entry['condition'], entry['attractor']):
+             entry['time'] for entry in baseline}
+    regressions = []
+    for result in results:
+        key = result.family, result.size, result.condition, result.attractor
+        if key in times and result.time > times[key] * tolerance:
+            regressions.append((result, times[key]))
+    return regressions
+
+
+def main(arguments: typing.Optional[typing.Sequence[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog='python -m resynth.benchmark',
+        description='Benchmarks attractor algorithms and winning conditions.'
+    )
+    parser.add_argument('--families', nargs='+', choices=FAMILIES, default=list(FAMILIES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[64, 256, 1024])
+    parser.add_argument('--conditions', nargs='+', choices=CONDITIONS,
+                        default=['reachability', 'safety', 'recurrence', 'persistence',
+                                 'zielonka'])
+    parser.add_argument('--attractors', nargs='+', choices=ATTRACTORS,
+                        default=list(ATTRACTORS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the JSON results to this file')
+    parser.add_argument('--baseline', help='compare against the JSON results of a run')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='slowdown factor reported as regression')
+    options = parser.parse_args(arguments)
+    results = run(options.families, options.sizes, options.conditions,
+                  options.attractors, options.seed, options.repeat, sys.stderr)
+    document = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': options.seed,
+        'repeat': options.repeat,
+        'results': [result._asdict() for result in results]
+    }
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(document, file, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    if options.baseline:
+        with open(options.baseline) as file:
+            baseline = json.load(file)['results']
+        regressions = compare(baseline, results, options.tolerance)
+        for result, previous in regressions:
+            print(f'regression: {result.family} {result.size} {result.condition} '
+                  f'{result.attractor} {previous:.4f}s -> {result.time:.4f}s',
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,421 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import collections.abc
+import typing
+
+from . import instrumentation
+from .arena import (
+    Generic, Vertex, Edge, Vertices, FrozenVertices, FrozenEdges, Choices, Arena,
+    InvalidArena, buchi_fixpoint
+)
+
+
+def _bytes(bits: int, size: int) -> bytes:
+    """ Returns the bitmap of the given bits with one bit per id. """
+    return bits.to_bytes((size + 7) // 8, 'little')
+
+
+def _indices(bits: int) -> typing.Iterator[int]:
+    """ Yields the ids of the set bits in ascending order. """
+    bitmap = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for offset, byte in enumerate(bitmap):
+        while byte:
+            low = byte & -byte
+            yield (offset << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+class Universe(Generic):
+    """ Dense integer ids of the vertices shared by all bitsets over them. """
+
+    def __init__(self, vertices: typing.Iterable[Vertex]):
+        self.names: typing.List[Vertex] = list(dict.fromkeys(vertices))
+        self.ids: typing.Dict[Vertex, int] = {
+            vertex: index for index, vertex in enumerate(self.names)
+        }
+
+    def __len__(self):
+        return len(self.names)
+
+    def encode(self, vertices: typing.Iterable[Vertex]) -> typing.Optional[int]:
+        """
+        Returns the bits of the given vertices or none if some vertex is not part
+        of the universe.
+        """
+        if isinstance(vertices, BitSet) and vertices.universe is self:
+            return vertices.bits
+        bitmap = bytearray((len(self.names) + 7) // 8)
+        ids = self.ids
+        for vertex in vertices:
+            index = ids.get(vertex)
+            if index is None:
+                return None
+            bitmap[index >> 3] |= 1 << (index & 7)
+        return int.from_bytes(bitmap, 'little')
+
+
+class BitSet(typing.AbstractSet[Vertex]):
+    """
+    An immutable set of vertices represented by an integer with one bit per id.
+
+    Union, intersection, difference, subset, and equality of bitsets over the same
+    universe are computed word-parallel by integer operations. Other sets are
+    encoded first and the result falls back to a frozenset if they contain vertices
+    outside of the universe. Membership tests use a bitmap built on first use.
+    """
+
+    __slots__ = ('universe', 'bits', '_bitmap')
+
+    def __init__(self, universe: Universe, bits: int = 0):
+        self.universe = universe
+        self.bits = bits
+        self._bitmap: typing.Optional[bytes] = None
+
+    @classmethod
+    def _from_iterable(cls, iterable: typing.Iterable[Vertex]) -> FrozenVertices:
+        return frozenset(iterable)
+
+    def __repr__(self):
+        return f'BitSet({set(self)!r})'
+
+    def _other(self, other: typing.Any) -> typing.Optional[int]:
+        if isinstance(other, BitSet) and other.universe is self.universe:
+            return other.bits
+        if isinstance(other, collections.abc.Set):
+            return self.universe.encode(other)
+        return None
+
+    def __contains__(self, vertex: typing.Any) -> bool:
+        index = self.universe.ids.get(vertex)
+        if index is None:
+            return False
+        if self._bitmap is None:
+            self._bitmap = _bytes(self.bits, len(self.universe))
+        return bool(self._bitmap[index >> 3] >> (index & 7) & 1)
+
+    def __iter__(self) -> typing.Iterator[Vertex]:
+        names = self.universe.names
+        return (names[index] for index in _indices(self.bits))
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __bool__(self):
+        return bool(self.bits)
+
+    __hash__ = collections.abc.Set._hash
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if isinstance(other, BitSet) and other.universe is self.universe:
+            return self.bits == other.bits
+        return super().__eq__(other)
+
+    def __le__(self, other: typing.Any) -> bool:
+        bits = self._other(other)
+        if bits is None:
+            return super().__le__(other)
+        return not self.bits & ~bits
+
+    def __ge__(self, other: typing.Any) -> bool:
+        bits = self._other(other)
+        if bits is None:
+            return super().__ge__(other)
+        return not bits & ~self.bits
+
+    def __lt__(self, other: typing.Any) -> bool:
+        return self <= other and self != other
+
+    def __gt__(self, other: typing.Any) -> bool:
+        return self >= other and self != other
+
+    def __and__(self, other: typing.Any) -> Vertices:
+        if not isinstance(other, collections.abc.Set):
+            return NotImplemented
+        bits = self._other(other)
+        if bits is None:
+            # vertices outside of the universe are never part of the intersection
+            bits = self.universe.encode(vertex for vertex in other
+                                        if vertex in self.universe.ids)
+        return BitSet(self.universe, self.bits & bits)
+
+    __rand__ = __and__
+
+    def __or__(self, other: typing.Any) -> Vertices:
+        bits = self._other(other)
+        if bits is None:
+            return super().__or__(other)
+        return BitSet(self.universe, self.bits | bits)
+
+    __ror__ = __or__
+
+    def __sub__(self, other: typing.Any) -> Vertices:
+        if not isinstance(other, collections.abc.Set):
+            return NotImplemented
+        bits = self._other(other)
+        if bits is None:
+            # vertices outside of the universe are never part of the set
+            bits = self.universe.encode(vertex for vertex in other
+                                        if vertex in self.universe.ids)
+        return BitSet(self.universe, self.bits & ~bits)
+
+    def __rsub__(self, other: typing.Any) -> Vertices:
+        bits = self._other(other)
+        if bits is None:
+            return super().__rsub__(other)
+        return BitSet(self.universe, bits & ~self.bits)
+
+    def __xor__(self, other: typing.Any) -> Vertices:
+        bits = self._other(other)
+        if bits is None:
+            return super().__xor__(other)
+        return BitSet(self.universe, self.bits ^ bits)
+
+    __rxor__ = __xor__
+
+    def isdisjoint(self, other: typing.Iterable[Vertex]) -> bool:
+        bits = self._other(other)
+        if bits is None:
+            return super().isdisjoint(other)
+        return not self.bits & bits
+
+
+class BitsetArena(Generic):
+    """
+    An arena with the same interface as :class:`Arena` whose sets of vertices are
+    bitsets over dense vertex ids.
+
+    The fixpoint computations of the conditions run on bitsets end to end, only
+    the pre-images of attractors and controlled predecessors traverse edges. The
+    results are bitsets which behave like sets of the original vertices. Views
+    restricted to a subset of the vertices share the adjacency lists.
+    """
+
+    def __init__(self,
+                 vertices: typing.Iterable[Vertex],
+                 player0: typing.Iterable[Vertex],
+                 player1: typing.Iterable[Vertex],
+                 edges: typing.Iterable[Edge]):
+        self.universe = Universe(vertices)
+        size = len(self.universe)
+        self._vertices = BitSet(self.universe, (1 << size) - 1)
+        self._player0 = self._encode(player0)
+        player1_bits = self._encode(player1)
+        if self._player0 & player1_bits:
+            raise InvalidArena('Player 0 and Player 1 vertices are not disjoint!')
+        if self._player0 | player1_bits != self._vertices.bits:
+            raise InvalidArena('Player 0 and Player 1 vertices are not a V-partition!')
+        ids = self.universe.ids
+        successors: typing.List[typing.Set[int]] = [set() for _ in range(size)]
+        for source, target in edges:
+            if source not in ids or target not in ids:
+                raise InvalidArena(f'Edge {(source, target)!r} leaves the vertices!')
+            successors[ids[source]].add(ids[target])
+        predecessors: typing.List[typing.List[int]] = [[] for _ in range(size)]
+        for index, targets in enumerate(successors):
+            for target in targets:
+                predecessors[target].append(index)
+        self._successors = [tuple(sorted(targets)) for targets in successors]
+        self._predecessors = [tuple(sources) for sources in predecessors]
+        # bitmap of the vertices of the view, built on first use
+        self._members: typing.Optional[bytes] = None
+        for index, targets in enumerate(self._successors):
+            if not targets:
+                raise InvalidArena(f'Vertex {self.universe.names[index]!r} '
+                                   f'has no successors!')
+
+    @classmethod
+    def from_arena(cls, arena: Arena) -> 'BitsetArena':
+        """ Converts the given arena into a bitset arena. """
+        return cls(arena.vertices, arena.player0, arena.player1, arena.edges)
+
+    def _encode(self, vertices: typing.Iterable[Vertex]) -> int:
+        bits = self.universe.encode(vertices)
+        if bits is None:
+            raise InvalidArena('Vertices are not vertices of the arena!')
+        return bits
+
+    def _bitset(self, bits: int) -> BitSet:
+        return BitSet(self.universe, bits)
+
+    def _bitmap(self) -> bytes:
+        if self._members is None:
+            self._members = _bytes(self._vertices.bits, len(self.universe))
+        return self._members
+
+    def index(self, vertex: Vertex) -> int:
+        """ Returns the dense integer id of the given vertex. """
+        return self.universe.ids[vertex]
+
+    def vertex(self, index: int) -> Vertex:
+        """ Returns the vertex with the given dense integer id. """
+        return self.universe.names[index]
+
+    @property
+    def vertices(self) -> BitSet:
+        """ The vertices V of the arena. """
+        return self._vertices
+
+    @property
+    def player0(self) -> BitSet:
+        """ The vertices V₀ of Player 0. """
+        return self._bitset(self._player0 & self._vertices.bits)
+
+    @property
+    def player1(self) -> BitSet:
+        """ The vertices V₁ of Player 1. """
+        return self._bitset(~self._player0 & self._vertices.bits)
+
+    @property
+    def edges(self) -> FrozenEdges:
+        """ The edges of the arena (materialized on every access). """
+        names = self.universe.names
+        return frozenset((names[index], names[target])
+                         for index in _indices(self._vertices.bits)
+                         for target in self._adjacent(self._successors[index]))
+
+    def _adjacent(self, indices: typing.Iterable[int]) -> typing.Iterator[int]:
+        bitmap = self._bitmap()
+        return (index for index in indices if bitmap[index >> 3] >> (index & 7) & 1)
+
+    def successors(self, vertex: Vertex) -> FrozenVertices:
+        """ Returns the successors of the given vertex. """
+        names = self.universe.names
+        return frozenset(names[index] for index in
+                         self._adjacent(self._successors[self.universe.ids[vertex]]))
+
+    def predecessors(self, vertex: Vertex) -> FrozenVertices:
+        """ Returns the predecessors of the given vertex. """
+        names = self.universe.names
+        return frozenset(names[index] for index in
+                         self._adjacent(self._predecessors[self.universe.ids[vertex]]))
+
+    def dual(self) -> 'BitsetArena':
+        """ Returns the dual of the arena sharing the adjacency lists. """
+        dual = object.__new__(BitsetArena)
+        dual.__dict__.update(self.__dict__)
+        dual._player0 = ~self._player0 & ((1 << len(self.universe)) - 1)
+        return dual
+
+    def restrict(self, vertices: Vertices) -> 'BitsetArena':
+        """
+        Returns a view of the arena restricted to the given vertices. Every vertex
+        of the view must have a successor in it which is not verified.
+        """
+        view = object.__new__(BitsetArena)
+        view.__dict__.update(self.__dict__)
+        view._vertices = self._bitset(self._encode(vertices) & self._vertices.bits)
+        view._members = None
+        return view
+
+    def _degree(self, index: int) -> int:
+        """ Returns the number of successors of the vertex with the given id. """
+        return sum(1 for _ in self._adjacent(self._successors[index]))
+
+    def _attractor(self,
+                   targets: int,
+                   player: int,
+                   strategy: typing.Optional[Choices] = None) -> int:
+        """
+        Computes the attractor of the respective player, the vertices outside of it
+        are tracked in a bitmap which is converted back into bits at the end.
+        """
+        size = len(self.universe)
+        names = self.universe.names
+        predecessors = self._predecessors
+        vertices = self._vertices.bits
+        owned = _bytes((self._player0 if player == 0 else ~self._player0) & vertices,
+                       size)
+        current = targets & vertices
+        outside = bytearray(_bytes(vertices & ~current, size))
+        # remaining number of successors outside of the attractor
+        counters: typing.Dict[int, int] = {}
+        pending = list(_indices(current))
+        statistics = instrumentation.local.current
+        if statistics is not None:
+            statistics.attractors += 1
+        while pending:
+            index = pending.pop()
+            if statistics is not None:
+                statistics.predecessor_lookups += 1
+                statistics.edges += len(predecessors[index])
+            for predecessor in predecessors[index]:
+                position, bit = predecessor >> 3, 1 << (predecessor & 7)
+                if not outside[position] & bit:
+                    continue
+                if not owned[position] & bit:
+                    counter = counters.get(predecessor)
+                    if counter is None:
+                        if statistics is not None:
+                            statistics.successor_lookups += 1
+                        counter = self._degree(predecessor)
+                    counters[predecessor] = counter - 1
+                    if counter > 1:
+                        continue
+                elif strategy is not None:
+                    strategy[names[predecessor]] = names[index]
+                outside[position] ^= bit
+                pending.append(predecessor)
+        return vertices & ~int.from_bytes(outside, 'little')
+
+    def _controlled_predecessors(self, targets: int, player: int) -> int:
+        """ Computes the controlled predecessors of the respective player. """
+        statistics = instrumentation.local.current
+        if statistics is not None:
+            statistics.controlled_predecessors += 1
+            statistics.predecessor_lookups += bin(
+                targets & self._vertices.bits
+            ).count('1')
+        size = len(self.universe)
+        predecessors = self._predecessors
+        vertices = self._vertices.bits
+        owned = _bytes((self._player0 if player == 0 else ~self._player0) & vertices,
+                       size)
+        members = self._bitmap()
+        result = bytearray((size + 7) // 8)
+        # remaining number of successors outside of the targets
+        counters: typing.Dict[int, int] = {}
+        for index in _indices(targets & vertices):
+            for predecessor in predecessors[index]:
+                position, bit = predecessor >> 3, 1 << (predecessor & 7)
+                if not members[position] & bit:
+                    continue
+                if not owned[position] & bit:
+                    counter = counters.get(predecessor)
+                    if counter is None:
+                        if statistics is not None:
+                            statistics.successor_lookups += 1
+                        counter = self._degree(predecessor)
+                    counters[predecessor] = counter - 1
+                    if counter > 1:
+                        continue
+                result[position] |= bit
+        return int.from_bytes(result, 'little')
+
+    def attractor0(self,
+                   vertices: Vertices,
+                   strategy: typing.Optional[Choices] = None) -> BitSet:
+        """ Returns the Player 0 attractor of the given vertices. """
+        return self._bitset(self._attractor(self._encode(vertices), 0, strategy))
+
+    def attractor1(self,
+                   vertices: Vertices,
+                   strategy: typing.Optional[Choices] = None) -> BitSet:
+        """ Returns the Player 1 attractor of the given vertices. """
+        return self._bitset(self._attractor(self._encode(vertices), 1, strategy))
+
+    def controlled_predecessors0(self, vertices: Vertices) -> BitSet:
+        """ Returns the Player 0 controlled predecessors of the given vertices. """
+        return self._bitset(self._controlled_predecessors(self._encode(vertices), 0))
+
+    def controlled_predecessors1(self, vertices: Vertices) -> BitSet:
+        """ Returns the Player 1 controlled predecessors of the given vertices. """
+        return self._bitset(self._controlled_predecessors(self._encode(vertices), 1))
+
+    def buchi(self, accepting: Vertices, player: int) -> BitSet:
+        """
+        Returns the winning region of the opponent of the given player who wants to
+        visit the accepting vertices infinitely often.
+        """
+        return buchi_fixpoint(self, accepting, player)
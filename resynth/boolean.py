@@ -4,6 +4,7 @@
 
 import itertools
 import typing
+import weakref
 
 
 class Manager:
@@ -12,6 +13,10 @@ class Manager:
     def __init__(self):
         self.counter = itertools.count()
         self.variables: typing.Dict[int, 'Variable'] = {}
+        # unique table of all formulas which are still referenced somewhere
+        self.table: typing.MutableMapping[typing.Tuple, 'Formula'] = (
+            weakref.WeakValueDictionary()
+        )
         # initialize constants
         self.true = self.verum = Verum(self)
         self.false = self.falsum = Falsum(self)
@@ -39,27 +44,41 @@ class Manager:
 
     def variable(self, name=None) -> 'Variable':
         index = next(self.counter)
-        self.variables[index] = Variable(self, index, name)
+        variable = self.variables[index] = Variable(self, index, name)
         self.ordering[variable] = index
-        return self.variables[index]
+        return variable
 
 
 class Formula:
-    """ Represents a boolean formula. """
+    """
+    Represents a boolean formula.
+
+    Formulas are hash-consed in the unique table of their manager, i.e., there is at
+    most one formula object per structure. Hence, equality is identity and hashing
+    is constant time. Python calls `__init__` on shared formulas returned by
+    `__new__` again, hence, subclasses must not reinitialize them.
+    """
 
     precedence = 0
 
-    def __init__(self, manager: Manager):
-        self.manager = manager
+    def __new__(cls, manager: Manager, *operands):
+        key = cls._key(*operands)
+        formula = manager.table.get(key)
+        if formula is None:
+            formula = manager.table[key] = super().__new__(cls)
+        return formula
 
-    def __hash__(self):
-        return hash((self.manager, self.__class__))
+    @classmethod
+    def _key(cls, *operands) -> typing.Tuple:
+        return (cls,) + operands
 
-    def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.manager == other.manager
+    def __init__(self, manager: Manager):
+        self.manager = manager
 
-    def __ne__(self, other):
-        return not self == other
+    @property
+    def _initialized(self) -> bool:
+        """ Whether the formula has been initialized already, i.e., it is shared. """
+        return 'manager' in self.__dict__
 
     def __invert__(self) -> 'Not':
         return Not(self.manager, self)
@@ -84,18 +103,66 @@ class Formula:
 
     equals = equivalent
 
+    @property
+    def operands(self) -> typing.Tuple['Formula', ...]:
+        """ The direct subformulas of the formula. """
+        return ()
+
+    def rebuild(self, *operands: 'Formula') -> 'Formula':
+        """ Returns the formula with the given operands, `self` if they are unchanged. """
+        if all(new is old for new, old in zip(operands, self.operands)):
+            return self
+        return type(self)(self.manager, *operands)
+
+    def subformulas(self) -> typing.Iterator['Formula']:
+        """
+        Yields every distinct subformula exactly once with operands before the
+        formulas containing them. The traversal uses an explicit stack.
+        """
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            formula, expanded = stack.pop()
+            if expanded:
+                yield formula
+            elif formula not in visited:
+                visited.add(formula)
+                stack.append((formula, True))
+                stack.extend((operand, False) for operand in reversed(formula.operands)
+                             if operand not in visited)
+
     def compose(self, variable: 'Variable', formula: 'Formula') -> 'Formula':
-        raise NotImplementedError()
+        results: typing.Dict[Formula, Formula] = {variable: formula}
+        for subformula in self.subformulas():
+            if subformula not in results:
+                results[subformula] = subformula.rebuild(
+                    *(results[operand] for operand in subformula.operands)
+                )
+        return results[self]
 
     def evaluate(self, assignment: typing.Mapping['Variable', 'Constant']):
-        raise NotImplementedError()
+        results: typing.Dict[Formula, Formula] = {}
+        for subformula in self.subformulas():
+            results[subformula] = subformula._reduce(
+                assignment, *(results[operand] for operand in subformula.operands)
+            )
+        return results[self]
 
     def variables(self) -> typing.Set['Variable']:
+        return {subformula for subformula in self.subformulas()
+                if isinstance(subformula, Variable)}
+
+    def _reduce(self, assignment: typing.Mapping['Variable', 'Constant'], *operands):
+        """ Evaluates the formula given the already evaluated operands. """
         raise NotImplementedError()
 
     def simplify(self):
         return self.evaluate({})
 
+    def compile(self) -> 'Program':
+        """ Compiles the formula into a program evaluating batches of assignments. """
+        return Program(self)
+
 
 def _parenthesize(formula, outer_precedence):
     return f'({formula})' if formula.precedence < outer_precedence else f'{formula}'
@@ -108,15 +175,9 @@ class Constant(Formula):
     def __str__(self):
         return self.symbol
 
-    def compose(self, variable: 'Variable', formula: 'Formula') -> 'Formula':
-        return self
-
-    def evaluate(self, assignment: typing.Mapping['Variable', 'Constant']):
+    def _reduce(self, assignment: typing.Mapping['Variable', 'Constant']):
         return self
 
-    def variables(self) -> typing.Set['Variable']:
-        return set()
-
 
 class Verum(Constant):
     symbol = '⊤'
@@ -130,33 +191,29 @@ class Variable(Formula):
     precedence = 19
 
     def __init__(self, manager, index, name=None):
+        if self._initialized:
+            return
         super().__init__(manager)
         self.index = index
         self.name = name
 
+    @classmethod
+    def _key(cls, index, name=None) -> typing.Tuple:
+        return cls, index
+
     def __str__(self):
         return self.name or f'_{self.index}'
 
-    def __hash__(self):
-        return hash((super().__hash__(), self.index))
-
-    def __eq__(self, other):
-        return super().__eq__(other) and self.index == other.index
-
-    def compose(self, variable: 'Variable', formula: 'Formula') -> 'Formula':
-        return formula if variable == self else self
-
-    def evaluate(self, assignment: typing.Mapping['Variable', 'Constant']):
+    def _reduce(self, assignment: typing.Mapping['Variable', 'Constant']):
         return assignment[self] if self in assignment else self
 
-    def variables(self) -> typing.Set['Variable']:
-        return {self}
-
 
 class Not(Formula):
     precedence = 18
 
     def __init__(self, manager: Manager, operand: Formula):
+        if self._initialized:
+            return
         super().__init__(manager)
         self.operand: Formula = operand
 
@@ -164,32 +221,24 @@ class Not(Formula):
         operand = _parenthesize(self.operand, self.precedence)
         return f'¬{operand}'
 
-    def __hash__(self):
-        return hash((super().__hash__(), self.operand))
-
-    def __eq__(self, other):
-        return super().__eq__(self) and other.operand == self.operand
+    @property
+    def operands(self) -> typing.Tuple[Formula, ...]:
+        return (self.operand,)
 
-    def compose(self, variable: 'Variable', formula: 'Formula') -> 'Formula':
-        operand = self.operand.compose(variable, formula)
-        return self if operand == self.operand else Not(self.manager, operand)
-
-    def evaluate(self, assignment: typing.Mapping['Variable', 'Constant']):
-        operand = self.operand.evaluate(assignment)
+    def _reduce(self, assignment: typing.Mapping['Variable', 'Constant'], operand):
         if operand == self.manager.verum:
             return self.manager.falsum
         elif operand == self.manager.falsum:
             return self.manager.verum
-        return Not(self.manager, operand)
-
-    def variables(self) -> typing.Set['Variable']:
-        return self.operand.variables()
+        return self.rebuild(operand)
 
 
 class BinaryOperator(Formula):
     operator = ''
 
     def __init__(self, manager: Manager, left: Formula, right: Formula):
+        if self._initialized:
+            return
         super().__init__(manager)
         self.left = left
         self.right = right
@@ -199,27 +248,13 @@ class BinaryOperator(Formula):
         right = _parenthesize(self.right, self.precedence)
         return f'{left} {self.operator} {right}'
 
-    def __hash__(self):
-        return hash((super().__hash__(), self.left, self.right))
-
-    def __eq__(self, other):
-        return (super().__eq__(other) and
-                other.left == self.left and
-                other.right == self.right)
-
-    def compose(self, variable: 'Variable', formula: 'Formula') -> 'Formula':
-        left = self.left.compose(variable, formula)
-        right = self.right.compose(variable, formula)
-        return type(self)(self.manager, left, right)
+    @property
+    def operands(self) -> typing.Tuple[Formula, ...]:
+        return self.left, self.right
 
-    def evaluate(self, assignment: typing.Mapping['Variable', 'Constant']):
-        left = self.left.evaluate(assignment)
-        right = self.right.evaluate(assignment)
+    def _reduce(self, assignment: typing.Mapping['Variable', 'Constant'], left, right):
         return self._evaluate(left, right)
 
-    def variables(self) -> typing.Set['Variable']:
-        return self.left.variables() | self.right.variables()
-
     def _evaluate(self, left: Formula, right: Formula):
         raise NotImplementedError()
 
@@ -237,7 +272,7 @@ class And(BinaryOperator):
             return right
         elif right == self.manager.verum:
             return left
-        return And(self.manager, left, right)
+        return self.rebuild(left, right)
 
 
 class Or(BinaryOperator):
@@ -249,7 +284,7 @@ class Or(BinaryOperator):
             return self.manager.verum
         elif left == self.manager.falsum and right == self.manager.falsum:
             return self.manager.falsum
-        return Or(self.manager, left, right)
+        return self.rebuild(left, right)
 
 
 class Xor(BinaryOperator):
@@ -263,7 +298,7 @@ class Xor(BinaryOperator):
             return right
         elif right == self.manager.falsum:
             return left
-        return Xor(self.manager, left, right)
+        return self.rebuild(left, right)
 
 
 class Implication(BinaryOperator):
@@ -275,7 +310,7 @@ class Implication(BinaryOperator):
             return self.manager.verum
         elif left == self.manager.verum:
             return right
-        return Implication(self.manager, left, right)
+        return self.rebuild(left, right)
 
 
 class Equivalence(BinaryOperator):
@@ -283,9 +318,12 @@ class Equivalence(BinaryOperator):
     operator = '↔'
 
     def _evaluate(self, left: Formula, right: Formula):
+        constants = self.manager.verum, self.manager.falsum
         if left == right:
             return self.manager.verum
-        return Equivalence(self.manager, left, right)
+        elif left in constants and right in constants:
+            return self.manager.falsum
+        return self.rebuild(left, right)
 
 
 class ITE(Formula):
@@ -296,6 +334,8 @@ class ITE(Formula):
                  condition: Formula,
                  consequence: Formula,
                  alternative: Formula):
+        if self._initialized:
+            return
         super().__init__(manager)
         self.condition = condition
         self.consequence = consequence
@@ -304,37 +344,105 @@ class ITE(Formula):
     def __str__(self):
         return f'ite({self.condition}, {self.consequence}, {self.alternative})'
 
-    def __hash__(self):
-        return hash((super().__hash__(), self.condition,
-                     self.consequence, self.alternative))
-
-    def __eq__(self, other):
-        return (super().__eq__(other) and
-                other.condition == self.condition and
-                other.consequnce == self.consequence and
-                other.alternative == self.alternative)
+    @property
+    def operands(self) -> typing.Tuple[Formula, ...]:
+        return self.condition, self.consequence, self.alternative
 
-    def compose(self, variable: 'Variable', formula: 'Formula') -> 'Formula':
-        condition = self.condition.compose(variable, formula)
-        consequence = self.consequence.compose(variable, formula)
-        alternative = self.alternative.compose(variable, formula)
-        return ITE(self.manager, condition, consequence, alternative)
-
-    def evaluate(self, assignment: typing.Mapping['Variable', 'Constant']):
-        condition = self.condition.evaluate(assignment)
-        consequence = self.consequence.evaluate(assignment)
-        alternative = self.alternative.evaluate(assignment)
+    def _reduce(self,
+                assignment: typing.Mapping['Variable', 'Constant'],
+                condition,
+                consequence,
+                alternative):
         if condition is self.manager.verum:
             return consequence
         elif condition is self.manager.falsum:
             return alternative
         else:
-            return ITE(self.manager, condition, consequence, alternative)
-
-    def variables(self) -> typing.Set['Variable']:
-        return (self.condition.variables() |
-                self.consequence.variables() |
-                self.alternative.variables())
+            return self.rebuild(condition, consequence, alternative)
+
+
+# bitwise implementations of the operators given a column of ones
+Column = typing.Any
+
+_OPERATIONS: typing.Dict[type, typing.Callable[..., Column]] = {
+    Not: lambda ones, operand: operand ^ ones,
+    And: lambda ones, left, right: left & right,
+    Or: lambda ones, left, right: left | right,
+    Xor: lambda ones, left, right: left ^ right,
+    Implication: lambda ones, left, right: (left ^ ones) | right,
+    Equivalence: lambda ones, left, right: left ^ right ^ ones,
+    ITE: lambda ones, condition, consequence, alternative: (
+        (condition & consequence) | ((condition ^ ones) & alternative)
+    )
+}
+
+
+class Program:
+    """
+    A formula compiled into a flat sequence of bitwise instructions.
+
+    A program evaluates a whole batch of assignments at once. Every variable is
+    given as a column, e.g., a NumPy bool array, a NumPy uint64 array where every
+    bit is an assignment, or a Python integer used as bit vector, and the result is
+    a column of the same kind.
+    """
+
+    def __init__(self, formula: Formula):
+        self.manager = formula.manager
+        self.variables: typing.List[Variable] = []
+        # every instruction stores its result in the register with its position
+        self.instructions: typing.List[typing.Tuple[typing.Any, ...]] = []
+        registers: typing.Dict[Formula, int] = {}
+        for subformula in formula.subformulas():
+            registers[subformula] = len(self.instructions)
+            if isinstance(subformula, Variable):
+                self.instructions.append(('variable', subformula))
+                self.variables.append(subformula)
+            elif isinstance(subformula, Constant):
+                self.instructions.append(('constant', subformula))
+            else:
+                operands = tuple(registers[operand] for operand in subformula.operands)
+                self.instructions.append(
+                    (_OPERATIONS[type(subformula)],) + operands
+                )
+        # release registers after their last use to bound the memory consumption
+        self.releases: typing.List[typing.List[int]] = [[] for _ in self.instructions]
+        last_use: typing.Dict[int, int] = {}
+        for position, instruction in enumerate(self.instructions):
+            if callable(instruction[0]):
+                for register in instruction[1:]:
+                    last_use[register] = position
+        for register, position in last_use.items():
+            self.releases[position].append(register)
+
+    def __call__(self,
+                 columns: typing.Mapping['Variable', Column],
+                 ones: typing.Optional[Column] = None) -> Column:
+        """
+        Evaluates the program on the given columns. The column `ones` has all bits
+        set; it defaults to `column | ~column` for some column of a variable, for
+        Python integers it has to be given as `(1 << size) - 1`.
+        """
+        if ones is None:
+            if not columns:
+                raise ValueError('Unable to infer the column of ones!')
+            column = next(iter(columns.values()))
+            ones = column | ~column
+        zeros = ones ^ ones
+        registers: typing.List[Column] = [None] * len(self.instructions)
+        for position, instruction in enumerate(self.instructions):
+            kind = instruction[0]
+            if kind == 'variable':
+                registers[position] = columns[instruction[1]]
+            elif kind == 'constant':
+                is_verum = instruction[1] is self.manager.verum
+                registers[position] = ones if is_verum else zeros
+            else:
+                registers[position] = kind(ones, *(registers[register]
+                                                   for register in instruction[1:]))
+                for register in self.releases[position]:
+                    registers[register] = None
+        return registers[-1]
 
 
 _default_manager = Manager()
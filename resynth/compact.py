@@ -0,0 +1,410 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import array
+import typing
+
+from . import instrumentation
+from .arena import (
+    Generic, Vertex, Edge, Vertices, FrozenVertices, FrozenEdges, Choices, Arena,
+    Subarena, InvalidArena
+)
+
+
+# type codes of the arrays, offsets may exceed 2³¹ for huge arenas
+OFFSET = 'q'
+INDEX = 'i'
+
+
+def _compress(size: int,
+              sources: typing.Sequence[int],
+              targets: typing.Sequence[int]) -> typing.Tuple[array.array, array.array]:
+    """ Builds CSR offset and target arrays from parallel source and target ids. """
+    offsets = array.array(OFFSET, bytes(array.array(OFFSET).itemsize * (size + 1)))
+    for source in sources:
+        offsets[source + 1] += 1
+    for index in range(size):
+        offsets[index + 1] += offsets[index]
+    position = offsets[:-1]
+    result = array.array(INDEX, bytes(array.array(INDEX).itemsize * len(sources)))
+    for source, target in zip(sources, targets):
+        result[position[source]] = target
+        position[source] += 1
+    return offsets, result
+
+
+def _deduplicate(size: int,
+                 offsets: array.array,
+                 targets: array.array) -> typing.Tuple[array.array, array.array]:
+    """ Sorts every CSR row and removes duplicated targets. """
+    unique_offsets = array.array(OFFSET, [0])
+    unique_targets = array.array(INDEX)
+    for index in range(size):
+        row = sorted(set(targets[offsets[index]:offsets[index + 1]]))
+        unique_targets.extend(row)
+        unique_offsets.append(len(unique_targets))
+    return unique_offsets, unique_targets
+
+
+class _Identity(typing.Mapping[int, int]):
+    """ Maps the dense integer vertices 0, …, n - 1 onto themselves as their ids. """
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def __getitem__(self, vertex: int) -> int:
+        if isinstance(vertex, int) and 0 <= vertex < self.size:
+            return vertex
+        raise KeyError(vertex)
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(range(self.size))
+
+    def __len__(self):
+        return self.size
+
+
+class CompactArena(Generic):
+    """
+    A memory efficient arena with the same interface as :class:`Arena`.
+
+    Vertices are mapped to dense integer ids. Successors and predecessors are stored
+    as CSR offset and target arrays and the vertices of Player 0 as a bitmap.
+    """
+
+    def __init__(self,
+                 vertices: typing.Iterable[Vertex],
+                 player0: typing.Iterable[Vertex],
+                 player1: typing.Iterable[Vertex],
+                 edges: typing.Iterable[Edge]):
+        self._names: typing.List[Vertex] = list(dict.fromkeys(vertices))
+        self._ids: typing.Dict[Vertex, int] = {
+            vertex: index for index, vertex in enumerate(self._names)
+        }
+        # the vertices are materialized on first use
+        self._vertices: typing.Optional[FrozenVertices] = None
+        size = len(self._names)
+        # bitmap of the vertices of Player 0
+        self._player0 = bytearray((size + 7) // 8)
+        # the vertices of both players are materialized on first use
+        self._partition: typing.Optional[typing.Tuple[FrozenVertices,
+                                                      FrozenVertices]] = None
+        owned = bytearray(size)
+        for vertex in player0:
+            index = self._id(vertex)
+            self._player0[index >> 3] |= 1 << (index & 7)
+            owned[index] |= 1
+        for vertex in player1:
+            owned[self._id(vertex)] |= 2
+        if any(owner == 3 for owner in owned):
+            raise InvalidArena('Player 0 and Player 1 vertices are not disjoint!')
+        if not all(owned):
+            raise InvalidArena('Player 0 and Player 1 vertices are not a V-partition!')
+        del owned
+        sources = array.array(INDEX)
+        targets = array.array(INDEX)
+        for source, target in edges:
+            if source not in self._ids or target not in self._ids:
+                raise InvalidArena(f'Edge {(source, target)!r} leaves the vertices!')
+            sources.append(self._ids[source])
+            targets.append(self._ids[target])
+        offsets, targets = _compress(size, sources, targets)
+        del sources
+        self._index(offsets, targets)
+
+    def _index(self, offsets: array.array, targets: array.array):
+        """ Builds the adjacency arrays from CSR successor arrays and verifies them. """
+        size = len(self._names)
+        self._successor_offsets, self._successor_targets = _deduplicate(
+            size, offsets, targets
+        )
+        del offsets, targets
+        self._predecessor_offsets, self._predecessor_targets = _compress(
+            size, self._successor_targets, array.array(INDEX, self._sources())
+        )
+        offsets = self._successor_offsets
+        self._degrees = array.array(
+            INDEX, (offsets[index + 1] - offsets[index] for index in range(size))
+        )
+        self._verify()
+
+    @classmethod
+    def from_csr(cls,
+                 names: typing.Sequence[Vertex],
+                 player0: bytearray,
+                 offsets: array.array,
+                 targets: array.array,
+                 index: typing.Optional[typing.Tuple[typing.Sequence[int],
+                                                     typing.Sequence[int],
+                                                     typing.Sequence[int]]] = None
+                 ) -> 'CompactArena':
+        """
+        Builds a compact arena from CSR successor arrays over the dense vertex ids
+        given by the positions of the names and a bitmap of the vertices of Player 0.
+
+        The index consists of the CSR predecessor arrays and the degrees. If it is
+        given, the successor arrays must be free of duplicates and all arrays are
+        used as they are without being verified.
+        """
+        arena = object.__new__(cls)
+        arena._names = names
+        arena._ids = (_Identity(len(names)) if isinstance(names, range)
+                      else {vertex: index for index, vertex in enumerate(names)})
+        arena._vertices = None
+        arena._player0 = player0
+        arena._partition = None
+        if index is None:
+            arena._index(offsets, targets)
+        else:
+            arena._successor_offsets, arena._successor_targets = offsets, targets
+            (arena._predecessor_offsets, arena._predecessor_targets,
+             arena._degrees) = index
+        return arena
+
+    @classmethod
+    def from_arena(cls, arena: Arena) -> 'CompactArena':
+        """ Converts the given arena into a compact arena. """
+        return cls(arena.vertices, arena.player0, arena.player1, arena.edges)
+
+    def _id(self, vertex: Vertex) -> int:
+        try:
+            return self._ids[vertex]
+        except KeyError:
+            raise InvalidArena(f'Vertex {vertex!r} is not a vertex of the arena!')
+
+    def _sources(self) -> typing.Iterator[int]:
+        """ Yields the source id of every successor entry in CSR order. """
+        offsets = self._successor_offsets
+        for index in range(len(self._names)):
+            for _ in range(offsets[index + 1] - offsets[index]):
+                yield index
+
+    def _verify(self):
+        """ Verifies that the arena is valid. """
+        for index, vertex in enumerate(self._names):
+            if not self._degrees[index]:
+                raise InvalidArena(f'Vertex {vertex!r} has no successors!')
+
+    def _owned(self, index: int) -> bool:
+        """ Checks whether the vertex with the given id belongs to Player 0. """
+        return bool(self._player0[index >> 3] >> (index & 7) & 1)
+
+    def index(self, vertex: Vertex) -> int:
+        """ Returns the dense integer id of the given vertex. """
+        return self._ids[vertex]
+
+    def vertex(self, index: int) -> Vertex:
+        """ Returns the vertex with the given dense integer id. """
+        return self._names[index]
+
+    @property
+    def vertices(self) -> FrozenVertices:
+        """ The vertices V of the arena. """
+        if self._vertices is None:
+            self._vertices = frozenset(self._names)
+        return self._vertices
+
+    def _players(self) -> typing.Tuple[FrozenVertices, FrozenVertices]:
+        """ Materializes the vertices of both players in one pass over the bitmap. """
+        if self._partition is None:
+            player0, player1 = [], []
+            for index, vertex in enumerate(self._names):
+                (player0 if self._owned(index) else player1).append(vertex)
+            self._partition = frozenset(player0), frozenset(player1)
+        return self._partition
+
+    @property
+    def player0(self) -> FrozenVertices:
+        """ The vertices V₀ of Player 0. """
+        return self._players()[0]
+
+    @property
+    def player1(self) -> FrozenVertices:
+        """ The vertices V₁ of Player 1. """
+        return self._players()[1]
+
+    @property
+    def edges(self) -> FrozenEdges:
+        """ The edges of the arena (materialized on every access). """
+        names = self._names
+        return frozenset(
+            (names[source], names[target])
+            for source, target in zip(self._sources(), self._successor_targets)
+        )
+
+    def successors(self, vertex: Vertex) -> FrozenVertices:
+        """ Returns the successors of the given vertex. """
+        index = self._ids[vertex]
+        start, stop = self._successor_offsets[index], self._successor_offsets[index + 1]
+        return frozenset(self._names[target]
+                         for target in self._successor_targets[start:stop])
+
+    def predecessors(self, vertex: Vertex) -> FrozenVertices:
+        """ Returns the predecessors of the given vertex. """
+        index = self._ids[vertex]
+        start, stop = (self._predecessor_offsets[index],
+                       self._predecessor_offsets[index + 1])
+        return frozenset(self._names[source]
+                         for source in self._predecessor_targets[start:stop])
+
+    def dual(self) -> 'CompactArena':
+        """ Returns the dual of the arena sharing the adjacency arrays. """
+        dual = object.__new__(CompactArena)
+        dual.__dict__.update(self.__dict__)
+        dual._player0 = bytearray(byte ^ 0xFF for byte in self._player0)
+        if self._partition is not None:
+            dual._partition = self._partition[1], self._partition[0]
+        return dual
+
+    def restrict(self, vertices: Vertices) -> Subarena:
+        """ Returns a view of the arena restricted to the given vertices. """
+        return Subarena(self, vertices)
+
+    def _mask(self, vertices: Vertices) -> bytearray:
+        mask = bytearray(len(self._names))
+        for vertex in vertices:
+            mask[self._ids[vertex]] = 1
+        return mask
+
+    def _unmask(self, mask: bytearray) -> FrozenVertices:
+        names = self._names
+        return frozenset(names[index] for index, member in enumerate(mask) if member)
+
+    def _attractor(self,
+                   mask: bytearray,
+                   player: bool,
+                   strategy: typing.Optional[Choices] = None) -> bytearray:
+        """ Extends the given id mask to the attractor of the respective player. """
+        names = self._names
+        offsets, sources = self._predecessor_offsets, self._predecessor_targets
+        bitmap = self._player0
+        # remaining number of successors outside of the attractor
+        counters = array.array(INDEX, self._degrees)
+        pending = [index for index, member in enumerate(mask) if member]
+        statistics = instrumentation.local.current
+        if statistics is not None:
+            statistics.attractors += 1
+        while pending:
+            index = pending.pop()
+            if statistics is not None:
+                statistics.predecessor_lookups += 1
+                statistics.edges += offsets[index + 1] - offsets[index]
+            for position in range(offsets[index], offsets[index + 1]):
+                predecessor = sources[position]
+                if mask[predecessor]:
+                    continue
+                if bool(bitmap[predecessor >> 3] >> (predecessor & 7) & 1) == player:
+                    mask[predecessor] = 1
+                    pending.append(predecessor)
+                    if strategy is not None:
+                        strategy[names[predecessor]] = names[index]
+                    continue
+                counters[predecessor] -= 1
+                if counters[predecessor] == 0:
+                    mask[predecessor] = 1
+                    pending.append(predecessor)
+        return mask
+
+    def _controlled_predecessors(self, mask: bytearray, player: bool) -> bytearray:
+        """ Computes the id mask of the controlled predecessors of the given mask. """
+        statistics = instrumentation.local.current
+        if statistics is not None:
+            statistics.controlled_predecessors += 1
+            statistics.predecessor_lookups += sum(mask)
+        offsets, sources = self._predecessor_offsets, self._predecessor_targets
+        bitmap, degrees = self._player0, self._degrees
+        result = bytearray(len(mask))
+        counters: typing.Dict[int, int] = {}
+        for index, member in enumerate(mask):
+            if not member:
+                continue
+            for position in range(offsets[index], offsets[index + 1]):
+                predecessor = sources[position]
+                if bool(bitmap[predecessor >> 3] >> (predecessor & 7) & 1) == player:
+                    result[predecessor] = 1
+                    continue
+                counter = counters.get(predecessor, 0) + 1
+                counters[predecessor] = counter
+                if counter == degrees[predecessor]:
+                    result[predecessor] = 1
+        return result
+
+    def attractor0(self,
+                   vertices: Vertices,
+                   strategy: typing.Optional[Choices] = None) -> Vertices:
+        """ Returns the Player 0 attractor of the given vertices. """
+        return self._unmask(self._attractor(self._mask(vertices), True, strategy))
+
+    def attractor1(self,
+                   vertices: Vertices,
+                   strategy: typing.Optional[Choices] = None) -> Vertices:
+        """ Returns the Player 1 attractor of the given vertices. """
+        return self._unmask(self._attractor(self._mask(vertices), False, strategy))
+
+    def _attractors(self,
+                    targets: typing.Sequence[Vertices],
+                    player: bool) -> typing.List[FrozenVertices]:
+        """
+        Computes the attractors of many target sets of the respective player in a
+        single sweep where every vertex carries a bitmask of the attracting targets.
+        """
+        names = self._names
+        offsets, sources = self._predecessor_offsets, self._predecessor_targets
+        successor_offsets, successor_targets = (self._successor_offsets,
+                                                self._successor_targets)
+        bitmap = self._player0
+        masks = [0] * len(names)
+        for bit, vertices in enumerate(targets):
+            for vertex in vertices:
+                masks[self._id(vertex)] |= 1 << bit
+        pending = [index for index, mask in enumerate(masks) if mask]
+        queued = bytearray(len(names))
+        for index in pending:
+            queued[index] = 1
+        while pending:
+            index = pending.pop()
+            queued[index] = 0
+            mask = masks[index]
+            for position in range(offsets[index], offsets[index + 1]):
+                predecessor = sources[position]
+                current = masks[predecessor]
+                if not mask & ~current:
+                    continue
+                if bool(bitmap[predecessor >> 3] >> (predecessor & 7) & 1) == player:
+                    extended = current | mask
+                else:
+                    # the opponent is attracted for the targets all successors are
+                    extended = mask
+                    for successor in range(successor_offsets[predecessor],
+                                           successor_offsets[predecessor + 1]):
+                        extended &= masks[successor_targets[successor]]
+                    extended |= current
+                if extended != current:
+                    masks[predecessor] = extended
+                    if not queued[predecessor]:
+                        queued[predecessor] = 1
+                        pending.append(predecessor)
+        attractors: typing.List[typing.Set[Vertex]] = [set() for _ in targets]
+        for index, mask in enumerate(masks):
+            while mask:
+                bit = mask & -mask
+                attractors[bit.bit_length() - 1].add(names[index])
+                mask ^= bit
+        return [frozenset(attractor) for attractor in attractors]
+
+    def attractors0(self, targets: typing.Sequence[Vertices]) -> typing.List[Vertices]:
+        """ Returns the Player 0 attractors of all the given target sets. """
+        return self._attractors(targets, True)
+
+    def attractors1(self, targets: typing.Sequence[Vertices]) -> typing.List[Vertices]:
+        """ Returns the Player 1 attractors of all the given target sets. """
+        return self._attractors(targets, False)
+
+    def controlled_predecessors0(self, vertices: Vertices) -> Vertices:
+        """ Returns the Player 0 controlled predecessors of the given vertices. """
+        return self._unmask(self._controlled_predecessors(self._mask(vertices), True))
+
+    def controlled_predecessors1(self, vertices: Vertices) -> Vertices:
+        """ Returns the Player 1 controlled predecessors of the given vertices. """
+        return self._unmask(self._controlled_predecessors(self._mask(vertices), False))
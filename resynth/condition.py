@@ -2,17 +2,41 @@
 #
 # Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
 
+import collections.abc
 import typing
 
-from .arena import Generic, Vertex, Vertices, FrozenVertices, Arena
+from .arena import (
+    Generic, Vertex, Vertices, FrozenVertices, Choices, Arena, UnsupportedOperation
+)
+from .strategy import Solution, Strategy, solution, trap
+from . import instrumentation, parity
 
 
 class IncompatibleArena(Exception):
     pass
 
 
-class UnsupportedOperation(Exception):
-    pass
+def _freeze(vertices: Vertices) -> Vertices:
+    """ Freezes explicit sets of vertices, symbolic sets are immutable already. """
+    if isinstance(vertices, collections.abc.Iterable):
+        return frozenset(vertices)
+    return vertices
+
+
+def _strategy(arena: Arena) -> Strategy:
+    """
+    Returns an empty strategy, arenas without dense vertex ids, e.g., symbolic arenas,
+    are rejected as strategies store their choices by id.
+    """
+    if getattr(arena, 'index', None) is None:
+        raise UnsupportedOperation('Unable to compute strategies on symbolic arenas.')
+    return Strategy(arena)
+
+
+def _format(vertices: Vertices) -> str:
+    if isinstance(vertices, collections.abc.Iterable):
+        return repr(set(vertices))
+    return repr(vertices)
 
 
 class Condition(Generic):
@@ -26,6 +50,15 @@ class Condition(Generic):
         """ Returns the complement of the winning condition. """
         raise UnsupportedOperation('Unable to compute complement of given condition.')
 
+    def restrict(self, vertices: Vertices) -> 'Condition':
+        """
+        Returns the winning condition restricted to the given vertices.
+
+        Only prefix-independent conditions can be restricted such that the winning
+        regions of subarenas separated by attractors are the ones of the arena.
+        """
+        raise UnsupportedOperation('Unable to restrict given condition.')
+
     def winning_region0(self, arena: Arena) -> Vertices:
         """ Computes the winning region of Player 0 in the given arena. """
         raise NotImplementedError()
@@ -34,6 +67,10 @@ class Condition(Generic):
         """ Computes the winning region of Player 1 in the given arena. """
         raise NotImplementedError()
 
+    def solve(self, arena: Arena) -> Solution:
+        """ Computes the winning regions and winning strategies of both players. """
+        raise NotImplementedError()
+
 
 class Reachability(Condition):
     """
@@ -47,10 +84,10 @@ class Reachability(Condition):
     """
 
     def __init__(self, goal_vertices: Vertices):
-        self.goal_vertices: FrozenVertices = frozenset(goal_vertices)
+        self.goal_vertices: Vertices = _freeze(goal_vertices)
 
     def __repr__(self):
-        return f'Reachability({set(self.goal_vertices)!r})'
+        return f'Reachability({_format(self.goal_vertices)})'
 
     def check(self, arena: Arena):
         if not self.goal_vertices <= arena.vertices:
@@ -66,6 +103,16 @@ class Reachability(Condition):
     def winning_region1(self, arena: Arena):
         return arena.vertices - self.winning_region0(arena)
 
+    def solve(self, arena: Arena) -> Solution:
+        strategy = _strategy(arena)
+        region0 = arena.attractor0(self.goal_vertices, strategy)
+        region1 = arena.vertices - region0
+        # once a goal vertex is reached any choice of Player 0 is winning
+        for vertex in self.goal_vertices & arena.player0:
+            strategy[vertex] = next(iter(arena.successors(vertex)))
+        trap(arena, region1, arena.player1, strategy)
+        return solution(arena, region0, region1, strategy)
+
 
 class Safety(Condition):
     """
@@ -79,10 +126,10 @@ class Safety(Condition):
     """
 
     def __init__(self, safe_vertices: Vertices):
-        self.safe_vertices: FrozenVertices = frozenset(safe_vertices)
+        self.safe_vertices: Vertices = _freeze(safe_vertices)
 
     def __repr__(self):
-        return f'Safety({set(self.safe_vertices)!r})'
+        return f'Safety({_format(self.safe_vertices)})'
 
     def check(self, arena: Arena):
         if not self.safe_vertices <= arena.vertices:
@@ -98,6 +145,135 @@ class Safety(Condition):
     def winning_region1(self, arena: Arena):
         return arena.attractor1(arena.vertices - self.safe_vertices)
 
+    def solve(self, arena: Arena) -> Solution:
+        strategy = _strategy(arena)
+        unsafe_vertices = arena.vertices - self.safe_vertices
+        region1 = arena.attractor1(unsafe_vertices, strategy)
+        region0 = arena.vertices - region1
+        # once an unsafe vertex is reached any choice of Player 1 is winning
+        for vertex in unsafe_vertices & arena.player1:
+            strategy[vertex] = next(iter(arena.successors(vertex)))
+        trap(arena, region0, arena.player0, strategy)
+        return solution(arena, region0, region1, strategy)
+
+
+def _buchi(arena: Arena,
+           accepting: Vertices,
+           player: int,
+           strategy: typing.Optional[Choices] = None) -> FrozenVertices:
+    """
+    Computes the winning region of the opponent of the given player who wants to
+    visit the accepting vertices infinitely often.
+
+    The opponent wins on the complement of the attractor of the accepting vertices
+    and on its attractor of it. Both are removed from the arena and the attractor of
+    the accepting vertices is repaired locally instead of being recomputed: only the
+    attracted vertices which can reach removed vertices within it are re-explored.
+    If a strategy is given, the winning choices of both players are recorded in it.
+    """
+    if strategy is None:
+        strategy = {}
+    own, other = arena.player0, arena.player1
+    if player:
+        own, other = other, own
+    vertices = set(arena.vertices)
+    if player:
+        attracted = set(arena.attractor1(accepting, strategy))
+    else:
+        attracted = set(arena.attractor0(accepting, strategy))
+    region = set()
+    escape = vertices - attracted
+    statistics = instrumentation.local.current
+    while escape:
+        if statistics is not None:
+            statistics.iteration('buchi', region)
+        # the opponent stays within the trap or moves to its previous regions
+        for vertex in escape & other:
+            strategy[vertex] = next(successor for successor in arena.successors(vertex)
+                                    if successor not in attracted)
+        # the opponent's attractor of the trap within the remaining arena
+        removed = set(escape)
+        pending = list(escape)
+        counters: typing.Dict[Vertex, int] = {}
+        while pending:
+            vertex = pending.pop()
+            for predecessor in arena.predecessors(vertex):
+                if predecessor not in vertices or predecessor in removed:
+                    continue
+                if predecessor in own:
+                    if predecessor not in counters:
+                        counters[predecessor] = len(
+                            arena.successors(predecessor) & vertices
+                        )
+                    counters[predecessor] -= 1
+                    if counters[predecessor]:
+                        continue
+                else:
+                    strategy[predecessor] = vertex
+                removed.add(predecessor)
+                pending.append(predecessor)
+        vertices -= removed
+        region |= removed
+        attracted -= removed
+        # attracted vertices which can reach removed vertices may have lost their
+        # justification, all other attracted vertices remain attracted
+        invalid = set()
+        pending = list(removed)
+        while pending:
+            for predecessor in arena.predecessors(pending.pop()):
+                if predecessor in attracted and predecessor not in invalid:
+                    invalid.add(predecessor)
+                    pending.append(predecessor)
+        attracted -= invalid
+        # re-attract the invalidated vertices locally
+        counters = {}
+        for vertex in invalid:
+            if vertex in other:
+                counters[vertex] = len((arena.successors(vertex) & vertices) - attracted)
+        pending = []
+        for vertex in invalid:
+            if vertex in accepting or (vertex in other and not counters[vertex]):
+                pending.append(vertex)
+            elif vertex in own:
+                successors = arena.successors(vertex) & attracted
+                if successors:
+                    strategy[vertex] = next(iter(successors))
+                    pending.append(vertex)
+        attracted.update(pending)
+        while pending:
+            vertex = pending.pop()
+            for predecessor in arena.predecessors(vertex):
+                if predecessor not in invalid or predecessor in attracted:
+                    continue
+                if predecessor in other:
+                    counters[predecessor] -= 1
+                    if counters[predecessor]:
+                        continue
+                else:
+                    strategy[predecessor] = vertex
+                attracted.add(predecessor)
+                pending.append(predecessor)
+        escape = invalid - attracted
+    # the player moves on from accepting vertices while staying in its region
+    for vertex in vertices & own:
+        if vertex in accepting:
+            strategy[vertex] = next(iter(arena.successors(vertex) & vertices))
+    return frozenset(region)
+
+
+def _solve_buchi(arena: Arena, accepting: Vertices, player: int) -> Vertices:
+    """
+    Computes the winning region of the opponent of the given player who wants to
+    visit the accepting vertices infinitely often.
+
+    Arenas which provide a `buchi` method, e.g., symbolic arenas and bitset arenas
+    whose sets should not be enumerated, solve the game themselves.
+    """
+    buchi = getattr(arena, 'buchi', None)
+    if buchi is not None:
+        return buchi(accepting, player)
+    return _buchi(arena, accepting, player)
+
 
 class Recurrence(Condition):
     """
@@ -114,7 +290,7 @@ class Recurrence(Condition):
         self.accepting_vertices = accepting_vertices
 
     def __repr__(self):
-        return f'Recurrence({set(self.accepting_vertices)!r})'
+        return f'Recurrence({_format(self.accepting_vertices)})'
 
     def check(self, arena: Arena):
         if self.accepting_vertices <= arena.vertices:
@@ -125,27 +301,20 @@ class Recurrence(Condition):
         # avoid accepting vertices globally eventually
         return Persistence(arena.vertices - self.accepting_vertices)
 
+    def restrict(self, vertices: Vertices):
+        return Recurrence(self.accepting_vertices & vertices)
+
     def winning_region0(self, arena: Arena) -> Vertices:
         return arena.vertices - self.winning_region1(arena)
 
     def winning_region1(self, arena: Arena) -> Vertices:
-        accepting_vertices = set(self.accepting_vertices)
-        # winning region of Player 1 is a trap for Player 0; we use a fixpoint algorithm
-        # here which iteratively adds vertices to Player 1's winning region approximation
-        previous = set()
-        current = None
-        # check whether we reached a fixpoint yet
-        while previous != current:
-            previous = current
-            # compute the set of vertices from which Player 0 cannot force the game to the
-            # accepting vertices via the complement of the Player 0's attractor
-            current = arena.vertices - arena.attractor0(accepting_vertices)
-            # `current` under-approximates the winning region as Player 1 can force the
-            # game away from the accepting vertices; we remove those vertices from the
-            # accepting vertices from which Player 1 can force Player 0 in the current
-            # under-approximation of its winning region
-            accepting_vertices -= arena.controlled_predecessors1(current)
-        return current
+        # Player 1 wins where Player 0 cannot visit the accepting vertices repeatedly
+        return _solve_buchi(arena, self.accepting_vertices, 0)
+
+    def solve(self, arena: Arena) -> Solution:
+        strategy = _strategy(arena)
+        region1 = _buchi(arena, self.accepting_vertices, 0, strategy)
+        return solution(arena, arena.vertices - region1, region1, strategy)
 
 
 class Persistence(Condition):
@@ -163,7 +332,7 @@ class Persistence(Condition):
         self.safe_vertices = safe_vertices
 
     def __repr__(self):
-        return f'Persistence({set(self.safe_vertices)!r})'
+        return f'Persistence({_format(self.safe_vertices)})'
 
     def check(self, arena: Arena):
         if self.safe_vertices <= arena.vertices:
@@ -174,29 +343,202 @@ class Persistence(Condition):
         # visit unsafe vertices infinitely often
         return Recurrence(arena.vertices - self.safe_vertices)
 
+    def restrict(self, vertices: Vertices):
+        return Persistence(self.safe_vertices & vertices)
+
     def winning_region0(self, arena: Arena) -> Vertices:
-        # over-approximation of the unsafe vertices, i.e., those vertices from which
-        # Player 1 can force the game away from staying within safe vertices
-        unsafe_vertices = set(arena.vertices - self.safe_vertices)
-        previous = set()
-        current = None
-        while previous != current:
-            previous = current
-            # under-approximate the winning region using the over-approximation of the
-            # unsafe vertices; compute the set of vertices from which Player 1 cannot
-            # force the game into unsafe vertices
-            current = arena.vertices - arena.attractor1(unsafe_vertices)
-            # `current` under-approximates the winning region as Player 0 can force the
-            # game to stay within safe vertices; we remove those vertices from the unsafe
-            # vertices from which Player 0 can force Player 1 in the current under-
-            # approximation of its winning region
-            unsafe_vertices -= arena.controlled_predecessors0(current)
-        return current
+        # Player 0 wins where Player 1 cannot visit the unsafe vertices repeatedly
+        unsafe_vertices = arena.vertices - self.safe_vertices
+        return _solve_buchi(arena, unsafe_vertices, 1)
+
+    def solve(self, arena: Arena) -> Solution:
+        strategy = _strategy(arena)
+        unsafe_vertices = arena.vertices - self.safe_vertices
+        region0 = _buchi(arena, unsafe_vertices, 1, strategy)
+        return solution(arena, region0, arena.vertices - region0, strategy)
 
     def winning_region1(self, arena: Arena) -> Vertices:
         return arena.vertices - self.winning_region0(arena)
 
 
+class GeneralizedRecurrence(Condition):
+    """
+    Generalized recurrence or generalized Büchi winning condition.
+
+    The goal of Player 0 is to visit each of the accepting sets infinitely often.
+
+    GENBÜCHI(F₁, …, Fₖ) := {ρ ∈ ω(V) | Inf(ρ) ∩ Fᵢ ≠ ∅ for all 1 ≤ i ≤ k}
+
+    LTL: GF(v ∈ F₁) ∧ … ∧ GF(v ∈ Fₖ)
+    """
+
+    def __init__(self, accepting_sets: typing.Iterable[Vertices]):
+        self.accepting_sets: typing.Tuple[Vertices, ...] = tuple(
+            _freeze(accepting_vertices) for accepting_vertices in accepting_sets
+        )
+
+    def __repr__(self):
+        sets = ', '.join(map(_format, self.accepting_sets))
+        return f'GeneralizedRecurrence([{sets}])'
+
+    def check(self, arena: Arena):
+        for accepting_vertices in self.accepting_sets:
+            if not accepting_vertices <= arena.vertices:
+                raise IncompatibleArena(
+                    'Accepting vertices must be a subset of the vertices.'
+                )
+
+    def restrict(self, vertices: Vertices):
+        return GeneralizedRecurrence(accepting_vertices & vertices
+                                     for accepting_vertices in self.accepting_sets)
+
+    def winning_region0(self, arena: Arena) -> Vertices:
+        return arena.vertices - self.winning_region1(arena)
+
+    def winning_region1(self, arena: Arena) -> Vertices:
+        """
+        Computes the winning region of Player 1 on the original arena without
+        a degeneralization product.
+
+        The accepting sets are checked round-robin: if Player 0 cannot attract the
+        remaining arena to the current set, Player 1 wins on its attractor of the
+        complement which is removed. A set is only checked again after the arena
+        has shrunk, hence, the iteration stops as soon as the attractors of k sets in
+        a row cover the remaining arena.
+
+        The Player 0 attractor of each set is kept across rounds. The remaining arena
+        is a trap for Player 1, hence, an attractor disjoint from the removed vertices
+        is still the attractor within it and only attractors touching the removed
+        vertices are recomputed. In the worst case every round touches all of them
+        which amounts to O(k·n) attractor computations.
+        """
+        region = arena.vertices - arena.vertices
+        sets = self.accepting_sets
+        attractors: typing.List[typing.Optional[Vertices]] = [None] * len(sets)
+        statistics = instrumentation.local.current
+        index = covered = 0
+        while covered < len(sets):
+            if statistics is not None:
+                statistics.iteration('generalized-buchi', region)
+            if attractors[index] is None:
+                attractors[index] = arena.attractor0(sets[index] & arena.vertices)
+            escape = arena.vertices - attractors[index]
+            if escape:
+                # Player 1 avoids the accepting set forever, check the set again
+                removed = arena.attractor1(escape)
+                region = region | removed
+                arena = arena.restrict(arena.vertices - removed)
+                for other, attracted in enumerate(attractors):
+                    if attracted is not None and attracted & removed:
+                        attractors[other] = None
+                covered = 0
+            else:
+                covered += 1
+                index = (index + 1) % len(sets)
+        return region
+
+    def complement(self, arena: Arena):
+        # avoid one of the accepting sets globally eventually
+        return GeneralizedPersistence(arena.vertices - accepting_vertices
+                                      for accepting_vertices in self.accepting_sets)
+
+    def solve(self, arena: Arena) -> Solution:
+        raise UnsupportedOperation('Winning strategies of Player 0 require memory.')
+
+
+class GeneralizedPersistence(Condition):
+    """
+    Generalized persistence or generalized co-Büchi winning condition.
+
+    The goal of Player 0 is to globally avoid the unsafe vertices of one of the safe
+    sets eventually.
+
+    GENcoBÜCHI(C₁, …, Cₖ) := {ρ ∈ ω(V) | Inf(ρ) ⊆ Cᵢ for some 1 ≤ i ≤ k}
+
+    LTL: FG(v ∈ C₁) ∨ … ∨ FG(v ∈ Cₖ)
+    """
+
+    def __init__(self, safe_sets: typing.Iterable[Vertices]):
+        self.safe_sets: typing.Tuple[Vertices, ...] = tuple(
+            _freeze(safe_vertices) for safe_vertices in safe_sets
+        )
+
+    def __repr__(self):
+        sets = ', '.join(map(_format, self.safe_sets))
+        return f'GeneralizedPersistence([{sets}])'
+
+    def check(self, arena: Arena):
+        for safe_vertices in self.safe_sets:
+            if not safe_vertices <= arena.vertices:
+                raise IncompatibleArena('Safe vertices must be a subset of the vertices.')
+
+    def complement(self, arena: Arena):
+        # visit the unsafe vertices of every safe set infinitely often
+        return GeneralizedRecurrence(arena.vertices - safe_vertices
+                                     for safe_vertices in self.safe_sets)
+
+    def restrict(self, vertices: Vertices):
+        return GeneralizedPersistence(safe_vertices & vertices
+                                      for safe_vertices in self.safe_sets)
+
+    def winning_region0(self, arena: Arena) -> Vertices:
+        # Player 0 wins where Player 1 cannot visit every set of unsafe vertices
+        return self.complement(arena).winning_region1(arena.dual())
+
+    def winning_region1(self, arena: Arena) -> Vertices:
+        return arena.vertices - self.winning_region0(arena)
+
+    def solve(self, arena: Arena) -> Solution:
+        raise UnsupportedOperation('Winning strategies of Player 1 require memory.')
+
+
+class GeneralizedReachability(Condition):
+    """
+    Generalized reachability winning condition.
+
+    The goal of Player 0 is to reach one of the goal sets.
+
+    GENREACH(R₁, …, Rₖ) := {ρ ∈ ω(V) | Occ(ρ) ∩ Rᵢ ≠ ∅ for some 1 ≤ i ≤ k}
+
+    LTL: F(v ∈ R₁) ∨ … ∨ F(v ∈ Rₖ)
+    """
+
+    def __init__(self, goal_sets: typing.Iterable[Vertices]):
+        self.goal_sets: typing.Tuple[Vertices, ...] = tuple(
+            _freeze(goal_vertices) for goal_vertices in goal_sets
+        )
+
+    def __repr__(self):
+        sets = ', '.join(map(_format, self.goal_sets))
+        return f'GeneralizedReachability([{sets}])'
+
+    def check(self, arena: Arena):
+        for goal_vertices in self.goal_sets:
+            if not goal_vertices <= arena.vertices:
+                raise IncompatibleArena('Goal vertices must be a subset of the vertices.')
+
+    def goal_vertices(self, arena: Arena) -> Vertices:
+        """ Returns the union of the goal sets. """
+        goal_vertices = arena.vertices - arena.vertices
+        for vertices in self.goal_sets:
+            goal_vertices = goal_vertices | vertices
+        return goal_vertices
+
+    def complement(self, arena: Arena):
+        # do never reach any of the goal sets
+        return Safety(arena.vertices - self.goal_vertices(arena))
+
+    def winning_region0(self, arena: Arena) -> Vertices:
+        # the disjunction is decided by a single attractor of the union
+        return arena.attractor0(self.goal_vertices(arena))
+
+    def winning_region1(self, arena: Arena) -> Vertices:
+        return arena.vertices - self.winning_region0(arena)
+
+    def solve(self, arena: Arena) -> Solution:
+        return Reachability(self.goal_vertices(arena)).solve(arena)
+
+
 class Parity(Condition):
     """
     Parity winning condition.
@@ -207,20 +549,51 @@ class Parity(Condition):
     PARITY(Ω) := {ρ ∈ ω(V) | max Inf(Ω(ρ)) is even}
     """
 
-    def __init__(self, coloring: typing.Mapping[Vertex, int]):
+    def __init__(self,
+                 coloring: typing.Mapping[Vertex, int],
+                 solver: typing.Optional[parity.Solver] = None):
         self.coloring = dict(coloring)
+        # the parity game solver to be used, defaults to `parity.solver`
+        self.solver = solver
 
     def __repr__(self):
-        return f'Parity({self.mapping!r})'
+        return f'Parity({self.coloring!r})'
 
     def check(self, arena: Arena):
         if not arena.vertices <= self.coloring.keys():
             raise IncompatibleArena('Every vertex must be assigned a color.')
 
-    def winning_region0(self, arena: Arena) -> Vertices:
-        # TODO: implement winning region computation
-        raise NotImplementedError()
-
-    def winning_region1(self, arena: Arena) -> Vertices:
-        # TODO: implement winning region computation
-        raise NotImplementedError()
+    def complement(self, arena: Arena):
+        # shifting every color by one swaps the parity of the maximum
+        coloring = {vertex: color + 1 for vertex, color in self.coloring.items()}
+        return Parity(coloring, self.solver)
+
+    def restrict(self, vertices: Vertices):
+        coloring = {vertex: self.coloring[vertex] for vertex in vertices}
+        return Parity(coloring, self.solver)
+
+    def winning_regions(self,
+                        arena: Arena,
+                        solver: typing.Optional[parity.Solver] = None
+                        ) -> typing.Tuple[Vertices, Vertices]:
+        """ Computes the winning regions of both players in one run of the solver. """
+        solver = solver or self.solver or parity.solver
+        return solver(arena, self.coloring)
+
+    def winning_region0(self,
+                        arena: Arena,
+                        solver: typing.Optional[parity.Solver] = None) -> Vertices:
+        return self.winning_regions(arena, solver)[0]
+
+    def winning_region1(self,
+                        arena: Arena,
+                        solver: typing.Optional[parity.Solver] = None) -> Vertices:
+        return self.winning_regions(arena, solver)[1]
+
+    def solve(self,
+              arena: Arena,
+              solver: typing.Optional[parity.Solver] = None) -> Solution:
+        solver = solver or self.solver or parity.solver
+        strategy = _strategy(arena)
+        region0, region1 = solver(arena, self.coloring, strategy)
+        return solution(arena, region0, region1, strategy)
@@ -0,0 +1,185 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import concurrent.futures
+import typing
+
+from .arena import Vertex, Vertices, FrozenVertices, Arena
+from .condition import Condition
+from .parity import Regions
+
+
+def components(arena: Arena) -> typing.List[FrozenVertices]:
+    """
+    Computes the strongly connected components with Tarjan's algorithm.
+
+    The components are returned in reverse topological order, i.e., every component
+    comes after all components reachable from it, bottom components come first.
+    """
+    indices: typing.Dict[Vertex, int] = {}
+    lowlinks: typing.Dict[Vertex, int] = {}
+    stack: typing.List[Vertex] = []
+    on_stack: typing.Set[Vertex] = set()
+    result: typing.List[FrozenVertices] = []
+    for root in arena.vertices:
+        if root in indices:
+            continue
+        indices[root] = lowlinks[root] = len(indices)
+        stack.append(root)
+        on_stack.add(root)
+        # the recursion of Tarjan's algorithm with explicit successor iterators
+        work = [(root, iter(arena.successors(root)))]
+        while work:
+            vertex, successors = work[-1]
+            for successor in successors:
+                if successor not in indices:
+                    indices[successor] = lowlinks[successor] = len(indices)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(arena.successors(successor))))
+                    break
+                elif successor in on_stack:
+                    lowlinks[vertex] = min(lowlinks[vertex], indices[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[vertex])
+                if lowlinks[vertex] == indices[vertex]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                        if member == vertex:
+                            break
+                    result.append(frozenset(component))
+    return result
+
+
+def _attractor(arena: Arena,
+               component: FrozenVertices,
+               target: Vertices,
+               own: Vertices) -> typing.Set[Vertex]:
+    """
+    Computes the vertices of the component attracted to the target outside of it.
+
+    Unlike the attractor of a subarena, the successors of the opponent's vertices
+    are counted in the whole arena, successors in other components are decided.
+    """
+    attracted: typing.Set[Vertex] = set()
+    counters: typing.Dict[Vertex, int] = {}
+    pending = []
+    for vertex in component:
+        successors = arena.successors(vertex)
+        if vertex in own:
+            if successors & target:
+                attracted.add(vertex)
+                pending.append(vertex)
+        else:
+            counters[vertex] = len(successors - target)
+            if not counters[vertex]:
+                attracted.add(vertex)
+                pending.append(vertex)
+    while pending:
+        for predecessor in arena.predecessors(pending.pop()):
+            if predecessor not in component or predecessor in attracted:
+                continue
+            if predecessor not in own:
+                counters[predecessor] -= 1
+                if counters[predecessor]:
+                    continue
+            attracted.add(predecessor)
+            pending.append(predecessor)
+    return attracted
+
+
+def _solve(condition: Condition, arena: Arena) -> Regions:
+    """ Solves a residual subarena, runs in the worker processes. """
+    region0 = frozenset(condition.winning_region0(arena))
+    return region0, arena.vertices - region0
+
+
+def solve(arena: Arena,
+          condition: Condition,
+          processes: typing.Optional[int] = None,
+          inline: int = 1024) -> Regions:
+    """
+    Computes the winning regions by decomposing the arena into its strongly
+    connected components which are solved bottom-up.
+
+    A component is solved once all components reachable from it are solved: the
+    attractors of the decided winning regions are removed from it and the residual
+    subarena is solved with the restriction of the prefix-independent condition.
+    Residual subarenas with at least `inline` vertices are solved in a process pool
+    with the given number of processes such that independent components are solved
+    in parallel, smaller ones and all of them if `processes` is 1 are solved inline.
+    """
+    order = components(arena)
+    component_of: typing.Dict[Vertex, int] = {
+        vertex: index for index, component in enumerate(order) for vertex in component
+    }
+    # the components with edges into a component and the number of undecided ones
+    parents: typing.List[typing.Set[int]] = [set() for _ in order]
+    waiting: typing.List[int] = [0] * len(order)
+    for index, component in enumerate(order):
+        children = {component_of[successor]
+                    for vertex in component
+                    for successor in arena.successors(vertex)} - {index}
+        for child in children:
+            parents[child].add(index)
+        waiting[index] = len(children)
+    regions: typing.List[typing.Set[Vertex]] = [set(), set()]
+    ready = [index for index, count in enumerate(waiting) if not count]
+
+    def decide(index: int, region0: Vertices, region1: Vertices):
+        regions[0].update(region0)
+        regions[1].update(region1)
+        for parent in parents[index]:
+            waiting[parent] -= 1
+            if not waiting[parent]:
+                ready.append(parent)
+
+    def residual(index: int) -> typing.Tuple[Vertices, Vertices, Arena]:
+        component = order[index]
+        attractor0 = _attractor(arena, component, regions[0], arena.player0)
+        attractor1 = _attractor(arena, component, regions[1], arena.player1)
+        vertices = component - attractor0 - attractor1
+        subarena = Arena(vertices, vertices & arena.player0, vertices & arena.player1,
+                         {(vertex, successor) for vertex in vertices
+                          for successor in arena.successors(vertex) & vertices})
+        return attractor0, attractor1, subarena
+
+    executor = None
+    if processes != 1:
+        executor = concurrent.futures.ProcessPoolExecutor(processes)
+    try:
+        futures: typing.Dict[concurrent.futures.Future,
+                             typing.Tuple[int, Vertices, Vertices]] = {}
+        while ready or futures:
+            while ready:
+                index = ready.pop()
+                attractor0, attractor1, subarena = residual(index)
+                if not subarena.vertices:
+                    decide(index, attractor0, attractor1)
+                    continue
+                restricted = condition.restrict(subarena.vertices)
+                if executor is None or len(subarena.vertices) < inline:
+                    region0, region1 = _solve(restricted, subarena)
+                    decide(index, attractor0 | region0, attractor1 | region1)
+                else:
+                    future = executor.submit(_solve, restricted, subarena)
+                    futures[future] = (index, attractor0, attractor1)
+            if futures:
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    index, attractor0, attractor1 = futures.pop(future)
+                    region0, region1 = future.result()
+                    decide(index, attractor0 | region0, attractor1 | region1)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return frozenset(regions[0]), frozenset(regions[1])
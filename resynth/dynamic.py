@@ -0,0 +1,246 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import typing
+import weakref
+
+from .arena import Vertex, Vertices, Edges, Arena, InvalidArena
+from .condition import Condition, Reachability, Safety, UnsupportedOperation
+
+
+class DynamicArena(Arena):
+    """
+    A mutable arena supporting the insertion and deletion of vertices and edges.
+
+    The adjacency index is updated in place and attractors obtained by `maintain`
+    are kept up to date after every change. Vertices may temporarily have no
+    successors, such vertices are lost by their owner as it cannot move.
+    """
+
+    def __init__(self,
+                 vertices: Vertices,
+                 player0: Vertices,
+                 player1: Vertices,
+                 edges: Edges):
+        super().__init__(vertices, player0, player1, edges)
+        self._vertices = set(self._vertices)
+        self._player0 = set(self._player0)
+        self._player1 = set(self._player1)
+        self._edges = set(self._edges)
+        self._successors = {
+            vertex: set(successors) for vertex, successors in self._successors.items()
+        }
+        self._predecessors = {
+            vertex: set(sources) for vertex, sources in self._predecessors.items()
+        }
+        self._attractors: typing.MutableSet['IncrementalAttractor'] = weakref.WeakSet()
+
+    @classmethod
+    def from_arena(cls, arena: Arena) -> 'DynamicArena':
+        """ Returns a mutable copy of the given arena. """
+        return cls(arena.vertices, arena.player0, arena.player1, arena.edges)
+
+    def _verify(self):
+        """ Verifies that the arena is valid, vertices may have no successors. """
+        if self.player0 & self.player1:
+            raise InvalidArena('Player 0 and Player 1 vertices are not disjoint!')
+        if self.player0 | self.player1 != self.vertices:
+            raise InvalidArena('Player 0 and Player 1 vertices are not a V-partition!')
+
+    def dual(self) -> 'DynamicArena':
+        """ Returns a mutable copy of the dual of the arena. """
+        return DynamicArena(self.vertices, self.player1, self.player0, self.edges)
+
+    def add_vertex(self, vertex: Vertex, player: int):
+        """ Adds a vertex of the given player without any edges. """
+        if vertex in self._vertices:
+            raise InvalidArena(f'Vertex {vertex!r} is already a vertex of the arena!')
+        self._vertices.add(vertex)
+        (self._player1 if player else self._player0).add(vertex)
+        self._successors[vertex] = set()
+        self._predecessors[vertex] = set()
+        for attractor in self._attractors:
+            attractor._add_vertex(vertex)
+        # the dense ids and the NumPy index are rebuilt on next use
+        self._names = None
+        self._vectorized = None
+
+    def remove_vertex(self, vertex: Vertex):
+        """ Removes a vertex together with all its incoming and outgoing edges. """
+        if vertex not in self._vertices:
+            raise InvalidArena(f'Vertex {vertex!r} is not a vertex of the arena!')
+        for successor in list(self._successors[vertex]):
+            self.remove_edge(vertex, successor)
+        for predecessor in list(self._predecessors[vertex]):
+            self.remove_edge(predecessor, vertex)
+        for attractor in self._attractors:
+            attractor._remove_vertex(vertex)
+        self._vertices.remove(vertex)
+        self._player0.discard(vertex)
+        self._player1.discard(vertex)
+        del self._successors[vertex]
+        del self._predecessors[vertex]
+        self._names = None
+        self._vectorized = None
+
+    def add_edge(self, source: Vertex, target: Vertex):
+        """ Adds an edge between two vertices of the arena. """
+        if source not in self._vertices or target not in self._vertices:
+            raise InvalidArena(f'Edge {(source, target)!r} leaves the vertices!')
+        if target in self._successors[source]:
+            return
+        self._edges.add((source, target))
+        self._successors[source].add(target)
+        self._predecessors[target].add(source)
+        self._vectorized = None
+        for attractor in self._attractors:
+            attractor._add_edge(source, target)
+
+    def remove_edge(self, source: Vertex, target: Vertex):
+        """ Removes an edge of the arena. """
+        if (source, target) not in self._edges:
+            raise InvalidArena(f'Edge {(source, target)!r} is not an edge of the arena!')
+        self._edges.remove((source, target))
+        self._successors[source].remove(target)
+        self._predecessors[target].remove(source)
+        self._vectorized = None
+        for attractor in self._attractors:
+            attractor._remove_edge(source, target)
+
+    def maintain(self, condition: Condition) -> 'IncrementalAttractor':
+        """
+        Returns the attractor deciding the given reachability or safety condition
+        which is kept up to date while the arena changes.
+
+        Vertices added later are neither goal nor unsafe vertices.
+        """
+        if isinstance(condition, Reachability):
+            return IncrementalAttractor(self, condition.goal_vertices, 0)
+        if isinstance(condition, Safety):
+            return IncrementalAttractor(self, self.vertices - condition.safe_vertices, 1)
+        raise UnsupportedOperation('Unable to maintain given condition.')
+
+
+class IncrementalAttractor:
+    """
+    The attractor of a player to target vertices of a dynamic arena which is
+    updated incrementally after every change of the arena or the targets.
+
+    For every vertex the number of its successors within the attractor is counted.
+    Growing the attractor propagates along predecessors as usual. When a change may
+    remove vertices, the attracted vertices which can reach them within the
+    attractor lose their justification and are re-attracted locally, all other
+    attracted vertices remain attracted. Hence, the cost of an update is tied to the
+    region affected by it.
+    """
+
+    def __init__(self, arena: DynamicArena, targets: Vertices, player: int):
+        self.arena = arena
+        self.player = player
+        self.targets: typing.Set[Vertex] = set(targets)
+        self.region: typing.Set[Vertex] = set()
+        self._counters: typing.Dict[Vertex, int] = {
+            vertex: 0 for vertex in arena.vertices
+        }
+        self._attract(vertex for vertex in arena.vertices if self._justified(vertex))
+        arena._attractors.add(self)
+
+    @property
+    def winning_region0(self) -> Vertices:
+        """ The current winning region of Player 0. """
+        if self.player:
+            return frozenset(self.arena.vertices - self.region)
+        return frozenset(self.region)
+
+    @property
+    def winning_region1(self) -> Vertices:
+        """ The current winning region of Player 1. """
+        if self.player:
+            return frozenset(self.region)
+        return frozenset(self.arena.vertices - self.region)
+
+    def _own(self, vertex: Vertex) -> bool:
+        return vertex in (self.arena.player1 if self.player else self.arena.player0)
+
+    def _justified(self, vertex: Vertex) -> bool:
+        """ Checks whether a vertex outside of the attractor has to be attracted. """
+        if vertex in self.targets:
+            return True
+        if self._own(vertex):
+            return self._counters[vertex] > 0
+        return self._counters[vertex] == len(self.arena.successors(vertex))
+
+    def _attract(self, vertices: typing.Iterable[Vertex]):
+        """ Adds the given vertices and propagates along predecessors. """
+        pending = []
+        for vertex in vertices:
+            if vertex not in self.region:
+                self.region.add(vertex)
+                pending.append(vertex)
+        while pending:
+            for predecessor in self.arena.predecessors(pending.pop()):
+                self._counters[predecessor] += 1
+                if predecessor not in self.region and self._justified(predecessor):
+                    self.region.add(predecessor)
+                    pending.append(predecessor)
+
+    def _invalidate(self, vertices: typing.Iterable[Vertex]):
+        """ Re-attracts the vertices which may have lost their justification. """
+        invalid = set()
+        pending = [vertex for vertex in vertices
+                   if vertex in self.region and vertex not in self.targets]
+        invalid.update(pending)
+        while pending:
+            for predecessor in self.arena.predecessors(pending.pop()):
+                if (predecessor in self.region and predecessor not in self.targets
+                        and predecessor not in invalid):
+                    invalid.add(predecessor)
+                    pending.append(predecessor)
+        self.region -= invalid
+        for vertex in invalid:
+            for predecessor in self.arena.predecessors(vertex):
+                self._counters[predecessor] -= 1
+        self._attract(vertex for vertex in invalid if self._justified(vertex))
+
+    def add_target(self, vertex: Vertex):
+        """ Adds a vertex to the targets. """
+        self.targets.add(vertex)
+        self._attract([vertex])
+
+    def remove_target(self, vertex: Vertex):
+        """ Removes a vertex from the targets. """
+        self.targets.discard(vertex)
+        self._invalidate([vertex])
+
+    def _add_edge(self, source: Vertex, target: Vertex):
+        if target in self.region:
+            self._counters[source] += 1
+        if source in self.region:
+            # the opponent may escape the attractor through the new edge, even if its
+            # target is attracted, it may be attracted only through the source
+            if not self._own(source):
+                self._invalidate([source])
+        elif self._justified(source):
+            self._attract([source])
+
+    def _remove_edge(self, source: Vertex, target: Vertex):
+        if target in self.region:
+            self._counters[source] -= 1
+        if source in self.region:
+            # the player may have lost the edge attracting the vertex
+            if self._own(source) and target in self.region:
+                self._invalidate([source])
+        elif self._justified(source):
+            self._attract([source])
+
+    def _add_vertex(self, vertex: Vertex):
+        self._counters[vertex] = 0
+        if self._justified(vertex):
+            self._attract([vertex])
+
+    def _remove_vertex(self, vertex: Vertex):
+        # the vertex has no edges anymore when it is removed
+        self.targets.discard(vertex)
+        self.region.discard(vertex)
+        del self._counters[vertex]
@@ -0,0 +1,239 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import array
+import mmap
+import struct
+import sys
+import typing
+
+from .arena import Arena
+from .compact import OFFSET, INDEX, CompactArena, _Identity, _compress
+from .condition import Parity
+from .parity import Coloring
+
+
+class InvalidFormat(Exception):
+    """ Raised when reading a malformed game file. """
+
+
+# the binary format starts with the magic and a header consisting of the number of
+# vertices, the number of edges, and the flags, all sections are 8-byte aligned
+MAGIC = b'RSYNARN1'
+HEADER = struct.Struct('<8sQQQ')
+
+# the arrays are stored in the byte order of the writing machine
+FLAG_BIG_ENDIAN = 1
+FLAG_COLORS = 2
+
+COLOR = 'q'
+
+
+def _statements(file: typing.TextIO) -> typing.Iterator[typing.Tuple[int, str]]:
+    """
+    Yields the `;`-terminated statements of a PGSolver file with line numbers.
+
+    Quoted names may contain `;` and span lines, hence, the text between quotes is
+    never split.
+    """
+    pending = ''
+    quoted = False
+    for number, line in enumerate(file, 1):
+        for index, part in enumerate(line.split('"')):
+            if index:
+                pending += '"'
+                quoted = not quoted
+            if quoted:
+                pending += part
+                continue
+            *statements, part = part.split(';')
+            for statement in statements:
+                statement = (pending + statement).strip()
+                pending = ''
+                if statement:
+                    yield number, statement
+            pending += part
+    if quoted:
+        raise InvalidFormat(f'Unterminated name in statement {pending.strip()!r}!')
+    if pending.strip():
+        raise InvalidFormat(f'Unterminated statement {pending.strip()!r}!')
+
+
+def read_pgsolver(file: typing.TextIO) -> typing.Tuple[CompactArena, Parity]:
+    """
+    Reads a parity game in PGSolver format into a compact arena and the parity
+    condition given by the priorities.
+
+    The file is processed statement by statement and the edges are accumulated in
+    integer arrays only. Identifiers forming the range 0, …, n - 1 become the
+    vertices directly, otherwise they are mapped onto dense ids. Vertex names and
+    the `start` statement are ignored.
+    """
+    identifiers = array.array(OFFSET)
+    priorities = array.array(COLOR)
+    owners = bytearray()
+    # line numbers of the declarations for reporting invalid successors
+    lines = array.array(OFFSET)
+    sources = array.array(INDEX)
+    targets = array.array(OFFSET)
+    for number, statement in _statements(file):
+        if statement.split(None, 1)[0] in ('parity', 'start'):
+            continue
+        # strip the optional name which may contain whitespace
+        fields = statement.split('"', 1)[0].split()
+        if len(fields) == 3:
+            raise InvalidFormat(f'Line {number}: Vertex {fields[0]} has no successors!')
+        if len(fields) != 4:
+            raise InvalidFormat(f'Line {number}: Invalid vertex {statement!r}!')
+        try:
+            identifier, priority, owner = int(fields[0]), int(fields[1]), int(fields[2])
+            successors = [int(successor) for successor in fields[3].split(',')]
+        except ValueError:
+            raise InvalidFormat(f'Line {number}: Invalid vertex {statement!r}!')
+        if owner not in (0, 1):
+            raise InvalidFormat(f'Line {number}: Invalid owner {owner}!')
+        source = len(identifiers)
+        identifiers.append(identifier)
+        priorities.append(priority)
+        owners.append(owner)
+        lines.append(number)
+        for successor in successors:
+            sources.append(source)
+            targets.append(successor)
+    size = len(identifiers)
+    names: typing.Sequence[int]
+    ids: typing.Mapping[int, int]
+    # maps the declarations onto the dense ids of their vertices
+    dense: typing.Sequence[int]
+    if sorted(identifiers) == list(range(size)):
+        names, ids, dense = range(size), _Identity(size), identifiers
+    else:
+        names = list(identifiers)
+        ids = {identifier: index for index, identifier in enumerate(names)}
+        if len(ids) != size:
+            raise InvalidFormat('Vertex identifiers are not unique!')
+        dense = range(size)
+    player0 = bytearray((size + 7) // 8)
+    coloring: typing.Dict[int, int] = {}
+    for index, owner in enumerate(owners):
+        vertex = dense[index]
+        if not owner:
+            player0[vertex >> 3] |= 1 << (vertex & 7)
+        coloring[names[vertex]] = priorities[index]
+    del owners, priorities
+    edges = array.array(INDEX, bytes(array.array(INDEX).itemsize * len(targets)))
+    for position, target in enumerate(targets):
+        try:
+            edges[position] = ids[target]
+        except KeyError:
+            number = lines[sources[position]]
+            raise InvalidFormat(f'Line {number}: Edge to undeclared vertex {target}!')
+    del targets, lines
+    for position, source in enumerate(sources):
+        sources[position] = dense[source]
+    del identifiers, dense
+    offsets, edges = _compress(size, sources, edges)
+    del sources
+    return CompactArena.from_csr(names, player0, offsets, edges), Parity(coloring)
+
+
+def write_pgsolver(arena: Arena, coloring: Coloring, file: typing.TextIO):
+    """
+    Writes a parity game in PGSolver format.
+
+    Vertices are numbered by their dense ids for compact arenas and in iteration
+    order otherwise, the original vertices are written as names.
+    """
+    if isinstance(arena, CompactArena):
+        vertices = [arena.vertex(index) for index in range(len(arena.vertices))]
+    else:
+        vertices = list(arena.vertices)
+    ids = {vertex: index for index, vertex in enumerate(vertices)}
+    player0 = arena.player0
+    file.write(f'parity {len(vertices) - 1};\n')
+    for index, vertex in enumerate(vertices):
+        successors = ','.join(
+            str(target) for target in sorted(ids[successor]
+                                             for successor in arena.successors(vertex))
+        )
+        name = str(vertex).replace('"', "'")
+        owner = 0 if vertex in player0 else 1
+        file.write(f'{index} {coloring[vertex]} {owner} {successors} "{name}";\n')
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def save(arena: Arena, path: str, coloring: typing.Optional[Coloring] = None):
+    """
+    Saves the arena and optionally a coloring in the binary format.
+
+    The arena is stored in its compact CSR layout including the predecessor and
+    degree arrays such that it can be loaded without rebuilding any index. The
+    vertices are stored as their dense ids, i.e., the arena is loaded with the
+    vertices 0, …, n - 1.
+    """
+    if not isinstance(arena, CompactArena):
+        arena = CompactArena.from_arena(arena)
+    size = len(arena._names)
+    flags = FLAG_BIG_ENDIAN if sys.byteorder == 'big' else 0
+    if coloring is not None:
+        flags |= FLAG_COLORS
+    sections = [
+        arena._player0,
+        arena._successor_offsets,
+        arena._successor_targets,
+        arena._predecessor_offsets,
+        arena._predecessor_targets,
+        arena._degrees
+    ]
+    if coloring is not None:
+        sections.append(array.array(COLOR, (coloring[arena.vertex(index)]
+                                            for index in range(size))))
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, size, len(arena._successor_targets), flags))
+        for section in sections:
+            data = bytes(section)
+            file.write(data)
+            file.write(bytes(_pad(len(data))))
+
+
+def load(path: str) -> typing.Tuple[CompactArena, typing.Optional[Parity]]:
+    """
+    Loads an arena and the parity condition if a coloring has been saved.
+
+    The file is memory-mapped and the arrays of the arena are views into the
+    mapping, hence, loading takes constant time independent of the size of the
+    arena and pages are read on demand. The arena is not verified again. Only the
+    coloring is copied into the parity condition.
+    """
+    with open(path, 'rb') as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    if len(view) < HEADER.size:
+        raise InvalidFormat('File is too short!')
+    magic, size, count, flags = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise InvalidFormat('File is not an arena!')
+    if bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == 'big'):
+        raise InvalidFormat('File has been written with a different byte order!')
+    position = HEADER.size
+
+    def section(typecode: str, length: int) -> memoryview:
+        nonlocal position
+        width = length * array.array(typecode).itemsize
+        if position + width > len(view):
+            raise InvalidFormat('File is truncated!')
+        result = view[position:position + width].cast(typecode)
+        position += width + _pad(width)
+        return result
+
+    player0 = section('B', (size + 7) // 8)
+    offsets, targets = section(OFFSET, size + 1), section(INDEX, count)
+    index = section(OFFSET, size + 1), section(INDEX, count), section(INDEX, size)
+    arena = CompactArena.from_csr(range(size), player0, offsets, targets, index)
+    if not flags & FLAG_COLORS:
+        return arena, None
+    return arena, Parity(dict(enumerate(section(COLOR, size))))
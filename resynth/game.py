@@ -2,28 +2,92 @@
 #
 # Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
 
-from .arena import Generic, Vertices, Arena
+import typing
+
+from .arena import Generic, Vertices, Arena, UnsupportedOperation
 from .condition import Condition
+from .instrumentation import Callback, Statistics, instrument
+from .strategy import Solution, Strategy
 
 
 class Game(Generic):
-    """ A game G = (A, Win) consists of an arena and a winning condition. """
+    """
+    A game G = (A, Win) consists of an arena and a winning condition.
+
+    The winning regions and the solution are memoized, as games are determined the
+    winning region of one player is the complement of the other one's, hence, both
+    are obtained by one solve. The arena and the condition must not be changed.
+    """
 
     def __init__(self, arena: Arena, condition: Condition):
         self.arena: Arena = arena
         self.condition: Condition = condition
         # ensure condition is compatible with arena
         self.condition.check(self.arena)
+        self._regions: typing.Optional[typing.Tuple[Vertices, Vertices]] = None
+        self._solution: typing.Optional[Solution] = None
+
+    def _winning_regions(self) -> typing.Tuple[Vertices, Vertices]:
+        if self._regions is None:
+            region0 = self.condition.winning_region0(self.arena)
+            self._regions = region0, self.arena.vertices - region0
+        return self._regions
 
     def winning_region0(self) -> Vertices:
         """ Returns the winning region of Player 0. """
-        return self.condition.winning_region0(self.arena)
+        return self._winning_regions()[0]
 
     def winning_region1(self) -> Vertices:
         """ Returns the winning region of Player 1. """
-        return self.condition.winning_region1(self.arena)
+        return self._winning_regions()[1]
+
+    def solve(self) -> Solution:
+        """ Returns the winning regions and winning strategies of both players. """
+        if self._solution is None:
+            self._solution = self.condition.solve(self.arena)
+            self._regions = self._solution.region0, self._solution.region1
+        return self._solution
+
+    def profile(self, *callbacks: Callback
+                ) -> typing.Tuple[typing.Optional[Solution], Statistics]:
+        """
+        Returns the solution together with the statistics collected while solving,
+        the callbacks are called on every iteration of a fixpoint loop.
+
+        If no strategies can be computed for the arena and the condition, e.g., for
+        symbolic arenas, the winning regions are profiled instead and the solution
+        is none. The winning regions are memoized in both cases.
+        """
+        # solve again to collect the statistics
+        self._solution = None
+        try:
+            with instrument(*callbacks) as statistics:
+                solution = self.solve()
+        except UnsupportedOperation:
+            self._regions = None
+            with instrument(*callbacks) as statistics:
+                self._winning_regions()
+            return None, statistics
+        return solution, statistics
+
+    def strategy0(self) -> Strategy:
+        """ Returns a positional winning strategy of Player 0 on its winning region. """
+        return self.solve().strategy0
+
+    def strategy1(self) -> Strategy:
+        """ Returns a positional winning strategy of Player 1 on its winning region. """
+        return self.solve().strategy1
 
     def dual(self) -> 'Game':
-        """ Returns the dual of the game. """
+        """
+        Returns the dual of the game, the roles of the players are swapped and the
+        memoized results are carried over.
+        """
         condition = self.condition.complement(self.arena)
-        return Game(self.arena.dual(), condition)
+        dual = Game(self.arena.dual(), condition)
+        if self._regions is not None:
+            dual._regions = self._regions[1], self._regions[0]
+        if self._solution is not None:
+            dual._solution = Solution(self._solution.region1, self._solution.region0,
+                                      self._solution.strategy1, self._solution.strategy0)
+        return dual
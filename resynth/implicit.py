@@ -0,0 +1,219 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import collections
+import typing
+
+from . import instrumentation
+from .arena import Generic, Vertex, Vertices, FrozenVertices, Arena, InvalidArena
+from .condition import Reachability, Safety, Recurrence
+from .dynamic import DynamicArena
+
+
+Owner = typing.Callable[[Vertex], int]
+Successors = typing.Callable[[Vertex], typing.Iterable[Vertex]]
+
+# a set of vertices given explicitly or by its membership predicate
+Target = typing.Union[Vertices, typing.Callable[[Vertex], bool]]
+
+# decides the winner of a vertex in the explored part of an arena or returns none
+Decider = typing.Callable[[Arena, FrozenVertices], typing.Optional[int]]
+
+
+class ImplicitArena(Generic):
+    """
+    An arena given by initial vertices, an owner function mapping vertices to their
+    player, and a successor function.
+
+    Vertices are materialized when they are explored, i.e., when their successors
+    are asked for the first time. The successors are cached, vertices which are not
+    reachable or never touched by a solver are never materialized. The local solvers
+    start from the initial vertex unless they are given another one.
+    """
+
+    def __init__(self,
+                 initial: typing.Iterable[Vertex],
+                 owner: Owner,
+                 successors: Successors):
+        self.initial: FrozenVertices = frozenset(initial)
+        self._owner = owner
+        self._successor_function = successors
+        self._owners: typing.Dict[Vertex, int] = {}
+        self._successors: typing.Dict[Vertex, FrozenVertices] = {}
+
+    @property
+    def explored(self) -> FrozenVertices:
+        """ The vertices whose successors have been materialized so far. """
+        return frozenset(self._successors)
+
+    def owner(self, vertex: Vertex) -> int:
+        """ Returns the player owning the given vertex. """
+        try:
+            return self._owners[vertex]
+        except KeyError:
+            player = self._owners[vertex] = self._owner(vertex)
+            return player
+
+    def successors(self, vertex: Vertex) -> FrozenVertices:
+        """ Returns the successors of the given vertex exploring it if necessary. """
+        try:
+            return self._successors[vertex]
+        except KeyError:
+            successors = frozenset(self._successor_function(vertex))
+            if not successors:
+                raise InvalidArena(f'Vertex {vertex!r} has no successors!')
+            self._successors[vertex] = successors
+            return successors
+
+    def materialize(self) -> Arena:
+        """ Explores all vertices reachable from the initial vertices. """
+        vertices = set(self.initial)
+        pending = list(self.initial)
+        edges = set()
+        while pending:
+            vertex = pending.pop()
+            for successor in self.successors(vertex):
+                edges.add((vertex, successor))
+                if successor not in vertices:
+                    vertices.add(successor)
+                    pending.append(successor)
+        player0 = {vertex for vertex in vertices if self.owner(vertex) == 0}
+        return Arena(vertices, player0, vertices - player0, edges)
+
+
+def _predicate(target: Target) -> typing.Callable[[Vertex], bool]:
+    if callable(target):
+        return target
+    return target.__contains__
+
+
+def _explore(arena: ImplicitArena,
+             vertex: Vertex,
+             stop: typing.Callable[[Vertex], bool],
+             decide: Decider,
+             batch: int) -> int:
+    """
+    Explores the arena breadth-first from the vertex in batches of doubling size.
+
+    The explored part is kept in a dynamic arena which grows with every expanded
+    vertex, the successors of a vertex are asked for only once. Vertices which have
+    been discovered but not expanded yet form the frontier and have self loops.
+    After every batch the explored part is solved by the decider. Vertices
+    satisfying the stop predicate are never expanded as their winner does not
+    depend on their successors. Once the frontier is empty, the decider must decide
+    the winner.
+    """
+    explored = DynamicArena(set(), set(), set(), set())
+    explored.add_vertex(vertex, arena.owner(vertex))
+    explored.add_edge(vertex, vertex)
+    frontier = collections.deque([vertex])
+    statistics = instrumentation.local.current
+    while True:
+        budget = batch
+        while frontier and budget:
+            current = frontier.popleft()
+            if stop(current):
+                continue
+            budget -= 1
+            successors = arena.successors(current)
+            for successor in successors:
+                if successor not in explored.vertices:
+                    explored.add_vertex(successor, arena.owner(successor))
+                    explored.add_edge(successor, successor)
+                    frontier.append(successor)
+                explored.add_edge(current, successor)
+            if current not in successors:
+                explored.remove_edge(current, current)
+        if statistics is not None:
+            statistics.successor_lookups += batch - budget
+        winner = decide(explored, frozenset(frontier))
+        if winner is not None:
+            return winner
+        batch *= 2
+
+
+def _initial(arena: ImplicitArena, vertex: typing.Optional[Vertex]) -> Vertex:
+    """ Returns the given vertex or the only initial vertex of the arena. """
+    if vertex is not None:
+        return vertex
+    if len(arena.initial) != 1:
+        raise ValueError('The arena does not have exactly one initial vertex!')
+    return next(iter(arena.initial))
+
+
+def reachability(arena: ImplicitArena,
+                 goal: Target,
+                 vertex: typing.Optional[Vertex] = None,
+                 batch: int = 64) -> int:
+    """
+    Returns the winner of the given vertex where Player 0 wants to reach the goal,
+    the vertex defaults to the only initial vertex of the arena.
+
+    The exploration stops at goal vertices. Player 0 wins if it wins when the
+    frontier is losing for it, Player 1 wins if it wins when the frontier is a goal.
+    """
+    vertex = _initial(arena, vertex)
+    is_goal = _predicate(goal)
+
+    def decide(explored: Arena, frontier: FrozenVertices) -> typing.Optional[int]:
+        goal_vertices = {current for current in explored.vertices if is_goal(current)}
+        if vertex in Reachability(goal_vertices).winning_region0(explored):
+            return 0
+        if vertex in Reachability(goal_vertices | frontier).winning_region1(explored):
+            return 1
+        return None
+
+    return _explore(arena, vertex, is_goal, decide, batch)
+
+
+def safety(arena: ImplicitArena,
+           safe: Target,
+           vertex: typing.Optional[Vertex] = None,
+           batch: int = 64) -> int:
+    """
+    Returns the winner of the given vertex where Player 0 wants to avoid unsafe
+    vertices, the vertex defaults to the only initial vertex of the arena.
+
+    The exploration stops at unsafe vertices. Player 1 wins if it wins when the
+    frontier is safe, Player 0 wins if it wins when the frontier is unsafe.
+    """
+    vertex = _initial(arena, vertex)
+    is_safe = _predicate(safe)
+
+    def decide(explored: Arena, frontier: FrozenVertices) -> typing.Optional[int]:
+        safe_vertices = {current for current in explored.vertices if is_safe(current)}
+        if vertex in Safety(safe_vertices).winning_region1(explored):
+            return 1
+        if vertex in Safety(safe_vertices - frontier).winning_region0(explored):
+            return 0
+        return None
+
+    return _explore(arena, vertex, lambda current: not is_safe(current), decide, batch)
+
+
+def recurrence(arena: ImplicitArena,
+               accepting: Target,
+               vertex: typing.Optional[Vertex] = None,
+               batch: int = 64) -> int:
+    """
+    Returns the winner of the given vertex where Player 0 wants to visit accepting
+    vertices infinitely often, the vertex defaults to the only initial vertex of
+    the arena.
+
+    Player 0 wins if it wins when the frontier is rejecting, Player 1 wins if it
+    wins when the frontier is accepting.
+    """
+    vertex = _initial(arena, vertex)
+    is_accepting = _predicate(accepting)
+
+    def decide(explored: Arena, frontier: FrozenVertices) -> typing.Optional[int]:
+        accepting_vertices = {current for current in explored.vertices
+                              if is_accepting(current) and current not in frontier}
+        if vertex in Recurrence(accepting_vertices).winning_region0(explored):
+            return 0
+        if vertex in Recurrence(accepting_vertices | frontier).winning_region1(explored):
+            return 1
+        return None
+
+    return _explore(arena, vertex, lambda current: False, decide, batch)
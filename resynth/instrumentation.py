@@ -0,0 +1,87 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import contextlib
+import threading
+import typing
+
+
+# called with the statistics, the name of the fixpoint, and its current region
+Callback = typing.Callable[['Statistics', str, typing.Any], None]
+
+
+class Statistics:
+    """
+    Counters of the work done by the algorithms while instrumentation is enabled.
+
+    The callbacks are called on every iteration of an outer fixpoint loop, e.g., to
+    report the progress of a long running solve.
+    """
+
+    def __init__(self, callbacks: typing.Iterable[Callback] = ()):
+        # number of attractor computations
+        self.attractors = 0
+        # number of edges traversed backwards by attractor computations
+        self.edges = 0
+        # number of controlled predecessor computations
+        self.controlled_predecessors = 0
+        # number of iterations of fixpoint loops
+        self.iterations = 0
+        # number of lookups of successors and predecessors in the adjacency index,
+        # counted by the attractor, controlled predecessor, and exploration loops
+        self.successor_lookups = 0
+        self.predecessor_lookups = 0
+        self.callbacks: typing.List[Callback] = list(callbacks)
+
+    def __repr__(self):
+        return (f'Statistics(attractors={self.attractors}, edges={self.edges}, '
+                f'controlled_predecessors={self.controlled_predecessors}, '
+                f'iterations={self.iterations}, '
+                f'successor_lookups={self.successor_lookups}, '
+                f'predecessor_lookups={self.predecessor_lookups})')
+
+    def iteration(self, fixpoint: str, region: typing.Any):
+        """ Records an iteration of the given fixpoint loop and fires the callbacks. """
+        self.iterations += 1
+        for callback in self.callbacks:
+            callback(self, fixpoint, region)
+
+    def update(self, other: 'Statistics'):
+        """ Adds the counters of the other statistics. """
+        self.attractors += other.attractors
+        self.edges += other.edges
+        self.controlled_predecessors += other.controlled_predecessors
+        self.iterations += other.iterations
+        self.successor_lookups += other.successor_lookups
+        self.predecessor_lookups += other.predecessor_lookups
+
+
+class _Local(threading.local):
+    # the statistics collected by the algorithms running in the current thread,
+    # none if instrumentation is disabled
+    current: typing.Optional[Statistics] = None
+
+
+local = _Local()
+
+
+@contextlib.contextmanager
+def instrument(*callbacks: Callback) -> typing.Iterator[Statistics]:
+    """
+    Enables the instrumentation of the current thread and yields the statistics
+    collected while enabled.
+
+    The algorithms check whether statistics are collected once per call or per
+    iteration only and the lookups of arenas do not check at all, hence, disabled
+    instrumentation costs next to nothing. Statistics of nested instrumentation are
+    added to the enclosing statistics.
+    """
+    previous = local.current
+    statistics = local.current = Statistics(callbacks)
+    try:
+        yield statistics
+    finally:
+        local.current = previous
+        if previous is not None:
+            previous.update(statistics)
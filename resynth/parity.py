@@ -0,0 +1,211 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import typing
+
+from . import instrumentation
+from .arena import Vertex, FrozenVertices, Choices, Arena, UnsupportedOperation
+
+
+Coloring = typing.Mapping[Vertex, int]
+Regions = typing.Tuple[FrozenVertices, FrozenVertices]
+Solver = typing.Callable[..., Regions]
+
+
+def zielonka(arena: Arena,
+             coloring: Coloring,
+             strategy: typing.Optional[Choices] = None) -> Regions:
+    """
+    Computes the winning regions of both players with Zielonka's recursive algorithm.
+
+    The recursion works on subarenas which are views of the given arena. If a
+    strategy is given, the winning choices of both players are recorded in it.
+    """
+    if not arena.vertices:
+        return frozenset(), frozenset()
+    if instrumentation.local.current is not None:
+        instrumentation.local.current.iteration('zielonka', arena.vertices)
+    maximum = max(coloring[vertex] for vertex in arena.vertices)
+    # the player who wins if the maximal color is visited infinitely often
+    player = maximum % 2
+    top = {vertex for vertex in arena.vertices if coloring[vertex] == maximum}
+    if player:
+        attractor = arena.attractor1(top, strategy)
+    else:
+        attractor = arena.attractor0(top, strategy)
+    regions = zielonka(arena.restrict(arena.vertices - attractor), coloring, strategy)
+    if not regions[1 - player]:
+        # the player wins everywhere as the opponent cannot escape the attractor forever
+        if strategy is not None:
+            for vertex in top & (arena.player1 if player else arena.player0):
+                strategy[vertex] = next(iter(arena.successors(vertex)))
+        return (frozenset(), arena.vertices) if player else (arena.vertices, frozenset())
+    # the opponent wins on its region of the subgame and on its attractor
+    opponent = regions[1 - player]
+    if player:
+        attractor = arena.attractor0(opponent, strategy)
+    else:
+        attractor = arena.attractor1(opponent, strategy)
+    regions = zielonka(arena.restrict(arena.vertices - attractor), coloring, strategy)
+    if player:
+        return regions[0] | attractor, regions[1]
+    return regions[0], regions[1] | attractor
+
+
+def _compress(coloring: Coloring, vertices: FrozenVertices) -> typing.Dict[Vertex, int]:
+    """ Maps the colors onto 0, 1, … preserving their order and parity. """
+    mapping: typing.Dict[int, int] = {}
+    current = None
+    for color in sorted({coloring[vertex] for vertex in vertices}):
+        if current is None:
+            current = color % 2
+        elif current % 2 != color % 2:
+            current += 1
+        mapping[color] = current
+    return {vertex: mapping[coloring[vertex]] for vertex in vertices}
+
+
+def _parys(arena: Arena,
+           coloring: Coloring,
+           maximum: int,
+           precision0: int,
+           precision1: int) -> FrozenVertices:
+    """
+    Returns an approximation of the winning region of the player favored by the
+    maximal color which contains all of its dominions of size at most its precision
+    and is disjoint from all opponent dominions of size at most their precision.
+    """
+    player = maximum % 2
+    precisions = [precision0, precision1]
+    if not arena.vertices or precisions[player] <= 0:
+        return frozenset()
+
+    def remove(arena: Arena, precision: int) -> typing.Tuple[Arena, FrozenVertices]:
+        if instrumentation.local.current is not None:
+            instrumentation.local.current.iteration('quasi-polynomial', arena.vertices)
+        # remove opponent dominions found below the attractor of the maximal color
+        top = {vertex for vertex in arena.vertices if coloring[vertex] == maximum}
+        attractor = arena.attractor1(top) if player else arena.attractor0(top)
+        precisions[1 - player] = precision
+        region = _parys(arena.restrict(arena.vertices - attractor), coloring,
+                        maximum - 1, *precisions)
+        if region:
+            attractor = arena.attractor0(region) if player else arena.attractor1(region)
+            arena = arena.restrict(arena.vertices - attractor)
+        return arena, region
+
+    precision = precisions[1 - player]
+    while True:
+        arena, region = remove(arena, precision // 2)
+        if not region:
+            break
+    arena, region = remove(arena, precision)
+    while region:
+        arena, region = remove(arena, precision // 2)
+    return arena.vertices
+
+
+def quasi_polynomial(arena: Arena,
+                     coloring: Coloring,
+                     strategy: typing.Optional[Choices] = None) -> Regions:
+    """
+    Computes the winning regions of both players with Parys' quasi-polynomial variant
+    of Zielonka's algorithm which bounds the size of the dominions searched for.
+
+    The intermediate regions are approximations from which no strategies can be
+    extracted, hence, strategies are not supported.
+    """
+    if strategy is not None:
+        raise UnsupportedOperation('Unable to record strategies with this solver.')
+    if not arena.vertices:
+        return frozenset(), frozenset()
+    coloring = _compress(coloring, arena.vertices)
+    maximum = max(coloring.values())
+    size = len(arena.vertices)
+    region = _parys(arena, coloring, maximum, size, size)
+    if maximum % 2:
+        return arena.vertices - region, region
+    return region, arena.vertices - region
+
+
+def _promote(arena: Arena,
+             coloring: Coloring,
+             strategy: Choices) -> typing.Tuple[int, FrozenVertices]:
+    """ Searches for a dominion by priority promotion and returns it with its owner. """
+    regions = {vertex: coloring[vertex] for vertex in arena.vertices}
+    priority = max(regions.values())
+    while True:
+        player = priority % 2
+        subarena = arena.restrict(
+            {vertex for vertex, region in regions.items() if region <= priority}
+        )
+        base = {vertex for vertex in subarena.vertices if regions[vertex] == priority}
+        if player:
+            region = subarena.attractor1(base, strategy)
+        else:
+            region = subarena.attractor0(base, strategy)
+        own = arena.player1 if player else arena.player0
+        opened = False
+        escapes = set()
+        for vertex in region:
+            if vertex in own:
+                opened |= not arena.successors(vertex) & region
+            elif subarena.successors(vertex) - region:
+                opened = True
+            else:
+                escapes.update(regions[successor]
+                               for successor in arena.successors(vertex) - region)
+            if opened:
+                break
+        if opened:
+            # the region is open within the subarena, descend to the next region
+            for vertex in region:
+                regions[vertex] = priority
+            priority = max(regions[vertex] for vertex in subarena.vertices - region)
+            continue
+        # the player stays within the closed region at vertices of its maximal color,
+        # promoted vertices keep the choices recorded for their previous region
+        for vertex in base & own:
+            if coloring[vertex] == priority:
+                strategy[vertex] = next(iter(arena.successors(vertex) & region))
+        if not escapes:
+            return player, frozenset(region)
+        else:
+            # promote the region to the best escape of the opponent and reset below
+            priority = min(escapes)
+            for vertex, color in regions.items():
+                if vertex in region:
+                    regions[vertex] = priority
+                elif color < priority:
+                    regions[vertex] = coloring[vertex]
+
+
+def priority_promotion(arena: Arena,
+                       coloring: Coloring,
+                       strategy: typing.Optional[Choices] = None) -> Regions:
+    """
+    Computes the winning regions of both players by priority promotion which
+    repeatedly searches for dominions, removes their attractors, and starts over.
+
+    If a strategy is given, the winning choices of both players are recorded in it.
+    """
+    if strategy is None:
+        strategy = {}
+    regions: typing.List[FrozenVertices] = [frozenset(), frozenset()]
+    statistics = instrumentation.local.current
+    while arena.vertices:
+        if statistics is not None:
+            statistics.iteration('priority-promotion', arena.vertices)
+        player, dominion = _promote(arena, coloring, strategy)
+        if player:
+            attractor = arena.attractor1(dominion, strategy)
+        else:
+            attractor = arena.attractor0(dominion, strategy)
+        regions[player] |= attractor
+        arena = arena.restrict(arena.vertices - attractor)
+    return regions[0], regions[1]
+
+
+# select the parity game solver to be used
+solver = zielonka
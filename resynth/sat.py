@@ -0,0 +1,499 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import heapq
+import typing
+
+from . import boolean
+
+
+# literals are given as non-zero integers, -v is the negation of variable v
+Literal = int
+Clause = typing.List[int]
+Model = typing.Dict[boolean.Variable, boolean.Constant]
+
+# values of internal literals
+TRUE = 1
+FALSE = -1
+UNASSIGNED = 0
+
+
+def _luby(index: int) -> int:
+    """ Returns the element of the Luby sequence 1, 1, 2, 1, 1, 2, 4, … at an index. """
+    size, exponent = 1, 0
+    while size < index + 1:
+        exponent += 1
+        size = 2 * size + 1
+    while size - 1 != index:
+        size = (size - 1) >> 1
+        exponent -= 1
+        index %= size
+    return 1 << exponent
+
+
+class Solver:
+    """
+    A conflict-driven clause-learning SAT solver.
+
+    Propagation uses two watched literals per clause. Decisions pick the unassigned
+    variable of highest VSIDS activity with its saved phase. Conflicts are analyzed
+    to the first unique implication point and the learned clauses are minimized.
+    The search restarts following the Luby sequence and learned clauses of high
+    literal block distance are deleted periodically.
+
+    Internally the literal of variable v is 2(v - 1) for the positive and 2(v - 1) + 1
+    for the negative literal, hence, the negation flips the lowest bit.
+    """
+
+    def __init__(self,
+                 restart_interval: int = 100,
+                 reduce_interval: int = 2000,
+                 decay: float = 0.95):
+        self.restart_interval = restart_interval
+        self.reduce_interval = reduce_interval
+        self.decay = decay
+        # values of the internal literals
+        self._values: typing.List[int] = []
+        self._levels: typing.List[int] = []
+        self._reasons: typing.List[typing.Optional[Clause]] = []
+        self._phases: typing.List[int] = []
+        self._activity: typing.List[float] = []
+        self._increment = 1.0
+        self._heap: typing.List[typing.Tuple[float, int]] = []
+        self._watches: typing.List[typing.List[Clause]] = []
+        self._clauses: typing.List[Clause] = []
+        self._learnts: typing.List[Clause] = []
+        # literal block distances of the learned clauses by their ids
+        self._glue: typing.Dict[int, int] = {}
+        self._trail: typing.List[int] = []
+        # positions in the trail where the decision levels start
+        self._limits: typing.List[int] = []
+        self._head = 0
+        # false if the clauses are unsatisfiable without any decisions
+        self._ok = True
+        self.model: typing.Optional[typing.List[bool]] = None
+        # the failed assumptions of the last unsatisfiable call to solve
+        self.core: typing.Optional[typing.List[Literal]] = None
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.restarts = 0
+
+    @property
+    def variables(self) -> int:
+        """ The number of variables. """
+        return len(self._levels)
+
+    def new_variable(self) -> int:
+        """ Creates a new variable and returns its positive literal. """
+        variable = len(self._levels)
+        self._values.extend((UNASSIGNED, UNASSIGNED))
+        self._levels.append(0)
+        self._reasons.append(None)
+        self._phases.append(1)
+        self._activity.append(0.0)
+        self._watches.extend(([], []))
+        heapq.heappush(self._heap, (0.0, variable))
+        return variable + 1
+
+    def _internal(self, literal: Literal) -> int:
+        variable = abs(literal) - 1
+        if literal == 0 or variable >= len(self._levels):
+            raise ValueError(f'Literal {literal} does not belong to a variable!')
+        return 2 * variable + (literal < 0)
+
+    @staticmethod
+    def _external(literal: int) -> Literal:
+        return -(literal >> 1) - 1 if literal & 1 else (literal >> 1) + 1
+
+    def add_clause(self, literals: typing.Iterable[Literal]) -> bool:
+        """
+        Adds a clause, returns false if the clauses became trivially unsatisfiable.
+        """
+        self._backtrack(0)
+        if not self._ok:
+            return False
+        values = self._values
+        clause: Clause = []
+        for literal in sorted({self._internal(literal) for literal in literals}):
+            if clause and clause[-1] == literal ^ 1 or values[literal] == TRUE:
+                # the clause is a tautology or already satisfied
+                return True
+            if values[literal] == UNASSIGNED:
+                clause.append(literal)
+        if not clause:
+            self._ok = False
+        elif len(clause) == 1:
+            self._assign(clause[0], None)
+            self._ok = self._propagate() is None
+        else:
+            self._attach(clause)
+            self._clauses.append(clause)
+        return self._ok
+
+    def _attach(self, clause: Clause):
+        self._watches[clause[0]].append(clause)
+        self._watches[clause[1]].append(clause)
+
+    def _assign(self, literal: int, reason: typing.Optional[Clause]):
+        variable = literal >> 1
+        self._values[literal] = TRUE
+        self._values[literal ^ 1] = FALSE
+        self._levels[variable] = len(self._limits)
+        self._reasons[variable] = reason
+        self._trail.append(literal)
+
+    def _propagate(self) -> typing.Optional[Clause]:
+        """ Propagates all pending assignments and returns a conflicting clause. """
+        values, watches, trail = self._values, self._watches, self._trail
+        while self._head < len(trail):
+            false = trail[self._head] ^ 1
+            self._head += 1
+            self.propagations += 1
+            watching = watches[false]
+            size = len(watching)
+            kept = position = 0
+            while position < size:
+                clause = watching[position]
+                position += 1
+                # the false literal is moved to the second position
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], false
+                first = clause[0]
+                if values[first] == TRUE:
+                    watching[kept] = clause
+                    kept += 1
+                    continue
+                for index in range(2, len(clause)):
+                    other = clause[index]
+                    if values[other] != FALSE:
+                        clause[1], clause[index] = other, false
+                        watches[other].append(clause)
+                        break
+                else:
+                    watching[kept] = clause
+                    kept += 1
+                    if values[first] == FALSE:
+                        while position < size:
+                            watching[kept] = watching[position]
+                            kept += 1
+                            position += 1
+                        del watching[kept:]
+                        self._head = len(trail)
+                        return clause
+                    self._assign(first, clause)
+            del watching[kept:]
+        return None
+
+    def _bump(self, variable: int):
+        activity = self._activity[variable] + self._increment
+        self._activity[variable] = activity
+        if activity > 1e100:
+            # rescale all activities to avoid overflows
+            self._activity = [value * 1e-100 for value in self._activity]
+            self._increment *= 1e-100
+            self._rebuild()
+        elif self._values[2 * variable] == UNASSIGNED:
+            heapq.heappush(self._heap, (-activity, variable))
+
+    def _rebuild(self):
+        """ Rebuilds the decision heap dropping outdated entries. """
+        values = self._values
+        self._heap = [(-activity, variable)
+                      for variable, activity in enumerate(self._activity)
+                      if values[2 * variable] == UNASSIGNED]
+        heapq.heapify(self._heap)
+
+    def _analyze(self, conflict: Clause) -> typing.Tuple[Clause, int]:
+        """ Derives the first UIP clause and the level to backjump to. """
+        levels, reasons, trail = self._levels, self._reasons, self._trail
+        level = len(self._limits)
+        seen = set()
+        learnt = [0]
+        pending = 0
+        index = len(trail) - 1
+        clause = conflict
+        literal = None
+        while True:
+            for other in clause if literal is None else clause[1:]:
+                variable = other >> 1
+                if variable not in seen and levels[variable] > 0:
+                    seen.add(variable)
+                    self._bump(variable)
+                    if levels[variable] == level:
+                        pending += 1
+                    else:
+                        learnt.append(other)
+            while trail[index] >> 1 not in seen:
+                index -= 1
+            literal = trail[index]
+            index -= 1
+            pending -= 1
+            if not pending:
+                break
+            clause = reasons[literal >> 1]
+        learnt[0] = literal ^ 1
+        # remove literals implied by the other literals of the clause
+        minimized = [learnt[0]]
+        for other in learnt[1:]:
+            reason = reasons[other >> 1]
+            if reason is None or any(implied >> 1 not in seen and levels[implied >> 1]
+                                     for implied in reason[1:]):
+                minimized.append(other)
+        if len(minimized) == 1:
+            return minimized, 0
+        # the literal of the highest level is watched with the asserted literal
+        highest = max(range(1, len(minimized)), key=lambda at: levels[minimized[at] >> 1])
+        minimized[1], minimized[highest] = minimized[highest], minimized[1]
+        return minimized, levels[minimized[1] >> 1]
+
+    def _backtrack(self, level: int):
+        if len(self._limits) <= level:
+            return
+        values, phases, activity = self._values, self._phases, self._activity
+        limit = self._limits[level]
+        for literal in self._trail[limit:]:
+            variable = literal >> 1
+            values[literal] = values[literal ^ 1] = UNASSIGNED
+            phases[variable] = literal & 1
+            heapq.heappush(self._heap, (-activity[variable], variable))
+        del self._trail[limit:]
+        del self._limits[level:]
+        self._head = limit
+        # the heap is searched lazily and accumulates outdated entries
+        if len(self._heap) > 4 * len(activity) + 1024:
+            self._rebuild()
+
+    def _decide(self) -> typing.Optional[int]:
+        """ Returns the literal of the next decision or none if all are assigned. """
+        values, heap = self._values, self._heap
+        while heap:
+            _, variable = heapq.heappop(heap)
+            if values[2 * variable] == UNASSIGNED:
+                return 2 * variable + self._phases[variable]
+        return None
+
+    def _reduce(self):
+        """ Deletes half of the learned clauses preferring those of high glue. """
+        reasons = self._reasons
+        glue = self._glue
+        self._learnts.sort(key=lambda clause: glue[id(clause)])
+        keep = len(self._learnts) // 2
+        learnts = []
+        for position, clause in enumerate(self._learnts):
+            locked = reasons[clause[0] >> 1] is clause
+            if position < keep or glue[id(clause)] <= 2 or locked:
+                learnts.append(clause)
+            else:
+                del glue[id(clause)]
+        self._learnts = learnts
+        for watching in self._watches:
+            watching.clear()
+        for clause in self._clauses:
+            self._attach(clause)
+        for clause in learnts:
+            self._attach(clause)
+
+    def _failed(self, literal: int) -> typing.List[int]:
+        """ Returns the assumptions which imply the negation of the given assumption. """
+        levels, reasons = self._levels, self._reasons
+        core = [literal]
+        if not levels[literal >> 1]:
+            return core
+        seen = {literal >> 1}
+        for assigned in reversed(self._trail[self._limits[0]:]):
+            variable = assigned >> 1
+            if variable not in seen:
+                continue
+            reason = reasons[variable]
+            if reason is None:
+                core.append(assigned)
+            else:
+                seen.update(other >> 1 for other in reason[1:] if levels[other >> 1])
+        return core
+
+    def _search(self,
+                budget: int,
+                assumptions: typing.List[int]) -> typing.Optional[bool]:
+        """ Searches until a result is found or the conflict budget is exhausted. """
+        levels, values = self._levels, self._values
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self._limits:
+                    self._ok = False
+                    return False
+                learnt, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self._attach(learnt)
+                    self._learnts.append(learnt)
+                    self._glue[id(learnt)] = len({levels[other >> 1] for other in learnt})
+                    self._assign(learnt[0], learnt)
+                self._increment /= self.decay
+                budget -= 1
+                continue
+            if budget <= 0:
+                return None
+            if self.conflicts >= self._next_reduce:
+                self._next_reduce += self.reduce_interval
+                self._reduce()
+            if len(self._limits) < len(assumptions):
+                # the assumptions are the decisions of the first levels
+                literal = assumptions[len(self._limits)]
+                if values[literal] == FALSE:
+                    failed = self._failed(literal)
+                    self.core = [self._external(other) for other in failed]
+                    return False
+                if values[literal] == TRUE:
+                    # an empty level keeps the levels and the assumptions aligned
+                    self._limits.append(len(self._trail))
+                    continue
+            else:
+                literal = self._decide()
+                if literal is None:
+                    self.model = [values[2 * variable] == TRUE
+                                  for variable in range(len(levels))]
+                    return True
+                self.decisions += 1
+            self._limits.append(len(self._trail))
+            self._assign(literal, None)
+
+    def solve(self, assumptions: typing.Iterable[Literal] = ()) -> bool:
+        """
+        Checks whether the clauses are satisfiable under the given assumptions.
+
+        If so, a model is stored. Otherwise, a subset of the assumptions which is
+        unsatisfiable together with the clauses is stored as the core, it is empty if
+        the clauses are unsatisfiable on their own. Learned clauses are kept such that
+        subsequent calls with further clauses or other assumptions profit from them.
+        """
+        self.model = None
+        self.core = None
+        assumptions = [self._internal(literal) for literal in assumptions]
+        if not self._ok:
+            self.core = []
+            return False
+        self._next_reduce = self.conflicts + self.reduce_interval
+        restarts = 0
+        while True:
+            result = self._search(_luby(restarts) * self.restart_interval, assumptions)
+            if result is not None:
+                break
+            restarts += 1
+            self.restarts += 1
+            self._backtrack(0)
+        self._backtrack(0)
+        if not self._ok:
+            self.core = []
+        return result
+
+    def value(self, literal: Literal) -> bool:
+        """ Returns the value of the literal in the model of the last call to solve. """
+        if self.model is None:
+            raise ValueError('There is no model, the clauses are unsatisfiable!')
+        return self.model[abs(literal) - 1] == (literal > 0)
+
+
+class Tseitin:
+    """
+    Encodes formulas into equisatisfiable clauses of a solver.
+
+    Every subformula is represented by a literal which is constrained to be
+    equivalent to it. Shared subformulas are encoded only once, hence, the number of
+    clauses is linear in the size of the formula. Negations do not need a variable.
+    """
+
+    def __init__(self, solver: typing.Optional[Solver] = None):
+        self.solver = solver or Solver()
+        self.literals: typing.Dict[boolean.Formula, Literal] = {}
+        # the failed assumptions of the last unsatisfiable call to solve
+        self.core: typing.Optional[typing.List[boolean.Formula]] = None
+
+    def encode(self, formula: boolean.Formula) -> Literal:
+        """ Returns the literal which is equivalent to the formula. """
+        literals = self.literals
+        for subformula in formula.subformulas():
+            if subformula not in literals:
+                literals[subformula] = self._encode(subformula)
+        return literals[formula]
+
+    def _encode(self, formula: boolean.Formula) -> Literal:
+        solver, literals = self.solver, self.literals
+        if isinstance(formula, boolean.Constant):
+            literal = solver.new_variable()
+            solver.add_clause([literal])
+            return literal if formula is formula.manager.verum else -literal
+        if isinstance(formula, boolean.Variable):
+            return solver.new_variable()
+        operands = [literals[operand] for operand in formula.operands]
+        if isinstance(formula, boolean.Not):
+            return -operands[0]
+        gate = solver.new_variable()
+        if isinstance(formula, boolean.ITE):
+            condition, consequence, alternative = operands
+            clauses = [[-gate, -condition, consequence],
+                       [-gate, condition, alternative],
+                       [gate, -condition, -consequence],
+                       [gate, condition, -alternative],
+                       # redundant clauses improving propagation
+                       [-gate, consequence, alternative],
+                       [gate, -consequence, -alternative]]
+        else:
+            left, right = operands
+            if isinstance(formula, boolean.Implication):
+                # an implication is the disjunction of the negated premise
+                left = -left
+            if isinstance(formula, boolean.And):
+                clauses = [[-gate, left], [-gate, right], [gate, -left, -right]]
+            elif isinstance(formula, (boolean.Or, boolean.Implication)):
+                clauses = [[gate, -left], [gate, -right], [-gate, left, right]]
+            else:
+                if isinstance(formula, boolean.Equivalence):
+                    right = -right
+                clauses = [[-gate, left, right], [-gate, -left, -right],
+                           [gate, -left, right], [gate, left, -right]]
+        for clause in clauses:
+            solver.add_clause(clause)
+        return gate
+
+    def add(self, formula: boolean.Formula) -> bool:
+        """ Asserts the formula, returns false if it became trivially unsatisfiable. """
+        return self.solver.add_clause([self.encode(formula)])
+
+    def solve(self, assumptions: typing.Iterable[boolean.Formula] = ()) -> bool:
+        """
+        Checks whether the asserted formulas are satisfiable under the assumptions.
+
+        If not, the assumptions in the core of the solver are stored as the core.
+        """
+        assumptions = list(assumptions)
+        literals = [self.encode(assumption) for assumption in assumptions]
+        self.core = None
+        if self.solver.solve(literals):
+            return True
+        failed = set(self.solver.core)
+        self.core = [assumption for assumption, literal in zip(assumptions, literals)
+                     if literal in failed]
+        return False
+
+    def model(self) -> Model:
+        """ Returns the model of the last call to solve for the encoded variables. """
+        return {
+            formula: (formula.manager.verum if self.solver.value(literal)
+                      else formula.manager.falsum)
+            for formula, literal in self.literals.items()
+            if isinstance(formula, boolean.Variable)
+        }
+
+
+def satisfiable(formula: boolean.Formula) -> typing.Optional[Model]:
+    """ Returns a model of the formula for its variables or none if unsatisfiable. """
+    encoder = Tseitin()
+    if encoder.add(formula) and encoder.solver.solve():
+        return encoder.model()
+    return None
@@ -0,0 +1,96 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import array
+import typing
+
+from .arena import Vertex, Vertices, FrozenVertices, Arena
+
+
+# marks vertices without a chosen successor
+UNDEFINED = -1
+
+
+class Strategy(typing.MutableMapping[Vertex, Vertex]):
+    """
+    A positional strategy σ: V ⇀ V mapping vertices to their chosen successors.
+
+    The choices are stored compactly as successor ids in an array indexed by the
+    vertex ids of the arena.
+    """
+
+    def __init__(self, arena: Arena):
+        self.arena = arena
+        self._choices = array.array('q')
+        self._size = 0
+
+    def __repr__(self):
+        return f'Strategy({dict(self)!r})'
+
+    def __getitem__(self, vertex: Vertex) -> Vertex:
+        index = self.arena.index(vertex)
+        if index >= len(self._choices) or self._choices[index] == UNDEFINED:
+            raise KeyError(vertex)
+        return self.arena.vertex(self._choices[index])
+
+    def __setitem__(self, vertex: Vertex, successor: Vertex):
+        index = self.arena.index(vertex)
+        if index >= len(self._choices):
+            missing = max(index + 1, 2 * len(self._choices)) - len(self._choices)
+            self._choices.extend(array.array('q', [UNDEFINED]) * missing)
+        if self._choices[index] == UNDEFINED:
+            self._size += 1
+        self._choices[index] = self.arena.index(successor)
+
+    def __delitem__(self, vertex: Vertex):
+        index = self.arena.index(vertex)
+        if index >= len(self._choices) or self._choices[index] == UNDEFINED:
+            raise KeyError(vertex)
+        self._choices[index] = UNDEFINED
+        self._size -= 1
+
+    def __iter__(self) -> typing.Iterator[Vertex]:
+        for index, choice in enumerate(self._choices):
+            if choice != UNDEFINED:
+                yield self.arena.vertex(index)
+
+    def __len__(self):
+        return self._size
+
+    def restrict(self, vertices: Vertices) -> 'Strategy':
+        """ Returns a copy of the strategy restricted to the given vertices. """
+        strategy = Strategy(self.arena)
+        for vertex in vertices:
+            if vertex in self:
+                strategy[vertex] = self[vertex]
+        return strategy
+
+
+class Solution(typing.NamedTuple):
+    """ The winning regions of both players together with winning strategies. """
+
+    region0: FrozenVertices
+    region1: FrozenVertices
+    strategy0: Strategy
+    strategy1: Strategy
+
+
+def solution(arena: Arena,
+             region0: Vertices,
+             region1: Vertices,
+             strategy: Strategy) -> Solution:
+    """
+    Builds a solution from a strategy recording the choices of both players, only
+    the choices of the respective player on its winning region are retained.
+    """
+    return Solution(frozenset(region0), frozenset(region1),
+                    strategy.restrict(region0 & arena.player0),
+                    strategy.restrict(region1 & arena.player1))
+
+
+def trap(arena: Arena, region: Vertices, own: Vertices, strategy: Strategy):
+    """ Records choices keeping the player's vertices within the given trap. """
+    for vertex in region:
+        if vertex in own:
+            strategy[vertex] = next(iter(arena.successors(vertex) & region))
@@ -0,0 +1,236 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import typing
+
+from . import boolean, instrumentation
+from .arena import (
+    Vertex, Vertices, FrozenVertices, Choices, Arena, InvalidArena, UnsupportedOperation,
+    buchi_fixpoint
+)
+from .bdd import BDD, Function
+
+
+Variables = typing.Sequence[boolean.Variable]
+
+
+def _encode(bdd: BDD, index: int, variables: Variables) -> Function:
+    """ Returns the assignment of the variables to the binary digits of the index. """
+    result = bdd.true
+    for bit, variable in enumerate(variables):
+        literal = bdd.variable(variable)
+        result &= literal if index >> bit & 1 else ~literal
+    return result
+
+
+class SymbolicArena:
+    """
+    An arena whose vertices are the assignments of the current-state variables.
+
+    The vertices V, the vertices V₀ of Player 0, and the edges E are represented by
+    BDDs, the edges over the current-state and the next-state variables. Sets of
+    vertices are functions over the current-state variables and support the set
+    operations used by the winning conditions, hence, conditions solve symbolic
+    arenas through the same interface as explicit ones.
+    """
+
+    def __init__(self,
+                 bdd: BDD,
+                 current: Variables,
+                 following: Variables,
+                 vertices: Function,
+                 player0: Function,
+                 edges: Function):
+        if len(current) != len(following):
+            raise InvalidArena('Current-state and next-state variables do not match!')
+        self.bdd = bdd
+        self.current: typing.Tuple[boolean.Variable, ...] = tuple(current)
+        self.following: typing.Tuple[boolean.Variable, ...] = tuple(following)
+        self._vertices = vertices
+        self._player0 = player0
+        self._player1: typing.Optional[Function] = None
+        self._edges = edges
+        # the explicit vertices of the encoded arena, see `from_arena`
+        self._names: typing.Optional[typing.List[Vertex]] = None
+        # verify that the arena is valid
+        self._verify()
+
+    @classmethod
+    def from_arena(cls,
+                   arena: Arena,
+                   bdd: typing.Optional[BDD] = None) -> 'SymbolicArena':
+        """
+        Encodes the given arena by binary vertex ids.
+
+        The current-state and next-state variables are created interleaved which is
+        usually a good order for the edge relation.
+        """
+        if bdd is None:
+            bdd = BDD(boolean.Manager())
+        names = list(arena.vertices)
+        current, following = [], []
+        for _ in range(max(len(names) - 1, 1).bit_length()):
+            current.append(bdd.manager.variable())
+            following.append(bdd.manager.variable())
+        ids = {vertex: index for index, vertex in enumerate(names)}
+        vertices, player0, edges = bdd.false, bdd.false, bdd.false
+        for vertex, index in ids.items():
+            vertices |= _encode(bdd, index, current)
+            if vertex in arena.player0:
+                player0 |= _encode(bdd, index, current)
+        for source, target in arena.edges:
+            edges |= (_encode(bdd, ids[source], current) &
+                      _encode(bdd, ids[target], following))
+        symbolic = cls(bdd, current, following, vertices, player0, edges)
+        symbolic._names = names
+        return symbolic
+
+    def _verify(self):
+        """ Verifies that the arena is valid. """
+        if not self._player0 <= self._vertices:
+            raise InvalidArena('Player 0 vertices are not a subset of the vertices!')
+        if not self._edges <= self._vertices & self.shift(self._vertices):
+            raise InvalidArena('Edges leave the vertices!')
+        if not self._vertices <= self._edges.exists(self.following):
+            raise InvalidArena('Some vertices have no successors!')
+
+    @property
+    def vertices(self) -> Function:
+        """ The vertices V of the arena. """
+        return self._vertices
+
+    @property
+    def player0(self) -> Function:
+        """ The vertices V₀ of Player 0. """
+        return self._player0
+
+    @property
+    def player1(self) -> Function:
+        """ The vertices V₁ = V \\ V₀ of Player 1. """
+        if self._player1 is None:
+            self._player1 = self._vertices - self._player0
+        return self._player1
+
+    @property
+    def edges(self) -> Function:
+        """ The edges of the arena over the current-state and next-state variables. """
+        return self._edges
+
+    def shift(self, vertices: Function) -> Function:
+        """ Renames the current-state variables to the next-state variables. """
+        for variable, successor in zip(self.current, self.following):
+            vertices = vertices.compose(variable, self.bdd.variable(successor))
+        return vertices
+
+    def unshift(self, vertices: Function) -> Function:
+        """ Renames the next-state variables to the current-state variables. """
+        for variable, successor in zip(self.current, self.following):
+            vertices = vertices.compose(successor, self.bdd.variable(variable))
+        return vertices
+
+    def encode(self, vertices: Vertices) -> Function:
+        """ Returns the symbolic set of the given vertices of the encoded arena. """
+        if self._names is None:
+            raise ValueError('The arena has not been encoded from an explicit arena!')
+        result = self.bdd.false
+        for index, vertex in enumerate(self._names):
+            if vertex in vertices:
+                result |= _encode(self.bdd, index, self.current)
+        return result & self._vertices
+
+    def decode(self, vertices: Function) -> FrozenVertices:
+        """ Returns the explicit vertices of the given symbolic set. """
+        if self._names is None:
+            raise ValueError('The arena has not been encoded from an explicit arena!')
+        return frozenset(
+            vertex for index, vertex in enumerate(self._names)
+            if vertices.evaluate({variable: bool(index >> bit & 1)
+                                  for bit, variable in enumerate(self.current)})
+        )
+
+    def successors(self, vertices: Function) -> Function:
+        """ Returns the successors of the given vertices. """
+        return self.unshift(self._edges.and_exists(vertices, self.current))
+
+    def predecessors(self, vertices: Function) -> Function:
+        """ Returns the predecessors of the given vertices. """
+        return self._edges.and_exists(self.shift(vertices), self.following)
+
+    def dual(self) -> 'SymbolicArena':
+        """ Returns the dual of the arena. """
+        dual = SymbolicArena(self.bdd, self.current, self.following,
+                             self._vertices, self.player1, self._edges)
+        dual._names = self._names
+        return dual
+
+    def restrict(self, vertices: Function) -> 'SymbolicArena':
+        """
+        Returns the arena restricted to the given vertices.
+
+        Every vertex must have a successor within the vertices, e.g., because they
+        are a trap.
+        """
+        vertices = vertices & self._vertices
+        edges = self._edges & vertices & self.shift(vertices)
+        subarena = SymbolicArena(self.bdd, self.current, self.following,
+                                 vertices, self._player0 & vertices, edges)
+        subarena._names = self._names
+        return subarena
+
+    def _controlled_predecessors(self, vertices: Function, own: Function) -> Function:
+        statistics = instrumentation.local.current
+        if statistics is not None:
+            statistics.controlled_predecessors += 1
+            # both quantifications are preimages under the edge relation
+            statistics.predecessor_lookups += 2
+        # the owner needs some edge into the vertices, the opponent must not escape
+        target = self.shift(vertices)
+        some = self._edges.and_exists(target, self.following)
+        every = (self._edges >> target).forall(self.following)
+        return (own & some) | ((self._vertices - own) & every)
+
+    def _attractor(self,
+                   vertices: Function,
+                   own: Function,
+                   strategy: typing.Optional[Choices]) -> Function:
+        if strategy is not None:
+            raise UnsupportedOperation('Unable to record strategies on symbolic arenas.')
+        statistics = instrumentation.local.current
+        if statistics is not None:
+            statistics.attractors += 1
+        attractor = vertices & self._vertices
+        while True:
+            if statistics is not None:
+                statistics.iteration('attractor', attractor)
+            extended = attractor | self._controlled_predecessors(attractor, own)
+            if extended == attractor:
+                return attractor
+            attractor = extended
+
+    def attractor0(self,
+                   vertices: Function,
+                   strategy: typing.Optional[Choices] = None) -> Function:
+        """ Returns the Player 0 attractor of the given vertices. """
+        return self._attractor(vertices, self._player0, strategy)
+
+    def attractor1(self,
+                   vertices: Function,
+                   strategy: typing.Optional[Choices] = None) -> Function:
+        """ Returns the Player 1 attractor of the given vertices. """
+        return self._attractor(vertices, self.player1, strategy)
+
+    def controlled_predecessors0(self, vertices: Function) -> Function:
+        """ Returns the Player 0 controlled predecessors of the given vertices. """
+        return self._controlled_predecessors(vertices, self._player0)
+
+    def controlled_predecessors1(self, vertices: Function) -> Function:
+        """ Returns the Player 1 controlled predecessors of the given vertices. """
+        return self._controlled_predecessors(vertices, self.player1)
+
+    def buchi(self, accepting: Function, player: int) -> Function:
+        """
+        Returns the winning region of the opponent of the given player who wants to
+        visit the accepting vertices infinitely often.
+        """
+        return buchi_fixpoint(self, accepting, player)
@@ -0,0 +1,89 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+"""
+Brute-force reference implementations for small arenas.
+
+One-player games are given as successor dictionaries where all choices are made by
+the controlling player. Two-player parity games are solved by enumerating all
+positional strategies of Player 0 which suffices as parity games are positionally
+determined.
+"""
+
+import itertools
+
+
+def fix(arena, strategy, player):
+    """
+    Returns the one-player game where the vertices of the player follow the strategy,
+    the player keeps all choices at vertices the strategy is undefined for.
+    """
+    own = arena.player1 if player else arena.player0
+    return {vertex: frozenset([strategy[vertex]])
+            if vertex in own and vertex in strategy
+            else frozenset(arena.successors(vertex))
+            for vertex in arena.vertices}
+
+
+def strategies(arena, player):
+    """ Yields all positional strategies of the player. """
+    own = sorted(arena.player1 if player else arena.player0)
+    choices = [sorted(arena.successors(vertex)) for vertex in own]
+    for chosen in itertools.product(*choices):
+        yield dict(zip(own, chosen))
+
+
+def reachable(graph, sources, within=None):
+    """ Returns the vertices reachable from the sources staying within the vertices. """
+    result = {vertex for vertex in sources if within is None or vertex in within}
+    pending = list(result)
+    while pending:
+        for successor in graph[pending.pop()]:
+            if successor not in result and (within is None or successor in within):
+                result.add(successor)
+                pending.append(successor)
+    return result
+
+
+def reach(graph, targets):
+    """ Returns the vertices from which the controller can reach the targets. """
+    predecessors = {vertex: set() for vertex in graph}
+    for vertex, successors in graph.items():
+        for successor in successors:
+            predecessors[successor].add(vertex)
+    return reachable(predecessors, targets)
+
+
+def avoid(graph, bad):
+    """ Returns the vertices from which the controller can avoid the bad ones forever. """
+    safe = {vertex: graph[vertex] - bad for vertex in graph if vertex not in bad}
+    cycles = {vertex for vertex in safe if vertex in reachable(safe, safe[vertex])}
+    return reach(safe, cycles)
+
+
+def parity(graph, coloring, player):
+    """
+    Returns the vertices from which the controller of the one-player game can visit
+    a maximal color of the player's parity infinitely often.
+    """
+    good = set()
+    for color in set(coloring.values()):
+        if color % 2 != player:
+            continue
+        below = {vertex for vertex in graph if coloring[vertex] <= color}
+        for vertex in below:
+            if coloring[vertex] != color:
+                continue
+            # the vertex lies on a cycle within the vertices of lower colors
+            if vertex in reachable(graph, graph[vertex], below):
+                good.add(vertex)
+    return reach(graph, good)
+
+
+def parity_regions(arena, coloring):
+    """ Solves the parity game by enumerating the positional strategies of Player 0. """
+    region0 = set()
+    for strategy in strategies(arena, 0):
+        region0 |= set(arena.vertices) - parity(fix(arena, strategy, 0), coloring, 1)
+    return frozenset(region0), frozenset(arena.vertices) - region0
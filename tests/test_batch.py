@@ -0,0 +1,49 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import random
+
+import pytest
+
+from resynth import batch
+from resynth.benchmark import random_arena, random_coloring
+from resynth.compact import CompactArena
+from resynth.condition import (IncompatibleArena, Parity, Persistence, Reachability,
+                               Recurrence, Safety)
+
+
+def conditions(arena, seed):
+    generator = random.Random(seed)
+    for _ in range(3):
+        vertices = frozenset(vertex for vertex in arena.vertices
+                             if generator.random() < 0.2)
+        yield Reachability(vertices)
+        yield Safety(arena.vertices - vertices)
+        yield Recurrence(vertices)
+        yield Persistence(arena.vertices - vertices)
+    yield Parity(random_coloring(arena, 4, seed))
+
+
+def test_against_individual_conditions():
+    for seed in range(10):
+        arena = random_arena(40, 3, seed)
+        for solved in (arena, CompactArena.from_arena(arena)):
+            given = list(conditions(arena, seed))
+            results = batch.solve(solved, given)
+            assert len(results) == len(given)
+            for condition, (region0, region1) in zip(given, results):
+                assert region0 == condition.winning_region0(arena)
+                assert region1 == arena.vertices - region0
+
+
+def test_empty_batch():
+    assert batch.solve(random_arena(10, 2, 0), []) == []
+
+
+def test_incompatible_conditions():
+    arena = random_arena(10, 2, 0)
+    for condition in (Reachability({'missing'}), Safety({'missing'}),
+                      Recurrence({'missing'}), Parity({})):
+        with pytest.raises(IncompatibleArena):
+            batch.solve(arena, [Reachability(arena.vertices), condition])
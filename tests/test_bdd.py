@@ -0,0 +1,149 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import itertools
+import random
+
+from resynth import boolean
+from resynth.bdd import BDD, sifting, window
+
+
+def random_formula(manager, variables, size, generator):
+    formulas = list(variables)
+    for _ in range(size):
+        kind = generator.choice((boolean.Not, boolean.And, boolean.Or, boolean.Xor,
+                                 boolean.Implication, boolean.Equivalence, boolean.ITE))
+        if kind is boolean.Not:
+            operands = (generator.choice(formulas),)
+        elif kind is boolean.ITE:
+            operands = tuple(generator.choice(formulas) for _ in range(3))
+        else:
+            operands = tuple(generator.choice(formulas) for _ in range(2))
+        formulas.append(kind(manager, *operands))
+    return formulas[-1]
+
+
+def assignments(variables):
+    for values in itertools.product((False, True), repeat=len(variables)):
+        yield dict(zip(variables, values))
+
+
+def truth(formula, assignment):
+    manager = formula.manager
+    constants = {variable: manager.verum if value else manager.falsum
+                 for variable, value in assignment.items()}
+    return formula.evaluate(constants) is manager.verum
+
+
+def test_formulas_against_truth_tables():
+    generator = random.Random(0)
+    for _ in range(50):
+        manager = boolean.Manager()
+        variables = [manager.variable() for _ in range(5)]
+        formula = random_formula(manager, variables, 20, generator)
+        bdd = BDD(manager)
+        function = bdd.build(formula)
+        for assignment in assignments(variables):
+            assert function.evaluate(assignment) == truth(formula, assignment)
+
+
+def test_canonicity():
+    manager = boolean.Manager()
+    x, y, z = manager.variable(), manager.variable(), manager.variable()
+    bdd = BDD(manager)
+    assert bdd.build(x & (y | z)) == bdd.build((x & y) | (x & z))
+    assert bdd.build(x ^ y) == bdd.build(~x.equivalent(y))
+    assert bdd.build(x | ~x).is_true
+    assert bdd.build(x & ~x).is_false
+    assert bdd.build(x >> y) == ~bdd.variable(x) | bdd.variable(y)
+
+
+def test_quantification():
+    manager = boolean.Manager()
+    x, y, z = manager.variable(), manager.variable(), manager.variable()
+    bdd = BDD(manager)
+    function = bdd.build((x & y) | (~x & z))
+    assert function.exists([x]) == bdd.build(y | z)
+    assert function.forall([x]) == bdd.build(y & z)
+    other = bdd.build(y.equivalent(z))
+    assert function.and_exists(other, [y, z]) == (function & other).exists([y, z])
+    assert function.compose(x, bdd.true) == bdd.variable(y)
+
+
+def test_garbage_collection():
+    manager = boolean.Manager()
+    variables = [manager.variable() for _ in range(8)]
+    bdd = BDD(manager, threshold=16)
+    kept = bdd.false
+    for left, right in zip(variables, variables[1:]):
+        kept |= bdd.variable(left) & bdd.variable(right)
+    reference = {tuple(assignment.values()): kept.evaluate(assignment)
+                 for assignment in assignments(variables)}
+    generator = random.Random(1)
+    for _ in range(20):
+        bdd.build(random_formula(manager, variables, 10, generator))
+    bdd.collect()
+    assert bdd.collections > 1
+    for assignment in assignments(variables):
+        assert kept.evaluate(assignment) == reference[tuple(assignment.values())]
+    del kept
+    bdd.collect()
+    assert len(bdd) == 0
+
+
+def pairs(manager, count):
+    """ Returns ⋁ xᵢ ∧ yᵢ with all x before all y which is a bad order. """
+    xs = [manager.variable() for _ in range(count)]
+    ys = [manager.variable() for _ in range(count)]
+    formula = manager.falsum
+    for x, y in zip(xs, ys):
+        formula = formula | (x & y)
+    return formula, xs + ys
+
+
+def test_reordering_preserves_functions():
+    generator = random.Random(2)
+    for method in (sifting, window):
+        manager = boolean.Manager()
+        variables = [manager.variable() for _ in range(6)]
+        bdd = BDD(manager)
+        formulas = [random_formula(manager, variables, 15, generator)
+                    for _ in range(5)]
+        functions = [bdd.build(formula) for formula in formulas]
+        bdd.reorder(method)
+        assert sorted(manager.ordering.values()) == list(range(6))
+        for formula, function in zip(formulas, functions):
+            for assignment in assignments(variables):
+                assert function.evaluate(assignment) == truth(formula, assignment)
+            # rebuilding under the new order yields the same nodes
+            assert bdd.build(formula) == function
+
+
+def test_sifting_shrinks_bad_order():
+    manager = boolean.Manager()
+    formula, variables = pairs(manager, 6)
+    bdd = BDD(manager)
+    function = bdd.build(formula)
+    statistics = bdd.reorder(sifting)
+    assert statistics.after < statistics.before
+    assert len(bdd) <= 2 * 6
+    for assignment in assignments(variables):
+        assert function.evaluate(assignment) == truth(formula, assignment)
+
+
+def test_dynamic_reordering_fires():
+    manager = boolean.Manager()
+    formula, variables = pairs(manager, 16)
+    bdd = BDD(manager, reordering=sifting, reordering_threshold=128)
+    function = bdd.false
+    for x, y in zip(variables[:16], variables[16:]):
+        function |= bdd.variable(x) & bdd.variable(y)
+    bdd.collect()
+    assert bdd.reorderings
+    assert len(bdd) <= 3 * 16
+    generator = random.Random(3)
+    for _ in range(200):
+        assignment = {variable: generator.random() < 0.5 for variable in variables}
+        assert function.evaluate(assignment) == truth(formula, assignment)
+
@@ -0,0 +1,109 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import random
+
+from resynth.benchmark import random_arena
+from resynth.bitset import BitSet, BitsetArena, Universe
+from resynth.condition import Persistence, Recurrence
+
+
+def samples(universe, generator, count=30):
+    for _ in range(count):
+        yield frozenset(vertex for vertex in universe.names
+                        if generator.random() < 0.4)
+
+
+def test_set_algebra_matches_frozenset():
+    generator = random.Random(0)
+    universe = Universe(range(70))
+    sets = list(samples(universe, generator))
+    for left, right in zip(sets, sets[1:]):
+        bits_left = BitSet(universe, universe.encode(left))
+        bits_right = BitSet(universe, universe.encode(right))
+        assert bits_left == left and set(bits_left) == left
+        assert len(bits_left) == len(left) and bool(bits_left) == bool(left)
+        assert bits_left & bits_right == left & right
+        assert bits_left | bits_right == left | right
+        assert bits_left - bits_right == left - right
+        assert bits_left ^ bits_right == left ^ right
+        assert (bits_left <= bits_right) == (left <= right)
+        assert (bits_left >= bits_right) == (left >= right)
+        assert (bits_left < bits_left | bits_right) == (left < left | right)
+        assert bits_left.isdisjoint(bits_right) == left.isdisjoint(right)
+        assert hash(bits_left) == hash(left)
+        for vertex in range(-1, 71):
+            assert (vertex in bits_left) == (vertex in left)
+
+
+def test_mixed_operands():
+    generator = random.Random(1)
+    universe = Universe(range(40))
+    sets = list(samples(universe, generator))
+    for left, right in zip(sets, sets[1:]):
+        bits = BitSet(universe, universe.encode(left))
+        # frozensets within the universe keep the result a bitset
+        for result, expected in ((bits & right, left & right),
+                                 (right & bits, right & left),
+                                 (bits | right, left | right),
+                                 (right | bits, right | left),
+                                 (bits - right, left - right),
+                                 (right - bits, right - left),
+                                 (bits ^ right, left ^ right)):
+            assert isinstance(result, BitSet)
+            assert result == expected
+        # vertices outside of the universe fall back to frozensets
+        outside = right | {'outside'}
+        assert bits & outside == left & outside
+        assert isinstance(bits & outside, BitSet)
+        assert bits - outside == left - outside
+        union = bits | outside
+        assert union == left | outside and not isinstance(union, BitSet)
+        assert outside - bits == outside - left
+        assert (bits <= outside) == (left <= outside)
+        assert (bits >= outside) is False
+
+
+def test_restrict():
+    generator = random.Random(2)
+    for seed in range(10):
+        arena = random_arena(50, 3, seed)
+        bitset = BitsetArena.from_arena(arena)
+        escape = {vertex for vertex in arena.vertices if generator.random() < 0.2}
+        trap = arena.vertices - arena.attractor1(escape)
+        view = bitset.restrict(trap)
+        subarena = arena.restrict(trap)
+        assert view.vertices == trap
+        assert view.player0 == subarena.player0
+        assert view.edges == subarena.edges
+        for vertex in trap:
+            assert view.successors(vertex) == subarena.successors(vertex)
+            assert view.predecessors(vertex) == subarena.predecessors(vertex)
+        targets = frozenset(vertex for vertex in trap if generator.random() < 0.2)
+        assert view.attractor0(targets) == subarena.attractor0(targets)
+        assert view.attractor1(targets) == subarena.attractor1(targets)
+
+
+def test_attractors_and_buchi_match_arena():
+    generator = random.Random(3)
+    for seed in range(20):
+        arena = random_arena(60, 3, seed)
+        bitset = BitsetArena.from_arena(arena)
+        assert bitset.edges == arena.edges
+        assert bitset.player0 == arena.player0 and bitset.player1 == arena.player1
+        targets = frozenset(vertex for vertex in arena.vertices
+                            if generator.random() < 0.2)
+        assert bitset.attractor0(targets) == arena.attractor0(targets)
+        assert bitset.attractor1(targets) == arena.attractor1(targets)
+        assert (bitset.controlled_predecessors0(targets) ==
+                arena.controlled_predecessors0(targets))
+        assert (bitset.controlled_predecessors1(targets) ==
+                arena.controlled_predecessors1(targets))
+        assert (Recurrence(targets).winning_region0(bitset) ==
+                Recurrence(targets).winning_region0(arena))
+        assert (Persistence(targets).winning_region0(bitset) ==
+                Persistence(targets).winning_region0(arena))
+        strategy = {}
+        attractor = bitset.attractor0(targets, strategy)
+        assert set(strategy) == (attractor - targets) & arena.player0
@@ -0,0 +1,130 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import gc
+import itertools
+import random
+
+import pytest
+
+from resynth import boolean
+
+
+def test_structural_identity():
+    manager = boolean.Manager()
+    x, y = manager.variable('x'), manager.variable('y')
+    assert (x & y) is (x & y)
+    assert ~(x | y) is ~(x | y)
+    assert (x >> y) is (y << x)
+    assert boolean.ITE(manager, x, y, ~y) is boolean.ITE(manager, x, y, ~y)
+    assert (x & y) is not (y & x)
+    assert hash(x & y) == hash(x & y)
+
+
+def test_managers_do_not_share_formulas():
+    manager0, manager1 = boolean.Manager(), boolean.Manager()
+    x0, x1 = manager0.variable(), manager1.variable()
+    assert x0.index == x1.index
+    assert x0 is not x1
+    assert (x0 & x0) is not (x1 & x1)
+
+
+def test_shared_formulas_are_immutable():
+    manager = boolean.Manager()
+    x = manager.variable('x')
+    assert boolean.Variable(manager, x.index, 'renamed') is x
+    assert x.name == 'x'
+    assert boolean.Variable(manager, x.index) is x
+    assert x.name == 'x'
+    y = manager.variable('y')
+    conjunction = x & y
+    assert boolean.And(manager, x, y) is conjunction
+    assert conjunction.left is x and conjunction.right is y
+
+
+def test_unreferenced_formulas_are_released():
+    manager = boolean.Manager()
+    x, y = manager.variable(), manager.variable()
+    size = len(manager.table)
+    formula = (x | y) & ~x
+    assert len(manager.table) == size + 3
+    del formula
+    gc.collect()
+    assert len(manager.table) == size
+
+
+def test_compose_and_evaluate():
+    manager = boolean.Manager()
+    x, y, z = manager.variable(), manager.variable(), manager.variable()
+    formula = (x & y) | ~z
+    composed = formula.compose(z, x)
+    assert composed is (x & y) | ~x
+    assert composed.evaluate({x: manager.falsum}) is manager.verum
+    assert formula.variables() == {x, y, z}
+    assert formula.evaluate({x: manager.verum, y: manager.verum}) is manager.verum
+
+
+def test_deep_formulas():
+    manager = boolean.Manager()
+    variables = [manager.variable() for _ in range(4)]
+    formula = manager.falsum
+    for index in range(10000):
+        formula = formula ^ variables[index % 4]
+    assert formula.variables() == set(variables)
+    assignment = {variable: manager.verum for variable in variables}
+    assert formula.evaluate(assignment) is manager.falsum
+
+
+def random_formula(manager, variables, size, generator):
+    formulas = list(variables) + [manager.verum, manager.falsum]
+    for _ in range(size):
+        kind = generator.choice((boolean.Not, boolean.And, boolean.Or, boolean.Xor,
+                                 boolean.Implication, boolean.Equivalence, boolean.ITE))
+        arity = 1 if kind is boolean.Not else 3 if kind is boolean.ITE else 2
+        operands = [generator.choice(formulas) for _ in range(arity)]
+        formulas.append(kind(manager, *operands))
+    return formulas[-1]
+
+
+def programs(count):
+    """ Yields random formulas, their programs, and the truth tables over all rows. """
+    generator = random.Random(0)
+    manager = boolean.Manager()
+    variables = [manager.variable() for _ in range(count)]
+    rows = list(itertools.product((False, True), repeat=count))
+    for _ in range(30):
+        formula = random_formula(manager, variables, 15, generator)
+        table = []
+        for row in rows:
+            assignment = {variable: manager.verum if value else manager.falsum
+                          for variable, value in zip(variables, row)}
+            table.append(formula.evaluate(assignment) is manager.verum)
+        yield variables, rows, boolean.Program(formula), table
+
+
+def test_program_on_integers():
+    for variables, rows, program, table in programs(5):
+        columns = {variable: sum(row[index] << position
+                                 for position, row in enumerate(rows))
+                   for index, variable in enumerate(variables)}
+        result = program(columns, (1 << len(rows)) - 1)
+        assert [bool(result >> position & 1) for position in range(len(rows))] == table
+
+
+def test_program_on_numpy_columns():
+    numpy = pytest.importorskip('numpy')
+    for variables, rows, program, table in programs(5):
+        columns = {variable: numpy.array([row[index] for row in rows])
+                   for index, variable in enumerate(variables)}
+        assert program(columns).tolist() == table
+    # bit-packed columns of 64 rows per word
+    for variables, rows, program, table in programs(7):
+        columns = {}
+        for index, variable in enumerate(variables):
+            bits = numpy.array([row[index] for row in rows])
+            columns[variable] = numpy.packbits(bits, bitorder='little').view(numpy.uint64)
+        result = program(columns)
+        assert result.dtype == numpy.uint64
+        bits = numpy.unpackbits(result.view(numpy.uint8), bitorder='little')
+        assert bits.astype(bool).tolist() == table
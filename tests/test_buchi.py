@@ -0,0 +1,76 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import random
+
+from resynth.arena import Arena, buchi_fixpoint
+from resynth.benchmark import random_arena
+from resynth.condition import Persistence, Recurrence, _buchi
+from resynth.instrumentation import instrument
+
+
+def old_fixpoint(arena, accepting):
+    """ The original fixpoint of `Recurrence.winning_region1` for Player 0. """
+    accepting = set(accepting)
+    previous = set()
+    current = None
+    while previous != current:
+        previous = current
+        current = arena.vertices - arena.attractor0(accepting)
+        accepting -= arena.controlled_predecessors1(current)
+    return current
+
+
+def instances():
+    generator = random.Random(0)
+    for seed in range(60):
+        arena = random_arena(40, 1 + seed % 3, seed)
+        accepting = frozenset(vertex for vertex in arena.vertices
+                              if generator.random() < 0.2)
+        yield arena, accepting
+
+
+def test_buchi_matches_fixpoints():
+    repaired = 0
+    for arena, accepting in instances():
+        for player in (0, 1):
+            with instrument() as statistics:
+                region = _buchi(arena, accepting, player)
+            # more than one round removes vertices again after the repair
+            repaired += statistics.iterations > 1
+            assert region == buchi_fixpoint(arena, accepting, player)
+            if player:
+                assert region == old_fixpoint(arena.dual(), accepting)
+            else:
+                assert region == old_fixpoint(arena, accepting)
+    assert repaired
+
+
+def test_buchi_with_strategy_matches():
+    for arena, accepting in instances():
+        for player in (0, 1):
+            assert (_buchi(arena, accepting, player, {}) ==
+                    _buchi(arena, accepting, player))
+
+
+class HookedArena(Arena):
+    """ An arena solving Büchi games itself by the fixpoint and recording the calls. """
+
+    def __init__(self, arena):
+        super().__init__(arena.vertices, arena.player0, arena.player1, arena.edges)
+        self.calls = []
+
+    def buchi(self, accepting, player):
+        self.calls.append((accepting, player))
+        return buchi_fixpoint(self, accepting, player)
+
+
+def test_conditions_use_buchi_hook():
+    for arena, accepting in instances():
+        hooked = HookedArena(arena)
+        region1 = Recurrence(accepting).winning_region1(hooked)
+        region0 = Persistence(arena.vertices - accepting).winning_region0(hooked)
+        assert hooked.calls == [(accepting, 0), (accepting, 1)]
+        assert region1 == Recurrence(accepting).winning_region1(arena)
+        assert region0 == Persistence(arena.vertices - accepting).winning_region0(arena)
@@ -0,0 +1,92 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import array
+import random
+
+import pytest
+
+from resynth.arena import Arena, InvalidArena
+from resynth.benchmark import random_arena
+from resynth.compact import INDEX, OFFSET, CompactArena
+
+
+def arenas():
+    for seed in range(20):
+        arena = random_arena(50, 3, seed)
+        yield arena, CompactArena.from_arena(arena)
+
+
+def targets(arena, seed, count=4):
+    generator = random.Random(seed)
+    return [frozenset(vertex for vertex in arena.vertices if generator.random() < 0.1)
+            for _ in range(count)]
+
+
+def test_structure():
+    for arena, compact in arenas():
+        assert compact.vertices == arena.vertices
+        assert compact.player0 == arena.player0
+        assert compact.player1 == arena.player1
+        assert compact.edges == arena.edges
+        for vertex in arena.vertices:
+            assert compact.successors(vertex) == arena.successors(vertex)
+            assert compact.predecessors(vertex) == arena.predecessors(vertex)
+            assert compact.vertex(compact.index(vertex)) == vertex
+
+
+def test_attractors():
+    for seed, (arena, compact) in enumerate(arenas()):
+        for vertices in targets(arena, seed):
+            assert compact.attractor0(vertices) == arena.attractor0(vertices)
+            assert compact.attractor1(vertices) == arena.attractor1(vertices)
+            assert (compact.controlled_predecessors0(vertices) ==
+                    arena.controlled_predecessors0(vertices))
+            assert (compact.controlled_predecessors1(vertices) ==
+                    arena.controlled_predecessors1(vertices))
+
+
+def test_multiple_attractors():
+    for seed, (arena, compact) in enumerate(arenas()):
+        sets = targets(arena, seed, 70)
+        assert compact.attractors0(sets) == [arena.attractor0(vertices)
+                                             for vertices in sets]
+        assert compact.attractors1(sets) == [arena.attractor1(vertices)
+                                             for vertices in sets]
+        assert compact.attractors0([]) == []
+
+
+def test_dual():
+    for seed, (arena, compact) in enumerate(arenas()):
+        dual = compact.dual()
+        assert dual.player0 == arena.player1 and dual.player1 == arena.player0
+        assert dual.edges == arena.edges
+        for vertices in targets(arena, seed):
+            assert dual.attractor0(vertices) == arena.attractor1(vertices)
+            assert dual.attractor1(vertices) == arena.attractor0(vertices)
+        # the dual does not change the arena itself
+        assert compact.player0 == arena.player0
+
+
+def test_from_csr():
+    compact = CompactArena.from_csr(range(3), bytearray([0b101]),
+                                    array.array(OFFSET, [0, 2, 3, 4]),
+                                    array.array(INDEX, [1, 1, 2, 0]))
+    arena = Arena({0, 1, 2}, {0, 2}, {1}, {(0, 1), (1, 2), (2, 0)})
+    assert compact.vertices == arena.vertices
+    assert compact.player0 == arena.player0
+    # duplicate edges are removed
+    assert compact.edges == arena.edges
+    assert compact.attractor0({0}) == arena.attractor0({0})
+
+
+def test_invalid_arenas():
+    with pytest.raises(InvalidArena):
+        CompactArena({0, 1}, {0}, {0, 1}, {(0, 1), (1, 0)})
+    with pytest.raises(InvalidArena):
+        CompactArena({0, 1}, {0}, set(), {(0, 1), (1, 0)})
+    with pytest.raises(InvalidArena):
+        CompactArena({0, 1}, {0}, {1}, {(0, 1)})
+    with pytest.raises(InvalidArena):
+        CompactArena({0, 1}, {0}, {1}, {(0, 1), (1, 2)})
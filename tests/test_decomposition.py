@@ -0,0 +1,57 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+from resynth import decomposition
+from resynth.benchmark import random_arena, random_coloring
+from resynth.condition import Parity, Persistence, Recurrence, GeneralizedRecurrence
+
+
+def reachable(arena, vertex, vertices):
+    result, pending = {vertex}, [vertex]
+    while pending:
+        for successor in arena.successors(pending.pop()) & vertices:
+            if successor not in result:
+                result.add(successor)
+                pending.append(successor)
+    return result
+
+
+def test_components_are_sccs_in_reverse_topological_order():
+    for seed in range(10):
+        arena = random_arena(60, 2, seed)
+        components = decomposition.components(arena)
+        assert set().union(*components) == arena.vertices
+        assert sum(map(len, components)) == len(arena.vertices)
+        position = {vertex: index for index, component in enumerate(components)
+                    for vertex in component}
+        for component in components:
+            for vertex in component:
+                assert component <= reachable(arena, vertex, component)
+        for source, target in arena.edges:
+            assert position[target] <= position[source]
+
+
+def conditions(arena, seed):
+    vertices = sorted(arena.vertices)
+    return [Parity(random_coloring(arena, 4, seed)),
+            Recurrence(frozenset(vertices[::3])),
+            Persistence(frozenset(vertices[::2])),
+            GeneralizedRecurrence([frozenset(vertices[::3]), frozenset(vertices[1::4])])]
+
+
+def test_solve_matches_direct_solving():
+    for seed in range(10):
+        arena = random_arena(60, 2, seed)
+        for condition in conditions(arena, seed):
+            region0 = frozenset(condition.winning_region0(arena))
+            expected = region0, arena.vertices - region0
+            assert decomposition.solve(arena, condition, processes=1) == expected
+
+
+def test_solve_in_process_pool():
+    arena = random_arena(200, 2, 0)
+    for condition in conditions(arena, 0):
+        region0 = frozenset(condition.winning_region0(arena))
+        expected = region0, arena.vertices - region0
+        assert decomposition.solve(arena, condition, processes=2, inline=1) == expected
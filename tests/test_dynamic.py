@@ -0,0 +1,96 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import random
+
+import pytest
+
+from resynth.arena import InvalidArena, UnsupportedOperation
+from resynth.benchmark import random_arena
+from resynth.condition import Reachability, Recurrence, Safety
+from resynth.dynamic import DynamicArena
+
+
+def attractor(arena, targets, player):
+    """ Recomputes the attractor, vertices without successors are lost by their owner. """
+    own = arena.player1 if player else arena.player0
+    region = set(targets)
+    changed = True
+    while changed:
+        changed = False
+        for vertex in arena.vertices - region:
+            successors = arena.successors(vertex)
+            if successors & region if vertex in own else successors <= region:
+                region.add(vertex)
+                changed = True
+    return region
+
+
+def edit(arena, attractors, generator, fresh):
+    """ Applies a random change to the arena or the targets of an attractor. """
+    vertices = sorted(arena.vertices)
+    choice = generator.random()
+    if choice < 0.3:
+        arena.add_edge(generator.choice(vertices), generator.choice(vertices))
+    elif choice < 0.6:
+        edges = sorted(arena.edges)
+        if edges:
+            arena.remove_edge(*generator.choice(edges))
+    elif choice < 0.7:
+        arena.add_vertex(fresh, generator.randrange(2))
+        arena.add_edge(fresh, generator.choice(vertices))
+        arena.add_edge(generator.choice(vertices), fresh)
+    elif choice < 0.8:
+        if len(vertices) > 5:
+            arena.remove_vertex(generator.choice(vertices))
+    else:
+        maintained = generator.choice(attractors)
+        vertex = generator.choice(vertices)
+        if vertex in maintained.targets:
+            maintained.remove_target(vertex)
+        else:
+            maintained.add_target(vertex)
+
+
+def test_random_edits_match_recomputation():
+    for seed in range(20):
+        generator = random.Random(seed)
+        arena = DynamicArena.from_arena(random_arena(30, 3, seed))
+        goal = frozenset(generator.sample(sorted(arena.vertices), 3))
+        safe = arena.vertices - frozenset(generator.sample(sorted(arena.vertices), 3))
+        attractors = [arena.maintain(Reachability(goal)), arena.maintain(Safety(safe))]
+        for step in range(100):
+            edit(arena, attractors, generator, 1000 + step)
+            for maintained in attractors:
+                expected = attractor(arena, maintained.targets, maintained.player)
+                assert maintained.region == expected
+                assert (maintained.winning_region0 | maintained.winning_region1 ==
+                        arena.vertices)
+
+
+def test_initial_regions_match_conditions():
+    for seed in range(10):
+        arena = random_arena(30, 3, seed)
+        dynamic = DynamicArena.from_arena(arena)
+        goal = frozenset(sorted(arena.vertices)[:4])
+        assert (dynamic.maintain(Reachability(goal)).winning_region0 ==
+                Reachability(goal).winning_region0(arena))
+        assert (dynamic.maintain(Safety(goal)).winning_region0 ==
+                Safety(goal).winning_region0(arena))
+
+
+def test_errors():
+    arena = DynamicArena({0, 1}, {0}, {1}, {(0, 1), (1, 0)})
+    with pytest.raises(InvalidArena):
+        arena.remove_edge(0, 0)
+    with pytest.raises(InvalidArena):
+        arena.remove_vertex(2)
+    with pytest.raises(InvalidArena):
+        arena.add_edge(0, 2)
+    with pytest.raises(InvalidArena):
+        arena.add_vertex(0, 1)
+    with pytest.raises(UnsupportedOperation):
+        arena.maintain(Recurrence({0}))
+    # failed changes leave the arena intact
+    assert arena.edges == {(0, 1), (1, 0)} and arena.vertices == {0, 1}
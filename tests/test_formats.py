@@ -0,0 +1,94 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import io
+
+import pytest
+
+from resynth.benchmark import random_arena, random_coloring
+from resynth.compact import CompactArena
+from resynth.formats import InvalidFormat, load, read_pgsolver, save, write_pgsolver
+
+
+def games():
+    for seed in range(10):
+        arena = CompactArena.from_arena(random_arena(40, 3, seed))
+        yield arena, random_coloring(arena, 5, seed)
+
+
+def assert_renamed(arena, coloring, loaded, condition):
+    """ Asserts that the loaded game is the game with the vertices renamed to ids. """
+    rename = {vertex: arena.index(vertex) for vertex in arena.vertices}
+    assert loaded.vertices == frozenset(rename.values())
+    assert loaded.player0 == frozenset(rename[vertex] for vertex in arena.player0)
+    assert loaded.edges == frozenset((rename[source], rename[target])
+                                     for source, target in arena.edges)
+    for vertex in arena.vertices:
+        assert (loaded.predecessors(rename[vertex]) ==
+                frozenset(rename[source] for source in arena.predecessors(vertex)))
+    assert condition.coloring == {rename[vertex]: color
+                                  for vertex, color in coloring.items()}
+
+
+def test_pgsolver_round_trip():
+    for arena, coloring in games():
+        file = io.StringIO()
+        write_pgsolver(arena, coloring, file)
+        file.seek(0)
+        loaded, condition = read_pgsolver(file)
+        assert_renamed(arena, coloring, loaded, condition)
+
+
+def test_pgsolver_sparse_identifiers():
+    text = 'parity 20;\n10 2 0 20,10 "a; b";\n20 1 1 10;\nstart 10;\n'
+    arena, condition = read_pgsolver(io.StringIO(text))
+    assert arena.vertices == {10, 20}
+    assert arena.player0 == {10}
+    assert arena.edges == {(10, 20), (10, 10), (20, 10)}
+    assert condition.coloring == {10: 2, 20: 1}
+
+
+def test_binary_round_trip(tmp_path):
+    for arena, coloring in games():
+        path = str(tmp_path / 'arena.bin')
+        save(arena, path, coloring)
+        loaded, condition = load(path)
+        assert_renamed(arena, coloring, loaded, condition)
+        assert loaded.attractor0({0}) == CompactArena.from_arena(loaded).attractor0({0})
+        save(arena, path)
+        loaded, condition = load(path)
+        assert condition is None
+        assert len(loaded.edges) == len(arena.edges)
+
+
+@pytest.mark.parametrize('text, message', [
+    ('0 1 0 0;\n1 1 0 0', 'Unterminated statement'),
+    ('0 1 0 0 "name;\n', 'Unterminated name'),
+    ('0 1 0 0;\n1 x 0 0;', 'Line 2: Invalid vertex'),
+    ('0 1 0 0 1;', 'Line 1: Invalid vertex'),
+    ('0 1 2 0;', 'Line 1: Invalid owner'),
+    ('0 1 0 0;\n\n1 1 1 ;', 'Line 3: Vertex 1 has no successors'),
+    ('0 1 0 0;\n1 1 1 \n "name";', 'Line 3: Vertex 1 has no successors'),
+    ('0 1 0 0;\n1 1 0 7;', 'Line 2: Edge to undeclared vertex 7'),
+    ('3 1 0 3;\n3 1 0 3;', 'not unique'),
+])
+def test_pgsolver_malformed(text, message):
+    with pytest.raises(InvalidFormat, match=message):
+        read_pgsolver(io.StringIO(text))
+
+
+def test_binary_malformed(tmp_path):
+    arena, coloring = next(games())
+    path = tmp_path / 'arena.bin'
+    save(arena, str(path), coloring)
+    data = path.read_bytes()
+    path.write_bytes(b'NOTARENA' + data[8:])
+    with pytest.raises(InvalidFormat, match='not an arena'):
+        load(str(path))
+    path.write_bytes(data[:len(data) // 2])
+    with pytest.raises(InvalidFormat, match='truncated'):
+        load(str(path))
+    path.write_bytes(data[:10])
+    with pytest.raises(InvalidFormat, match='too short'):
+        load(str(path))
@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import random
+
+from resynth import parity
+from resynth.benchmark import random_arena, random_coloring
+from resynth.condition import GeneralizedRecurrence, Parity, Recurrence
+from resynth.game import Game
+from resynth.instrumentation import instrument
+
+
+def games():
+    for seed in range(5):
+        arena = random_arena(30, 2, seed)
+        generator = random.Random(seed)
+        accepting = frozenset(vertex for vertex in arena.vertices
+                              if generator.random() < 0.3)
+        yield Game(arena, Recurrence(accepting))
+        yield Game(arena, Parity(random_coloring(arena, 4, seed)))
+
+
+def test_memoization():
+    for game in games():
+        with instrument() as statistics:
+            region0 = game.winning_region0()
+        assert statistics.attractors
+        with instrument() as statistics:
+            assert game.winning_region0() is region0
+            assert game.winning_region1() == game.arena.vertices - region0
+        assert not statistics.attractors and not statistics.iterations
+        with instrument() as statistics:
+            solution = game.solve()
+        assert statistics.attractors
+        assert solution.region0 == region0
+        with instrument() as statistics:
+            assert game.solve() is solution
+            assert game.strategy0() is solution.strategy0
+            assert game.strategy1() is solution.strategy1
+            assert game.winning_region0() == region0
+        assert not statistics.attractors and not statistics.iterations
+
+
+def test_dual():
+    for game in games():
+        dual = game.dual()
+        assert dual._regions is None and dual._solution is None
+        game.winning_region0()
+        dual = game.dual()
+        assert dual._solution is None
+        with instrument() as statistics:
+            assert dual.winning_region0() == game.winning_region1()
+            assert dual.winning_region1() == game.winning_region0()
+        assert not statistics.attractors
+        solution = game.solve()
+        dual = game.dual()
+        with instrument() as statistics:
+            assert dual.strategy0() is solution.strategy1
+            assert dual.strategy1() is solution.strategy0
+            assert dual.winning_region0() == solution.region1
+        assert not statistics.attractors
+        # the carried over results are the ones of solving the dual game
+        fresh = Game(dual.arena, dual.condition)
+        assert fresh.winning_region0() == dual.winning_region0()
+
+
+def test_profile():
+    for game in games():
+        solution, statistics = game.profile()
+        assert solution is not None and statistics.attractors
+        assert game.winning_region0() == solution.region0
+
+
+def test_profile_falls_back_to_regions():
+    arena = random_arena(30, 2, 0)
+    generator = random.Random(0)
+    sets = [frozenset(vertex for vertex in arena.vertices if generator.random() < 0.3)
+            for _ in range(2)]
+    coloring = random_coloring(arena, 4, 0)
+    for condition in (GeneralizedRecurrence(sets),
+                      Parity(coloring, parity.quasi_polynomial)):
+        game = Game(arena, condition)
+        iterations = []
+        solution, statistics = game.profile(
+            lambda statistics, fixpoint, region: iterations.append(fixpoint)
+        )
+        assert solution is None
+        assert statistics.iterations == len(iterations) > 0
+        with instrument() as statistics:
+            region0 = game.winning_region0()
+        assert not statistics.iterations
+        assert region0 == condition.winning_region0(arena)
@@ -0,0 +1,95 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import random
+
+import pytest
+
+from resynth.arena import Arena, UnsupportedOperation
+from resynth.benchmark import random_arena
+from resynth.condition import (GeneralizedPersistence, GeneralizedReachability,
+                               GeneralizedRecurrence, Persistence, Reachability,
+                               Recurrence)
+
+
+def degeneralized(arena, accepting_sets):
+    """
+    Returns the winning region of Player 0 for the generalized recurrence condition
+    computed on the product with a counter of the set to be visited next.
+    """
+    if not accepting_sets:
+        return arena.vertices
+    count = len(accepting_sets)
+
+    def advance(vertex, counter):
+        return (counter + 1) % count if vertex in accepting_sets[counter] else counter
+
+    vertices = {(vertex, counter) for vertex in arena.vertices
+                for counter in range(count)}
+    player0 = {(vertex, counter) for vertex, counter in vertices
+               if vertex in arena.player0}
+    edges = {((vertex, counter), (successor, advance(vertex, counter)))
+             for vertex, counter in vertices for successor in arena.successors(vertex)}
+    product = Arena(vertices, player0, vertices - player0, edges)
+    # the counter wraps around after visiting the last set
+    accepting = {(vertex, count - 1) for vertex in accepting_sets[-1]}
+    region0 = Recurrence(accepting).winning_region0(product)
+    return frozenset(vertex for vertex in arena.vertices if (vertex, 0) in region0)
+
+
+def games():
+    for seed in range(10):
+        arena = random_arena(25, 2, seed)
+        generator = random.Random(seed)
+        for count in range(4):
+            sets = [frozenset(vertex for vertex in arena.vertices
+                              if generator.random() < 0.25)
+                    for _ in range(count)]
+            yield arena, sets
+
+
+def test_generalized_recurrence():
+    for arena, sets in games():
+        condition = GeneralizedRecurrence(sets)
+        region0 = degeneralized(arena, sets)
+        assert condition.winning_region0(arena) == region0
+        assert condition.winning_region1(arena) == arena.vertices - region0
+        if len(sets) == 1:
+            assert region0 == Recurrence(sets[0]).winning_region0(arena)
+
+
+def test_generalized_persistence():
+    for arena, sets in games():
+        safe_sets = [arena.vertices - vertices for vertices in sets]
+        condition = GeneralizedPersistence(safe_sets)
+        # Player 0 wins where Player 1 cannot visit every set of unsafe vertices
+        region0 = arena.vertices - degeneralized(arena.dual(), sets)
+        assert condition.winning_region0(arena) == region0
+        assert condition.winning_region1(arena) == arena.vertices - region0
+        if len(sets) == 1:
+            assert region0 == Persistence(safe_sets[0]).winning_region0(arena)
+        assert condition.complement(arena).winning_region0(arena.dual()) == (
+            arena.vertices - region0
+        )
+
+
+def test_generalized_reachability():
+    for arena, sets in games():
+        condition = GeneralizedReachability(sets)
+        union = frozenset().union(*sets)
+        region0 = Reachability(union).winning_region0(arena)
+        assert condition.winning_region0(arena) == region0
+        assert condition.winning_region1(arena) == arena.vertices - region0
+        solution = condition.solve(arena)
+        assert solution.region0 == region0
+        if not sets:
+            assert not region0
+
+
+def test_strategies_require_memory():
+    arena, sets = next(games())
+    with pytest.raises(UnsupportedOperation):
+        GeneralizedRecurrence(sets).solve(arena)
+    with pytest.raises(UnsupportedOperation):
+        GeneralizedPersistence(sets).solve(arena)
@@ -0,0 +1,73 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import random
+
+from resynth.benchmark import random_arena
+from resynth.condition import Reachability, Recurrence, Safety
+from resynth.implicit import ImplicitArena, reachability, recurrence, safety
+
+
+def implicit(arena, initial):
+    return ImplicitArena(initial, lambda vertex: 0 if vertex in arena.player0 else 1,
+                         arena.successors)
+
+
+def games():
+    for seed in range(10):
+        arena = random_arena(30, 2, seed)
+        generator = random.Random(seed)
+        target = frozenset(vertex for vertex in arena.vertices
+                           if generator.random() < 0.2)
+        yield arena, target
+
+
+def test_materialize():
+    for arena, _ in games():
+        materialized = implicit(arena, arena.vertices).materialize()
+        assert materialized.vertices == arena.vertices
+        assert materialized.player0 == arena.player0
+        assert materialized.edges == arena.edges
+
+
+def test_against_materialized():
+    for arena, target in games():
+        regions = {
+            reachability: Reachability(target).winning_region0(arena),
+            safety: Safety(target).winning_region0(arena),
+            recurrence: Recurrence(target).winning_region0(arena)
+        }
+        for solve, region0 in regions.items():
+            for vertex in arena.vertices:
+                # a fresh arena such that every query explores from scratch
+                winner = solve(implicit(arena, {vertex}), target, batch=2)
+                assert winner == (0 if vertex in region0 else 1)
+                # the target given by its membership predicate
+                winner = solve(implicit(arena, {vertex}), target.__contains__, batch=2)
+                assert winner == (0 if vertex in region0 else 1)
+
+
+def chain(owner, successors):
+    """ An infinite arena over the integers where only the start is special. """
+    return ImplicitArena({0}, lambda vertex: owner if vertex == 0 else 0,
+                         lambda vertex: successors if vertex == 0 else [vertex + 1])
+
+
+def test_partial_exploration():
+    # Player 0 reaches the goal from the start, the chain is never fully explored
+    arena = chain(0, [1, -1])
+    assert reachability(arena, {-1}, batch=4) == 0
+    assert len(arena.explored) < 16
+    # Player 1 leaves the safe vertices right away
+    arena = ImplicitArena({0}, lambda vertex: 1 if vertex == 0 else 0,
+                          lambda vertex: ['bad', 1] if vertex == 0 else
+                          ['bad'] if vertex == 'bad' else [vertex + 1])
+    assert safety(arena, lambda vertex: vertex != 'bad', batch=4) == 1
+    assert len(arena.explored) < 16
+    # Player 0 stays on the accepting cycle between the start and -1
+    arena = ImplicitArena({0}, lambda vertex: 0,
+                          lambda vertex: [-1, 1] if vertex == 0 else
+                          [0] if vertex == -1 else [vertex + 1])
+    assert recurrence(arena, {0}, batch=4) == 0
+    assert len(arena.explored) < 16
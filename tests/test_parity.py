@@ -0,0 +1,63 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import random
+
+from resynth import parity
+from resynth.benchmark import random_arena, random_coloring
+from resynth.compact import CompactArena
+from resynth.condition import Parity, Recurrence
+
+import reference
+
+
+def test_zielonka_against_brute_force():
+    for seed in range(40):
+        arena = random_arena(8, 2, seed)
+        coloring = random_coloring(arena, 4, seed)
+        expected = reference.parity_regions(arena, coloring)
+        assert parity.zielonka(arena, coloring) == expected
+
+
+def test_zielonka_on_compact_arenas():
+    for seed in range(10):
+        arena = random_arena(50, 3, seed)
+        coloring = random_coloring(arena, 6, seed)
+        compact = CompactArena.from_arena(arena)
+        assert parity.zielonka(compact, coloring) == parity.zielonka(arena, coloring)
+
+
+def test_parity_condition_regions():
+    for seed in range(10):
+        arena = random_arena(30, 2, seed)
+        coloring = random_coloring(arena, 5, seed)
+        condition = Parity(coloring)
+        region0, region1 = condition.winning_regions(arena)
+        assert region0 | region1 == arena.vertices and not region0 & region1
+        assert condition.winning_region0(arena) == region0
+        assert condition.winning_region1(arena) == region1
+        solution = condition.solve(arena)
+        assert (solution.region0, solution.region1) == (region0, region1)
+
+
+def test_buchi_special_case():
+    generator = random.Random(0)
+    for seed in range(20):
+        arena = random_arena(30, 2, seed)
+        accepting = frozenset(vertex for vertex in arena.vertices
+                              if generator.random() < 0.3)
+        coloring = {vertex: 2 if vertex in accepting else 1 for vertex in arena.vertices}
+        assert (Parity(coloring).winning_region0(arena) ==
+                Recurrence(accepting).winning_region0(arena))
+
+
+def test_complement():
+    for seed in range(20):
+        arena = random_arena(30, 2, seed)
+        condition = Parity(random_coloring(arena, 5, seed))
+        complement = condition.complement(arena)
+        # the complement on the dual arena is the same game with the players swapped
+        dual = arena.dual()
+        assert complement.winning_region0(dual) == condition.winning_region1(arena)
+        assert complement.winning_region1(dual) == condition.winning_region0(arena)
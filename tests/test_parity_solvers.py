@@ -0,0 +1,73 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import pytest
+
+from resynth import parity
+from resynth.arena import Arena, UnsupportedOperation
+from resynth.benchmark import jurdzinski, random_arena, random_coloring
+
+SOLVERS = (parity.priority_promotion, parity.quasi_polynomial)
+
+
+@pytest.mark.parametrize('solver', SOLVERS)
+def test_random_arenas(solver):
+    for seed in range(30):
+        arena = random_arena(40, 3, seed)
+        coloring = random_coloring(arena, 2 + seed % 6, seed)
+        assert solver(arena, coloring) == parity.zielonka(arena, coloring)
+
+
+@pytest.mark.parametrize('solver', SOLVERS)
+def test_sparse_colors(solver):
+    for seed in range(10):
+        arena = random_arena(30, 2, seed)
+        # colors with gaps and runs of equal parity are compressed
+        coloring = {vertex: 3 * color + 7
+                    for vertex, color in random_coloring(arena, 5, seed).items()}
+        assert solver(arena, coloring) == parity.zielonka(arena, coloring)
+
+
+@pytest.mark.parametrize('solver', SOLVERS)
+def test_jurdzinski(solver):
+    for levels, width in ((1, 1), (2, 3), (3, 3), (4, 2)):
+        arena, coloring = jurdzinski(levels, width)
+        assert solver(arena, coloring) == parity.zielonka(arena, coloring)
+
+
+@pytest.mark.parametrize('solver', SOLVERS)
+def test_empty_arena(solver):
+    arena = Arena(set(), set(), set(), set())
+    assert solver(arena, {}) == (frozenset(), frozenset())
+
+
+@pytest.mark.parametrize('solver', SOLVERS)
+def test_one_color(solver):
+    arena = random_arena(20, 2, 0)
+    for color in (0, 1, 4):
+        coloring = {vertex: color for vertex in arena.vertices}
+        expected = (arena.vertices, frozenset())
+        assert solver(arena, coloring) == (expected if color % 2 == 0
+                                           else expected[::-1])
+
+
+def test_compress():
+    coloring = {'a': 2, 'b': 4, 'c': 5, 'd': 9, 'e': 12}
+    compressed = parity._compress(coloring, frozenset(coloring))
+    assert compressed == {'a': 0, 'b': 0, 'c': 1, 'd': 1, 'e': 2}
+    assert parity._compress({'a': 3}, frozenset('a')) == {'a': 1}
+
+
+def test_priority_promotion_strategy_regions():
+    for seed in range(10):
+        arena = random_arena(30, 3, seed)
+        coloring = random_coloring(arena, 4, seed)
+        regions = parity.priority_promotion(arena, coloring, {})
+        assert regions == parity.zielonka(arena, coloring)
+
+
+def test_quasi_polynomial_rejects_strategies():
+    arena = random_arena(10, 2, 0)
+    with pytest.raises(UnsupportedOperation):
+        parity.quasi_polynomial(arena, random_coloring(arena, 3, 0), {})
@@ -0,0 +1,121 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import itertools
+import random
+
+from resynth import boolean
+from resynth.sat import Solver, Tseitin, satisfiable
+
+
+def random_clauses(variables, count, width, generator):
+    return [[generator.choice((1, -1)) * generator.randint(1, variables)
+             for _ in range(width)] for _ in range(count)]
+
+
+def brute_force(variables, clauses):
+    for values in itertools.product((False, True), repeat=variables):
+        if all(any(values[abs(literal) - 1] == (literal > 0) for literal in clause)
+               for clause in clauses):
+            return True
+    return False
+
+
+def satisfies(solver, clauses):
+    return all(any(solver.value(literal) for literal in clause) for clause in clauses)
+
+
+def test_solver_against_brute_force():
+    generator = random.Random(0)
+    for _ in range(200):
+        # around the phase transition at a clause ratio of 4.26
+        clauses = random_clauses(10, generator.randint(30, 55), 3, generator)
+        solver = Solver()
+        for _ in range(10):
+            solver.new_variable()
+        for clause in clauses:
+            solver.add_clause(clause)
+        result = solver.solve()
+        assert result == brute_force(10, clauses)
+        if result:
+            assert satisfies(solver, clauses)
+
+
+def test_pigeonhole_is_unsatisfiable():
+    pigeons, holes = 6, 5
+    solver = Solver()
+    variables = [[solver.new_variable() for _ in range(holes)] for _ in range(pigeons)]
+    for pigeon in variables:
+        solver.add_clause(pigeon)
+    for hole in range(holes):
+        for first, second in itertools.combinations(range(pigeons), 2):
+            solver.add_clause([-variables[first][hole], -variables[second][hole]])
+    assert not solver.solve()
+    assert solver.core == []
+
+
+def test_tseitin_against_truth_tables():
+    generator = random.Random(1)
+    kinds = (boolean.And, boolean.Or, boolean.Xor, boolean.Implication,
+             boolean.Equivalence)
+    for _ in range(100):
+        manager = boolean.Manager()
+        variables = [manager.variable() for _ in range(4)]
+        formulas = list(variables)
+        for _ in range(8):
+            if generator.random() < 0.2:
+                formulas.append(~generator.choice(formulas))
+            else:
+                kind = generator.choice(kinds)
+                formulas.append(kind(manager, generator.choice(formulas),
+                                     generator.choice(formulas)))
+        formula = formulas[-1]
+        expected = any(
+            formula.evaluate({variable: manager.verum if value else manager.falsum
+                              for variable, value in zip(variables, values)})
+            is manager.verum
+            for values in itertools.product((False, True), repeat=4)
+        )
+        model = satisfiable(formula)
+        assert (model is not None) == expected
+        if model is not None:
+            assignment = {variable: model.get(variable, manager.falsum)
+                          for variable in variables}
+            assert formula.evaluate(assignment) is manager.verum
+
+
+def test_assumptions_and_cores_against_brute_force():
+    generator = random.Random(2)
+    solver = Solver()
+    for _ in range(10):
+        solver.new_variable()
+    clauses = []
+    for _ in range(30):
+        # clauses are added incrementally between calls
+        clause = random_clauses(10, 1, 3, generator)[0]
+        clauses.append(clause)
+        solver.add_clause(clause)
+        assumptions = [generator.choice((1, -1)) * variable
+                       for variable in generator.sample(range(1, 11), 4)]
+        constrained = clauses + [[literal] for literal in assumptions]
+        result = solver.solve(assumptions)
+        assert result == brute_force(10, constrained)
+        if result:
+            assert satisfies(solver, constrained)
+        else:
+            assert set(solver.core) <= set(assumptions)
+            core = clauses + [[literal] for literal in solver.core]
+            assert not brute_force(10, core)
+
+
+def test_tseitin_core():
+    manager = boolean.Manager()
+    x, y, z = manager.variable(), manager.variable(), manager.variable()
+    encoder = Tseitin()
+    encoder.add(x >> y)
+    assert encoder.solve([x, ~y, z]) is False
+    assert set(encoder.core) <= {x, ~y}
+    assert encoder.solve([x, z]) is True
+    model = encoder.model()
+    assert model[x] is manager.verum and model[y] is manager.verum
@@ -0,0 +1,106 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import random
+
+import pytest
+
+from resynth.benchmark import random_arena, random_coloring
+from resynth.condition import Parity, Persistence, Reachability, Recurrence, Safety
+from resynth.strategy import Strategy
+
+import reference
+
+
+def subset(arena, generator, probability=0.3):
+    return frozenset(vertex for vertex in arena.vertices
+                     if generator.random() < probability)
+
+
+def objectives(arena, seed):
+    """
+    Yields conditions with the regions where the controller of a one-player game
+    wins the objective of Player 0 and of Player 1 respectively.
+    """
+    generator = random.Random(seed)
+    goal = subset(arena, generator)
+    yield (Reachability(goal),
+           lambda graph: reference.reach(graph, goal),
+           lambda graph: reference.avoid(graph, goal))
+    unsafe = arena.vertices - subset(arena, generator, 0.7)
+    yield (Safety(arena.vertices - unsafe),
+           lambda graph: reference.avoid(graph, unsafe),
+           lambda graph: reference.reach(graph, unsafe))
+    accepting = subset(arena, generator)
+    buchi = {vertex: 2 if vertex in accepting else 1 for vertex in arena.vertices}
+    yield (Recurrence(accepting),
+           lambda graph: reference.parity(graph, buchi, 0),
+           lambda graph: reference.parity(graph, buchi, 1))
+    safe = subset(arena, generator, 0.7)
+    cobuchi = {vertex: 0 if vertex in safe else 1 for vertex in arena.vertices}
+    yield (Persistence(safe),
+           lambda graph: reference.parity(graph, cobuchi, 0),
+           lambda graph: reference.parity(graph, cobuchi, 1))
+    coloring = random_coloring(arena, 5, seed)
+    yield (Parity(coloring),
+           lambda graph: reference.parity(graph, coloring, 0),
+           lambda graph: reference.parity(graph, coloring, 1))
+
+
+def test_strategies_are_winning():
+    for seed in range(30):
+        arena = random_arena(20, 3, seed)
+        for condition, objective0, objective1 in objectives(arena, seed):
+            solution = condition.solve(arena)
+            assert solution.region0 | solution.region1 == arena.vertices
+            assert solution.region0 == condition.winning_region0(arena)
+            for player, region, strategy in ((0, solution.region0, solution.strategy0),
+                                             (1, solution.region1, solution.strategy1)):
+                own = arena.player1 if player else arena.player0
+                # the strategies choose successors exactly on the player's region
+                assert set(strategy) == region & own
+                for vertex in strategy:
+                    assert strategy[vertex] in arena.successors(vertex)
+                # the opponent cannot win against the fixed strategy
+                graph = reference.fix(arena, strategy, player)
+                opponent = objective0 if player else objective1
+                assert not region & opponent(graph)
+
+
+def test_strategy_mapping():
+    arena = random_arena(10, 3, 0)
+    strategy = Strategy(arena)
+    assert len(strategy) == 0 and dict(strategy) == {}
+    vertex = max(arena.vertices, key=arena.index)
+    successor = next(iter(arena.successors(vertex)))
+    # the choices grow on demand up to the largest id
+    strategy[vertex] = successor
+    assert strategy[vertex] == successor and len(strategy) == 1
+    strategy[vertex] = successor
+    assert len(strategy) == 1
+    other = min(arena.vertices, key=arena.index)
+    # vertices without choices are undefined
+    assert other not in strategy
+    with pytest.raises(KeyError):
+        strategy[other]
+    with pytest.raises(KeyError):
+        del strategy[other]
+    del strategy[vertex]
+    assert vertex not in strategy and len(strategy) == 0
+    with pytest.raises(KeyError):
+        del strategy[vertex]
+
+
+def test_strategy_restrict():
+    arena = random_arena(10, 3, 0)
+    strategy = Strategy(arena)
+    for vertex in arena.vertices:
+        strategy[vertex] = next(iter(arena.successors(vertex)))
+    undefined = min(arena.vertices, key=arena.index)
+    del strategy[undefined]
+    vertices = frozenset(sorted(arena.vertices)[::2]) | {undefined}
+    restricted = strategy.restrict(vertices)
+    assert set(restricted) == vertices - {undefined}
+    assert all(restricted[vertex] == strategy[vertex] for vertex in restricted)
+    assert len(strategy) == len(arena.vertices) - 1
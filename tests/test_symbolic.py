@@ -0,0 +1,36 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import pytest
+
+from resynth import boolean
+from resynth.bdd import BDD, sifting
+from resynth.benchmark import random_arena
+from resynth.condition import Reachability, Recurrence, UnsupportedOperation
+from resynth.symbolic import SymbolicArena
+
+
+def test_from_arena_uses_given_bdd():
+    bdd = BDD(boolean.Manager(), reordering=sifting)
+    symbolic = SymbolicArena.from_arena(random_arena(10, 2, 0), bdd)
+    assert symbolic.bdd is bdd
+
+
+def test_winning_regions_match_explicit_arena():
+    for seed in range(5):
+        arena = random_arena(40, 2, seed)
+        symbolic = SymbolicArena.from_arena(arena)
+        targets = frozenset(list(arena.vertices)[:5])
+        for condition in (Reachability, Recurrence):
+            explicit = condition(targets).winning_region0(arena)
+            region = condition(symbolic.encode(targets)).winning_region0(symbolic)
+            assert symbolic.decode(region) == explicit
+
+
+def test_strategies_are_unsupported():
+    symbolic = SymbolicArena.from_arena(random_arena(10, 2, 0))
+    with pytest.raises(UnsupportedOperation):
+        symbolic.attractor0(symbolic.vertices, {})
+    with pytest.raises(UnsupportedOperation):
+        Reachability(symbolic.vertices).solve(symbolic)
@@ -0,0 +1,87 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright (C) 2018, Maximilian Köhl <mail@koehlma.de>
+
+import random
+
+import pytest
+
+from resynth import arena as arena_module
+from resynth.benchmark import random_arena
+
+pytest.importorskip('numpy')
+
+
+def views(seed):
+    """ Yields an arena, its dual, and a subarena over a trap of it. """
+    arena = random_arena(80, 3, seed)
+    yield arena
+    yield arena.dual()
+    generator = random.Random(seed)
+    escape = {vertex for vertex in arena.vertices if generator.random() < 0.2}
+    trap = arena.vertices - arena.attractor1(escape)
+    if trap:
+        yield arena.restrict(trap)
+
+
+def targets(arena, seed):
+    generator = random.Random(seed)
+    return [frozenset(vertex for vertex in arena.vertices if generator.random() < 0.1)
+            for _ in range(3)]
+
+
+def players(arena):
+    return ((arena.player0, arena.player1), (arena.player1, arena.player0))
+
+
+def test_attractor_matches_efficient():
+    for seed in range(20):
+        for arena in views(seed):
+            for vertices in targets(arena, seed):
+                for own, other in players(arena):
+                    expected = arena_module.attractor_efficient(arena, vertices,
+                                                                own, other)
+                    strategy = {}
+                    result = arena_module.attractor_vectorized(arena, vertices,
+                                                               own, other, strategy)
+                    assert result == expected
+                    # recorded choices stay within the attractor
+                    assert set(strategy) == (result - vertices) & own
+                    for vertex, successor in strategy.items():
+                        assert successor in arena.successors(vertex) & result
+
+
+def test_controlled_predecessors_match_explicit():
+    for seed in range(20):
+        for arena in views(seed):
+            for vertices in targets(arena, seed):
+                for own, other in players(arena):
+                    assert (arena_module.controlled_predecessors_vectorized(
+                        arena, vertices, own, other
+                    ) == arena_module.controlled_predecessors_explicit(
+                        arena, vertices, own, other
+                    ))
+
+
+def test_index_cache():
+    arena = random_arena(30, 2, 0)
+    vertices = frozenset(list(arena.vertices)[:3])
+    arena_module.attractor_vectorized(arena, vertices, arena.player0, arena.player1)
+    index = arena._vectorized
+    arena_module.attractor_vectorized(arena, vertices, arena.player1, arena.player0)
+    assert arena._vectorized is index
+    # the dual shares the index and swaps the cached owner masks
+    dual = arena.dual()
+    result = arena_module.attractor_vectorized(dual, vertices, dual.player0,
+                                               dual.player1)
+    assert dual._vectorized is index
+    assert result == arena_module.attractor_efficient(dual, vertices, dual.player0,
+                                                      dual.player1)
+    assert (index.owner(dual.player0) == ~index.player0).all()
+    # subarenas get an index of their own vertices
+    subarena = arena.restrict(arena.vertices - arena.attractor1(vertices))
+    if subarena.vertices:
+        arena_module.attractor_vectorized(subarena, subarena.vertices,
+                                          subarena.player0, subarena.player1)
+        assert subarena._vectorized is not index
+        assert set(subarena._vectorized.names) == subarena.vertices